@@ -2,10 +2,23 @@
 
 from fastapi import APIRouter
 
+from .analytics import router as analytics_router
+from .metrics import router as metrics_router
+from .routes import progress_router
 from .routes import router as core_router
+from .stream import router as stream_router
+from .transfer import router as transfer_router
 
 api_router = APIRouter()
 api_router.include_router(core_router, prefix="/v1")
+# Per-user routes answer for the default user at /v1 and for any user under
+# /v1/users/{user_id}.
+for prefix in ("/v1", "/v1/users/{user_id}"):
+    api_router.include_router(progress_router, prefix=prefix)
+    api_router.include_router(transfer_router, prefix=prefix)
+    api_router.include_router(stream_router, prefix=prefix)
+api_router.include_router(metrics_router, prefix="/v1")
+api_router.include_router(analytics_router, prefix="/v1")
 
 __all__ = ["api_router"]
 
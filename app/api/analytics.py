@@ -0,0 +1,73 @@
+"""Completion analytics over the progress event log."""
+
+from __future__ import annotations
+
+from typing import List, Literal
+
+from fastapi import APIRouter, Query
+
+from app.db.analytics import (
+    completion_velocity,
+    completions_per_period,
+    time_per_repository,
+)
+from app.db.cohort import cohort_report
+from app.db.executor import db_executor
+from app.models.schemas import (
+    CohortReport,
+    CompletionPeriod,
+    RepositoryTime,
+    VelocityReport,
+)
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+@router.get(
+    "/velocity",
+    response_model=VelocityReport,
+    summary="Daily completion velocity",
+)
+async def get_velocity(
+    days: int = Query(28, ge=1, le=366, description="Days to report, ending today"),
+) -> VelocityReport:
+    """Return net completions per day with a trailing seven-day average."""
+    return await db_executor.run(completion_velocity, days)
+
+
+@router.get(
+    "/completions",
+    response_model=List[CompletionPeriod],
+    summary="Completions per day or week",
+)
+async def get_completions(
+    period: Literal["day", "week"] = "day",
+    limit: int = Query(30, ge=1, le=366, description="Most recent periods"),
+) -> List[CompletionPeriod]:
+    """Return completions and reopenings grouped by day or ISO week."""
+    return await db_executor.run(completions_per_period, period, limit)
+
+
+@router.get(
+    "/repositories",
+    response_model=List[RepositoryTime],
+    summary="Time spent per repository",
+)
+async def get_repository_time() -> List[RepositoryTime]:
+    """Return the first and last active day and active day count per repository."""
+    return await db_executor.run(time_per_repository)
+
+
+@router.get(
+    "/cohort",
+    response_model=CohortReport,
+    summary="Completion across every user",
+)
+async def get_cohort() -> CohortReport:
+    """Return per-stage, per-repository and per-task completion across users.
+
+    Includes each repository's distribution of completed-task counts, the
+    drop-off at each task and the median time from a user's first to last
+    completion in a repository.
+    """
+    return await db_executor.run(cohort_report)
@@ -0,0 +1,43 @@
+"""Prometheus-text metrics endpoint."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app import cluster
+from app.api.stream import progress_broadcaster
+from app.db.cache import progress_cache
+from app.db.duckdb import connection_pool_stats, database_registry_stats
+from app.db.executor import db_executor
+from app.db.writer import progress_writer
+from app.metrics import registry
+
+router = APIRouter(tags=["metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _pool_stats() -> dict[str, object] | None:
+    stats = connection_pool_stats()
+    return stats.as_dict() if stats is not None else None
+
+
+def _owner_client_stats() -> dict[str, object] | None:
+    client = cluster.owner_client
+    return client.stats().as_dict() if client is not None else None
+
+
+registry.register_stats("db_executor", lambda: db_executor.stats().as_dict())
+registry.register_stats("db_pool", _pool_stats)
+registry.register_stats("db_registry", lambda: database_registry_stats().as_dict())
+registry.register_stats("progress_writer", lambda: progress_writer.stats().as_dict())
+registry.register_stats("progress_cache", lambda: progress_cache.stats().as_dict())
+registry.register_stats("stream", lambda: progress_broadcaster.stats().as_dict())
+registry.register_stats("owner_client", _owner_client_stats)
+
+
+@router.get("/metrics", summary="Prometheus metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Return request, query and component metrics in Prometheus text format."""
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
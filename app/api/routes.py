@@ -1,16 +1,39 @@
 """Core API routes for the Task Tracking backend."""
 
-from fastapi import APIRouter, HTTPException
+import asyncio
+from typing import AsyncIterator, Literal
 
+import anyio
+from fastapi import APIRouter, Header, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from app.api.stream import progress_broadcaster
+from app.db.duckdb import DEFAULT_USER_ID
+from app.db.executor import db_executor
+from app.db.ndjson import DEFAULT_CHUNK_ROWS, ProgressRecordStream
 from app.db.progress import (
     ProgressValidationError,
-    fetch_progress_summary,
-    update_task_progress,
+    TaskUpdate,
+    apply_progress_batch,
+    fetch_progress_json,
+    get_data_version,
+)
+from app.db.writer import progress_writer
+from app.models.schemas import (
+    ProgressBatchResult,
+    ProgressDelta,
+    ProgressSummary,
+    TaskProgressBatch,
+    TaskProgressUpdate,
+    UserId,
 )
-from app.models.schemas import ProgressSummary, TaskProgressUpdate
 
 router = APIRouter(tags=["core"])
 
+# Mounted both at ``/v1`` and under ``/v1/users/{user_id}``.
+progress_router = APIRouter(tags=["core"])
+
 
 @router.get("/health", summary="Service health probe")
 async def health_check() -> dict[str, str]:
@@ -18,30 +41,127 @@ async def health_check() -> dict[str, str]:
     return {"status": "ok"}
 
 
-@router.get(
+@progress_router.get(
     "/progress",
     response_model=ProgressSummary,
     summary="Full progress hierarchy",
+    responses={304: {"description": "Hierarchy unchanged since the given ETag"}},
 )
-async def get_progress() -> ProgressSummary:
-    """Return all stages, repositories, and tasks with progress status."""
-    return fetch_progress_summary()
+async def get_progress(
+    user_id: UserId = DEFAULT_USER_ID,
+    format: Literal["json", "ndjson"] = "json",
+    if_none_match: str | None = Header(default=None),
+) -> Response:
+    """Return all stages, repositories, and tasks with a user's progress status.
+
+    The body is the pre-serialized JSON cached for the current data version,
+    sent as-is rather than re-validated against ``ProgressSummary``. The ETag
+    is that version, so clients that send it back via ``If-None-Match`` get
+    a bodiless 304 until the next write.
+
+    ``format=ndjson`` streams one summary, stage or repository record per
+    line straight from the database instead, bypassing the cache, so memory
+    stays flat however large the checklist is.
+    """
+    version = await db_executor.run(get_data_version, user_id)
+    etag = _etag(version)
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    if format == "ndjson":
+        stream = await db_executor.run(
+            ProgressRecordStream, DEFAULT_CHUNK_ROWS, user_id
+        )
+        return _RecordStreamResponse(stream, headers={"ETag": _etag(stream.version)})
+
+    version, payload = await db_executor.run(fetch_progress_json, version, user_id)
+    return Response(
+        content=payload,
+        media_type="application/json",
+        headers={"ETag": _etag(version)},
+    )
+
+
+@progress_router.post(
+    "/progress/batch",
+    response_model=ProgressBatchResult,
+    summary="Apply several task updates atomically",
+)
+async def set_task_progress_batch(
+    payload: TaskProgressBatch,
+    user_id: UserId = DEFAULT_USER_ID,
+) -> ProgressBatchResult:
+    """Validate a whole batch in order, then apply it in one transaction."""
+    updates = [
+        TaskUpdate(item.repo_id, item.task_id, item.completed, item.link)
+        for item in payload.updates
+    ]
+    try:
+        result = await db_executor.run(apply_progress_batch, updates, user_id)
+    except ProgressValidationError as exc:
+        raise HTTPException(status_code=400, detail=exc.message) from exc
 
+    progress_broadcaster.publish("refresh", result.model_dump(mode="json"), user_id)
+    return result
 
-@router.post(
+
+@progress_router.post(
     "/progress/{repo_id}/{task_id}",
+    response_model=ProgressDelta,
     summary="Update a task's completion state",
 )
 async def set_task_progress(
     repo_id: str,
     task_id: str,
     payload: TaskProgressUpdate,
-) -> dict[str, str]:
-    """Mark a task as complete (or incomplete) with sequential validation."""
+    user_id: UserId = DEFAULT_USER_ID,
+) -> ProgressDelta:
+    """Mark a task as complete (or incomplete) and return what changed."""
+    update = TaskUpdate(repo_id, task_id, payload.completed, payload.link)
     try:
-        update_task_progress(repo_id, task_id, payload.completed, payload.link)
+        delta = await progress_writer.update(update, user_id)
     except ProgressValidationError as exc:
         raise HTTPException(status_code=400, detail=exc.message) from exc
 
-    return {"status": "ok"}
+    # The writer has already published the delta to the user's streams.
+    return delta
+
+
+class _RecordStreamResponse(StreamingResponse):
+    """Stream a :class:`ProgressRecordStream`, closing it however sending ends.
+
+    The stream holds one of the capped stream slots from the moment it is
+    opened. A body generator's ``finally`` never runs when the client is gone
+    before the first chunk, so the stream is closed around the whole send
+    instead. ``close`` waits out a fetch in flight, so it runs off the loop.
+    """
+
+    media_type = "application/x-ndjson"
+
+    def __init__(self, stream: ProgressRecordStream, headers: dict[str, str]) -> None:
+        super().__init__(_stream_records(stream), headers=headers)
+        self.stream = stream
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            with anyio.CancelScope(shield=True):
+                await asyncio.to_thread(self.stream.close)
+
+
+async def _stream_records(stream: ProgressRecordStream) -> AsyncIterator[bytes]:
+    while (chunk := await db_executor.run(stream.next_chunk)) is not None:
+        if chunk:
+            yield chunk
+
+
+def _etag(version: int) -> str:
+    return f'"{version}"'
+
 
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {value.strip().removeprefix("W/") for value in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
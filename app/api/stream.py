@@ -0,0 +1,232 @@
+"""Server-Sent Events stream of progress changes."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from app.config import env_int
+from app.db.duckdb import DEFAULT_USER_ID, current_tenant
+from app.metrics import Stats
+from app.models.schemas import ProgressDelta, UserId
+
+DEFAULT_SUBSCRIBER_QUEUE_SIZE = 64
+KEEPALIVE_SECONDS = 15.0
+
+router = APIRouter(tags=["stream"])
+
+
+@dataclass
+class BroadcasterStats(Stats):
+    """Point-in-time counters for a :class:`ProgressBroadcaster`."""
+
+    subscribers: int
+    published: int
+    delivered: int
+    dropped_subscribers: int
+
+
+class Subscription:
+    """One client's bounded queue of a user's pending events."""
+
+    def __init__(
+        self,
+        queue_size: int,
+        user_id: str = DEFAULT_USER_ID,
+        tenant_id: str | None = None,
+    ) -> None:
+        self.queue: asyncio.Queue[tuple[str, Any] | None] = asyncio.Queue(queue_size)
+        self.user_id = user_id
+        self.tenant_id = tenant_id
+        self.dropped = False
+
+    @property
+    def key(self) -> tuple[str | None, str]:
+        return (self.tenant_id, self.user_id)
+
+    async def next_event(self, timeout: float) -> tuple[str, Any] | None:
+        """Wait for the next event; ``None`` means the subscription ended."""
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class ProgressBroadcaster:
+    """Fan progress events out to the open streams of the user they concern.
+
+    Subscribers are indexed by tenant and user, so a write only touches the
+    queues of clients watching that user's progress in that tenant; both are
+    taken from the context that subscribes or publishes. Each subscriber gets
+    a queue of at most ``queue_size`` events. A client that falls that far
+    behind is dropped instead of buffered: its stream ends, and the browser
+    reconnects and reloads the full hierarchy.
+    """
+
+    def __init__(self, queue_size: int = DEFAULT_SUBSCRIBER_QUEUE_SIZE) -> None:
+        self.queue_size = max(1, queue_size)
+        self._subscribers: dict[tuple[str | None, str], set[Subscription]] = {}
+        self.relay: Callable[[str, Any, str | None, str | None], None] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock = threading.Lock()
+        self._published = 0
+        self._delivered = 0
+        self._dropped = 0
+
+    def subscribe(self, user_id: str = DEFAULT_USER_ID) -> Subscription:
+        """Register a subscriber to ``user_id``'s events; call from the loop."""
+        subscription = Subscription(self.queue_size, user_id, current_tenant())
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            self._subscribers.setdefault(subscription.key, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.key)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.key]
+
+    def publish(
+        self,
+        event: str,
+        data: Any,
+        user_id: str | None = DEFAULT_USER_ID,
+    ) -> None:
+        """Queue ``data`` as ``event`` for ``user_id``'s subscribers.
+
+        ``user_id=None`` reaches every subscriber in the current tenant. Safe
+        to call from any thread; off-loop calls are handed to the loop the
+        subscribers live on. When :attr:`relay` is set the event is passed
+        to it instead, and whoever receives it calls :meth:`deliver`; worker
+        processes relay through the database owner so subscribers on every
+        worker see each write.
+        """
+        tenant_id = current_tenant()
+        if self.relay is not None:
+            self.relay(event, data, tenant_id, user_id)
+        else:
+            self.deliver(event, data, tenant_id, user_id)
+
+    def deliver(
+        self,
+        event: str,
+        data: Any,
+        tenant_id: str | None,
+        user_id: str | None,
+    ) -> None:
+        """Queue an event published in ``tenant_id``; safe from any thread."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._deliver(event, data, tenant_id, user_id)
+        else:
+            loop.call_soon_threadsafe(self._deliver, event, data, tenant_id, user_id)
+
+    def stats(self) -> BroadcasterStats:
+        with self._lock:
+            return BroadcasterStats(
+                subscribers=sum(len(group) for group in self._subscribers.values()),
+                published=self._published,
+                delivered=self._delivered,
+                dropped_subscribers=self._dropped,
+            )
+
+    def _deliver(
+        self,
+        event: str,
+        data: Any,
+        tenant_id: str | None,
+        user_id: str | None,
+    ) -> None:
+        with self._lock:
+            self._published += 1
+            if user_id is None:
+                subscribers = [
+                    subscription
+                    for (tenant, _), group in self._subscribers.items()
+                    if tenant == tenant_id
+                    for subscription in group
+                ]
+            else:
+                subscribers = list(self._subscribers.get((tenant_id, user_id), ()))
+        for subscription in subscribers:
+            try:
+                subscription.queue.put_nowait((event, data))
+            except asyncio.QueueFull:
+                self._drop(subscription)
+            else:
+                with self._lock:
+                    self._delivered += 1
+
+    def _drop(self, subscription: Subscription) -> None:
+        self.unsubscribe(subscription)
+        subscription.dropped = True
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(None)
+        with self._lock:
+            self._dropped += 1
+
+
+progress_broadcaster = ProgressBroadcaster(
+    env_int("TASKTRACKER_STREAM_QUEUE_SIZE", DEFAULT_SUBSCRIBER_QUEUE_SIZE)
+)
+
+
+def publish_delta(delta: ProgressDelta, user_id: str = DEFAULT_USER_ID) -> None:
+    """Publish a committed task update as a ``delta`` event.
+
+    Installed as :attr:`~app.db.writer.ProgressWriter.on_commit`, so deltas
+    are published by the writer in the order their updates committed.
+    """
+    progress_broadcaster.publish("delta", delta.model_dump(mode="json"), user_id)
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Encode one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def _event_stream(user_id: str) -> AsyncIterator[str]:
+    # Subscribing here rather than in the route means a response that never
+    # starts sending never holds a subscription.
+    subscription = progress_broadcaster.subscribe(user_id)
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                message = await subscription.next_event(KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if message is None:
+                return
+            yield format_sse(*message)
+    finally:
+        progress_broadcaster.unsubscribe(subscription)
+
+
+@router.get("/progress/stream", summary="Live progress change events")
+async def stream_progress(user_id: UserId = DEFAULT_USER_ID) -> StreamingResponse:
+    """Stream ``delta`` events for task updates and ``refresh`` for bulk writes.
+
+    Only events for ``user_id``'s progress are sent, plus checklist-wide
+    refreshes. Clients apply deltas to the hierarchy they already hold and
+    refetch it on ``refresh`` or after reconnecting.
+    """
+    return StreamingResponse(
+        _event_stream(user_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,90 @@
+"""Bulk progress export and import as Parquet or CSV files."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse
+from starlette.background import BackgroundTask
+
+from app.api.stream import progress_broadcaster
+from app.db.duckdb import DEFAULT_USER_ID
+from app.db.executor import db_executor
+from app.db.progress import ProgressValidationError
+from app.db.transfer import (
+    MEDIA_TYPES,
+    TransferFormat,
+    export_progress,
+    import_progress,
+)
+from app.models.schemas import ProgressImportResult, UserId
+
+router = APIRouter(prefix="/progress", tags=["transfer"])
+
+
+@router.get(
+    "/export",
+    summary="Download a user's task progress as a file",
+    response_class=FileResponse,
+)
+async def get_progress_export(
+    user_id: UserId = DEFAULT_USER_ID,
+    format: TransferFormat = "parquet",
+) -> FileResponse:
+    """Write the user's progress with DuckDB ``COPY`` and stream the file back.
+
+    The file is a temporary copy that is deleted once the response is sent.
+    """
+    path = _temporary_path(format)
+    try:
+        await db_executor.run(export_progress, path, format, user_id)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return FileResponse(
+        path,
+        media_type=MEDIA_TYPES[format],
+        filename=f"progress.{format}",
+        background=BackgroundTask(path.unlink, missing_ok=True),
+    )
+
+
+@router.post(
+    "/import",
+    response_model=ProgressImportResult,
+    summary="Merge task progress from an uploaded file",
+)
+async def post_progress_import(
+    request: Request,
+    user_id: UserId = DEFAULT_USER_ID,
+    format: TransferFormat = "parquet",
+) -> ProgressImportResult:
+    """Load a file produced by the export endpoint, sent as the raw body.
+
+    The body is spooled to disk as it arrives and bulk-loaded by DuckDB, so
+    large files are never held in memory. The whole file is rejected if any
+    row breaks the gating rules. Rows are merged into ``user_id``'s progress
+    whatever user the file was exported for.
+    """
+    path = _temporary_path(format)
+    try:
+        with path.open("wb") as handle:
+            async for chunk in request.stream():
+                handle.write(chunk)
+        result = await db_executor.run(import_progress, path, format, user_id)
+    except ProgressValidationError as exc:
+        raise HTTPException(status_code=400, detail=exc.message) from exc
+    finally:
+        path.unlink(missing_ok=True)
+
+    progress_broadcaster.publish("refresh", result.model_dump(mode="json"), user_id)
+    return result
+
+
+def _temporary_path(fmt: TransferFormat) -> Path:
+    handle, name = tempfile.mkstemp(prefix="tasktracker-progress-", suffix=f".{fmt}")
+    os.close(handle)
+    return Path(name)
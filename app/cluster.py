@@ -0,0 +1,696 @@
+"""Multi-process serving: one process owns DuckDB, worker processes serve HTTP.
+
+DuckDB lets a single process open a database file for writing, so uvicorn
+workers cannot each open it. ``python main.py --workers N`` therefore runs
+an :class:`OwnerServer` in the launcher: it opens the database, runs the
+group-committing :data:`~app.db.writer.progress_writer`, and answers calls
+from the workers over a Unix socket. Each worker connects an
+:class:`OwnerClient` on startup and installs it as
+:attr:`~app.db.executor.DatabaseExecutor.dispatch`, so ``db_executor.run``
+calls in the routes are forwarded to the owner unchanged.
+
+Progress hierarchy reads stay in the worker. After every call that follows
+a released writer lease on its database, the owner pushes the user versions
+that moved to all workers, stamped with a sequence number. Workers record
+the latest version per user and answer ``get_data_version`` and warm
+``fetch_progress_json`` calls from that record and their own
+:data:`~app.db.cache.progress_cache`, asking the owner only on a miss.
+Each reply carries the sequence number of the last notice sent, and the
+worker applies notices up to it before returning, so a worker always sees
+its own writes; notices reach the other workers before the writing request
+is answered.
+
+Progress events published in a worker are relayed through the owner, so
+SSE subscribers receive them whichever worker they are connected to. The
+owner's writer publishes task update deltas as it commits them; those go
+out to every worker the same way, in commit order.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import itertools
+import os
+import secrets
+import signal
+import socket
+import tempfile
+import threading
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Callable, Iterator
+
+from app.api.stream import progress_broadcaster
+from app.db.cache import encode_summary, progress_cache
+from app.db.duckdb import (
+    ALL_USERS,
+    DEFAULT_USER_ID,
+    connection_pool_stats,
+    current_tenant,
+    database_registry_stats,
+    get_connection,
+    read_changed_versions,
+    resolve_db_path,
+    tenant_scope,
+)
+from app.db.executor import DatabaseBusyError, db_executor
+from app.db.ndjson import ProgressRecordStream
+from app.db.progress import (
+    fetch_progress_json,
+    fetch_progress_snapshot,
+    get_data_version,
+    progress_cache_key,
+)
+from app.lifecycle import start_database, stop_database
+from app.metrics import Stats
+
+OWNER_SOCKET_ENV = "TASKTRACKER_OWNER_SOCKET"
+OWNER_AUTHKEY_ENV = "TASKTRACKER_OWNER_AUTHKEY"
+NOTICE_WAIT_SECONDS = 1.0
+
+
+@dataclass
+class OwnerStats(Stats):
+    """Point-in-time counters for an :class:`OwnerServer`."""
+
+    connections: int
+    subscribers: int
+    streams: int
+    calls: int
+    errors: int
+    notices: int
+    events: int
+
+
+@dataclass
+class OwnerClientStats(Stats):
+    """Point-in-time counters for an :class:`OwnerClient`."""
+
+    connected: bool
+    connections: int
+    calls: int
+    local_versions: int
+    tracked_versions: int
+    notices: int
+    notice_waits: int
+    events: int
+
+
+@dataclass
+class RemoteRecordStream:
+    """Worker-side handle on a :class:`ProgressRecordStream` held by the owner."""
+
+    handle: int
+    version: int
+
+    def next_chunk(self) -> bytes | None:
+        return _active_client().stream(self.handle, "next")
+
+    def close(self) -> None:
+        # The owner closes streams of a lost connection itself.
+        with suppress(DatabaseBusyError):
+            _active_client().stream(self.handle, "close")
+
+
+class OwnerServer:
+    """Serve database calls from worker processes over a Unix socket.
+
+    A worker opens one connection per thread for calls, plus a subscription
+    connection on which the owner pushes version notices and relayed
+    progress events. Calls run on the thread serving their connection, in
+    the caller's tenant, against this process's database; only functions
+    in the ``app`` package can be called.
+    """
+
+    def __init__(self, address: str, authkey: bytes) -> None:
+        self.address = address
+        self._authkey = authkey
+        self._listener: Listener | None = None
+        self._lock = threading.Lock()
+        self._connections: set[Connection] = set()
+        self._subscribers: dict[Connection, threading.Lock] = {}
+        self._streams: dict[int, tuple[ProgressRecordStream, Connection]] = {}
+        self._stream_ids = itertools.count(1)
+        # Held while notices are numbered and sent, so every subscriber
+        # receives them in sequence order.
+        self._notice_lock = threading.Lock()
+        self._seq = 0
+        self._write_marks: dict[str, tuple[int, int]] = {}
+        self._announced: dict[str, int] = {}
+        self._calls = 0
+        self._errors = 0
+        self._events = 0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._listener is not None:
+                return
+            self._listener = Listener(self.address, "AF_UNIX", authkey=self._authkey)
+        progress_broadcaster.relay = self._publish
+        threading.Thread(
+            target=self._accept,
+            name="tasktracker-owner",
+            daemon=True,
+        ).start()
+
+    def close(self) -> None:
+        """Stop accepting, drop every worker connection and open stream."""
+        with self._lock:
+            listener, self._listener = self._listener, None
+            connections = list(self._connections)
+            streams = [stream for stream, _ in self._streams.values()]
+            self._streams.clear()
+        if progress_broadcaster.relay == self._publish:
+            progress_broadcaster.relay = None
+        if listener is not None:
+            listener.close()
+        for conn in connections:
+            _hang_up(conn)
+        for stream in streams:
+            stream.close()
+
+    def stats(self) -> OwnerStats:
+        with self._lock:
+            return OwnerStats(
+                connections=len(self._connections),
+                subscribers=len(self._subscribers),
+                streams=len(self._streams),
+                calls=self._calls,
+                errors=self._errors,
+                notices=self._seq,
+                events=self._events,
+            )
+
+    def _accept(self) -> None:
+        while True:
+            listener = self._listener
+            if listener is None:
+                return
+            try:
+                conn = listener.accept()
+            except OSError:
+                if self._listener is None:
+                    return
+                continue
+            except Exception:
+                # A client that failed the handshake; keep serving the rest.
+                continue
+            threading.Thread(
+                target=self._serve,
+                args=(conn,),
+                name="tasktracker-owner-conn",
+                daemon=True,
+            ).start()
+
+    def _serve(self, conn: Connection) -> None:
+        with self._lock:
+            self._connections.add(conn)
+        try:
+            message = conn.recv()
+            if message[0] == "subscribe":
+                self._serve_subscriber(conn)
+            while True:
+                self._reply(conn, self._handle(message, conn))
+                message = conn.recv()
+        except (EOFError, OSError):
+            pass
+        finally:
+            with self._lock:
+                self._connections.discard(conn)
+                self._subscribers.pop(conn, None)
+                orphans = [
+                    self._streams.pop(handle)[0]
+                    for handle, (_, owner) in list(self._streams.items())
+                    if owner is conn
+                ]
+            for stream in orphans:
+                stream.close()
+            conn.close()
+
+    def _serve_subscriber(self, conn: Connection) -> None:
+        with self._notice_lock:
+            conn.send(("subscribed", self._seq))
+            with self._lock:
+                self._subscribers[conn] = threading.Lock()
+        while True:
+            message = conn.recv()
+            if message[0] == "publish":
+                self._publish(*message[1:])
+
+    def _publish(
+        self,
+        event: str,
+        data: Any,
+        tenant_id: str | None,
+        user_id: str | None,
+    ) -> None:
+        """Send a progress event to every worker's subscribers."""
+        with self._lock:
+            self._events += 1
+        self._broadcast(("event", event, data, tenant_id, user_id))
+
+    def _handle(self, message: tuple, conn: Connection) -> tuple[bool, Any, int]:
+        with self._lock:
+            self._calls += 1
+        try:
+            if message[0] == "call":
+                value = self._call(conn, *message[1:])
+            elif message[0] == "stream":
+                value = self._stream(*message[1:])
+            else:
+                raise ValueError(f"Unknown owner request {message[0]!r}")
+        except Exception as exc:
+            with self._lock:
+                self._errors += 1
+            return (False, exc, self._seq)
+        return (True, value, self._seq)
+
+    def _reply(self, conn: Connection, reply: tuple[bool, Any, int]) -> None:
+        try:
+            conn.send(reply)
+        except OSError:
+            raise
+        except Exception as exc:
+            # Pickling failed before anything was written, so the
+            # connection is still in step; report the failure instead.
+            _, value, seq = reply
+            failure = RuntimeError(f"{type(value).__name__}: {value} ({exc})")
+            conn.send((False, failure, seq))
+
+    def _call(
+        self,
+        conn: Connection,
+        module: str,
+        qualname: str,
+        args: tuple,
+        kwargs: dict[str, Any],
+        tenant_id: str | None,
+    ) -> Any:
+        fn = _resolve(module, qualname)
+        with tenant_scope(tenant_id):
+            try:
+                result = fn(*args, **kwargs)
+            finally:
+                self._announce()
+        if isinstance(result, ProgressRecordStream):
+            handle = next(self._stream_ids)
+            with self._lock:
+                self._streams[handle] = (result, conn)
+            return RemoteRecordStream(handle, result.version)
+        return result
+
+    def _stream(self, handle: int, op: str) -> bytes | None:
+        if op == "close":
+            with self._lock:
+                entry = self._streams.pop(handle, None)
+            if entry is not None:
+                entry[0].close()
+            return None
+        with self._lock:
+            entry = self._streams.get(handle)
+        if entry is None:
+            raise ValueError(f"Unknown record stream {handle}")
+        return entry[0].next_chunk()
+
+    def _announce(self) -> None:
+        """Notify subscribers of versions bumped in the current database."""
+        pool = connection_pool_stats()
+        if pool is None:
+            return
+        # Released writer leases count per open handle, and the registry's
+        # open count changes whenever a handle is replaced, so together they
+        # move once anything new has been committed. A lease still held is
+        # not counted yet: its commit is announced after its release.
+        mark = (database_registry_stats().opened, pool.writer_releases)
+        with self._notice_lock:
+            if self._write_marks.get(pool.db_path) == mark:
+                return
+            self._write_marks[pool.db_path] = mark
+            with get_connection(read_only=True) as conn:
+                rows = read_changed_versions(conn, self._announced.get(pool.db_path, 0))
+            if not rows:
+                return
+            self._announced[pool.db_path] = rows[-1][1]
+            self._seq += 1
+            self._send_all(("versions", self._seq, pool.db_path, rows))
+
+    def _broadcast(self, message: tuple) -> None:
+        with self._notice_lock:
+            self._send_all(message)
+
+    def _send_all(self, message: tuple) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.items())
+        for conn, send_lock in subscribers:
+            try:
+                with send_lock:
+                    conn.send(message)
+            except OSError:
+                with self._lock:
+                    self._subscribers.pop(conn, None)
+
+
+class OwnerClient:
+    """A worker process's connections to the :class:`OwnerServer`.
+
+    :meth:`dispatch` is meant for :attr:`DatabaseExecutor.dispatch
+    <app.db.executor.DatabaseExecutor.dispatch>`: it forwards module-level
+    ``app`` functions to the owner, runs anything else (such as methods of a
+    :class:`RemoteRecordStream`) locally, and answers data version and
+    hierarchy reads from the versions the owner has announced. Without a
+    subscription, for instance after the owner went away, every read is
+    forwarded.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        authkey: bytes,
+        on_event: Callable[[str, Any, str | None, str | None], None] | None = None,
+    ) -> None:
+        self.address = address
+        self.on_event = on_event
+        self._authkey = authkey
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: list[Connection] = []
+        self._subscription: Connection | None = None
+        self._send_lock = threading.Lock()
+        # Guards the version record; notified as each notice is applied.
+        self._applied = threading.Condition()
+        self._seen = 0
+        self._versions: dict[tuple[str, str], int] = {}
+        self._calls = 0
+        self._local_versions = 0
+        self._notices = 0
+        self._notice_waits = 0
+        self._events = 0
+
+    def connect(self) -> None:
+        """Subscribe to the owner's notices and start applying them."""
+        subscription = Client(self.address, "AF_UNIX", authkey=self._authkey)
+        subscription.send(("subscribe",))
+        _, seq = subscription.recv()
+        with self._applied:
+            self._seen = seq
+            self._subscription = subscription
+        threading.Thread(
+            target=self._listen,
+            args=(subscription,),
+            name="tasktracker-owner-notices",
+            daemon=True,
+        ).start()
+
+    def close(self) -> None:
+        with self._lock:
+            connections, self._connections = self._connections, []
+        with self._applied:
+            subscription, self._subscription = self._subscription, None
+        for conn in connections:
+            conn.close()
+        if subscription is not None:
+            _hang_up(subscription)
+
+    def dispatch(self, fn: Callable[..., Any], /, *args, **kwargs) -> Any:
+        if fn is get_data_version:
+            return self.data_version(*args, **kwargs)
+        if fn is fetch_progress_json:
+            return self.progress_json(*args, **kwargs)
+        qualname = getattr(fn, "__qualname__", ".")
+        if "." in qualname or getattr(fn, "__module__", "").split(".")[0] != "app":
+            return fn(*args, **kwargs)
+        return self.call(fn, *args, **kwargs)
+
+    def call(self, fn: Callable[..., Any], /, *args, **kwargs) -> Any:
+        """Run ``fn(*args, **kwargs)`` in the owner, in the current tenant."""
+        return self._request(
+            ("call", fn.__module__, fn.__qualname__, args, kwargs, current_tenant())
+        )
+
+    def stream(self, handle: int, op: str) -> bytes | None:
+        return self._request(("stream", handle, op))
+
+    def publish(
+        self,
+        event: str,
+        data: Any,
+        tenant_id: str | None,
+        user_id: str | None,
+    ) -> None:
+        """Relay a progress event to the subscribers of every worker."""
+        subscription = self._subscription
+        if subscription is not None:
+            try:
+                with self._send_lock:
+                    subscription.send(("publish", event, data, tenant_id, user_id))
+                return
+            except OSError:
+                pass
+        if self.on_event is not None:
+            self.on_event(event, data, tenant_id, user_id)
+
+    def data_version(self, user_id: str = DEFAULT_USER_ID) -> int:
+        """Return ``user_id``'s data version, from announced versions when known."""
+        key = (str(resolve_db_path()), user_id)
+        with self._applied:
+            if self._subscription is not None and key in self._versions:
+                self._local_versions += 1
+                return self._version_of(key)
+        return self._learn(key, self.call(get_data_version, user_id))
+
+    def progress_json(
+        self,
+        known_version: int | None = None,
+        user_id: str = DEFAULT_USER_ID,
+    ) -> tuple[int, bytes]:
+        """Serve the hierarchy from this process's cache, filling it from the owner."""
+        cache_key = progress_cache_key(user_id)
+        if known_version is None:
+            known_version = self.data_version(user_id)
+        payload = progress_cache.get_json(cache_key, known_version)
+        if payload is not None:
+            return known_version, payload
+
+        snapshot = self.call(fetch_progress_snapshot, known_version, user_id)
+        latest = self._learn((str(resolve_db_path()), user_id), snapshot.version)
+        if snapshot.version == latest:
+            progress_cache.put(cache_key, snapshot.summary, snapshot.version)
+        payload = progress_cache.get_json(cache_key, snapshot.version)
+        if payload is None:
+            payload = encode_summary(snapshot.summary)
+        return snapshot.version, payload
+
+    def stats(self) -> OwnerClientStats:
+        with self._lock, self._applied:
+            return OwnerClientStats(
+                connected=self._subscription is not None,
+                connections=len(self._connections),
+                calls=self._calls,
+                local_versions=self._local_versions,
+                tracked_versions=len(self._versions),
+                notices=self._notices,
+                notice_waits=self._notice_waits,
+                events=self._events,
+            )
+
+    def _connection(self) -> Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or conn.closed:
+            try:
+                conn = Client(self.address, "AF_UNIX", authkey=self._authkey)
+            except OSError as exc:
+                raise DatabaseBusyError("The database owner is unavailable.") from exc
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _request(self, message: tuple) -> Any:
+        conn = self._connection()
+        try:
+            conn.send(message)
+            ok, value, seq = conn.recv()
+        except BaseException as exc:
+            # A half-finished exchange leaves the connection out of step.
+            conn.close()
+            with self._lock:
+                self._connections = [c for c in self._connections if c is not conn]
+            if isinstance(exc, (EOFError, OSError)):
+                raise DatabaseBusyError("The database owner is unavailable.") from exc
+            raise
+        with self._lock:
+            self._calls += 1
+        self._wait_for(seq)
+        if not ok:
+            raise value
+        return value
+
+    def _wait_for(self, seq: int) -> None:
+        with self._applied:
+            if self._seen >= seq or self._subscription is None:
+                return
+            self._notice_waits += 1
+            self._applied.wait_for(
+                lambda: self._seen >= seq or self._subscription is None,
+                NOTICE_WAIT_SECONDS,
+            )
+
+    def _version_of(self, key: tuple[str, str]) -> int:
+        return max(self._versions.get(key, 0), self._versions.get((key[0], ALL_USERS), 0))
+
+    def _learn(self, key: tuple[str, str], version: int) -> int:
+        with self._applied:
+            if self._subscription is None:
+                return version
+            self._versions[key] = max(self._versions.get(key, 0), version)
+            return self._version_of(key)
+
+    def _listen(self, subscription: Connection) -> None:
+        try:
+            while True:
+                message = subscription.recv()
+                if message[0] == "versions":
+                    self._apply_versions(*message[1:])
+                elif message[0] == "event":
+                    with self._lock:
+                        self._events += 1
+                    if self.on_event is not None:
+                        self.on_event(*message[1:])
+        except (EOFError, OSError):
+            pass
+        finally:
+            with self._applied:
+                if self._subscription is subscription:
+                    self._subscription = None
+                # Without notices the record would go stale.
+                self._versions.clear()
+                self._applied.notify_all()
+            subscription.close()
+
+    def _apply_versions(
+        self,
+        seq: int,
+        db_path: str,
+        rows: list[tuple[str, int]],
+    ) -> None:
+        with self._applied:
+            # Users never read here are recorded too: a version fetched just
+            # before this notice must not outlive it.
+            for user_id, version in rows:
+                key = (db_path, user_id)
+                self._versions[key] = max(self._versions.get(key, 0), version)
+            self._seen = seq
+            self._notices += 1
+            self._applied.notify_all()
+
+
+owner_client: OwnerClient | None = None
+
+
+def _hang_up(conn: Connection) -> None:
+    """End a connection another thread is reading; that thread closes it.
+
+    Closing it here instead would pull the handle out from under a blocked
+    ``recv``, which then fails with a ``TypeError`` rather than ``EOFError``.
+    """
+    with suppress(OSError):
+        with socket.fromfd(conn.fileno(), socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.shutdown(socket.SHUT_RDWR)
+
+
+def _resolve(module: str, qualname: str) -> Callable[..., Any]:
+    if module.split(".")[0] != "app" or "." in qualname:
+        raise ValueError(f"{module}.{qualname} cannot be called remotely")
+    return getattr(importlib.import_module(module), qualname)
+
+
+def _active_client() -> OwnerClient:
+    if owner_client is None:
+        raise DatabaseBusyError("The database owner is unavailable.")
+    return owner_client
+
+
+def owner_address() -> str | None:
+    """Return the owner's socket when this process is a worker."""
+    return os.getenv(OWNER_SOCKET_ENV) or None
+
+
+def owner_authkey() -> bytes:
+    value = os.getenv(OWNER_AUTHKEY_ENV)
+    if not value:
+        raise RuntimeError(f"{OWNER_AUTHKEY_ENV} must hold the owner's hex auth key")
+    return bytes.fromhex(value)
+
+
+def start_worker(address: str) -> OwnerClient:
+    """Route this process's DB calls and progress events through the owner."""
+    global owner_client
+    client = OwnerClient(address, owner_authkey(), on_event=progress_broadcaster.deliver)
+    client.connect()
+    db_executor.dispatch = client.dispatch
+    progress_broadcaster.relay = client.publish
+    owner_client = client
+    return client
+
+
+def stop_worker() -> None:
+    global owner_client
+    db_executor.dispatch = None
+    progress_broadcaster.relay = None
+    db_executor.shutdown()
+    client, owner_client = owner_client, None
+    if client is not None:
+        client.close()
+
+
+@contextmanager
+def run_owner(address: str, authkey: bytes) -> Iterator[OwnerServer]:
+    """Open the database and serve it to workers on ``address`` until exit."""
+    start_database()
+    server = OwnerServer(address, authkey)
+    try:
+        server.start()
+        yield server
+    finally:
+        server.close()
+        stop_database()
+
+
+def serve(host: str, port: int, workers: int) -> None:
+    """Run ``workers`` uvicorn processes in front of one database owner."""
+    import uvicorn
+
+    authkey = secrets.token_bytes(32)
+    with tempfile.TemporaryDirectory(prefix="tasktracker-") as rundir:
+        address = os.path.join(rundir, "owner.sock")
+        with run_owner(address, authkey):
+            # Worker processes inherit these and connect on startup.
+            os.environ[OWNER_SOCKET_ENV] = address
+            os.environ[OWNER_AUTHKEY_ENV] = authkey.hex()
+            uvicorn.run("app.main:app", host=host, port=port, workers=workers)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Own the database for workers started separately."
+    )
+    parser.add_argument("--socket", required=True, help="Unix socket path to listen on")
+    args = parser.parse_args()
+
+    stopped = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+    with run_owner(args.socket, owner_authkey()):
+        try:
+            stopped.wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    # Run the imported module's copy, so handles pickled for workers name
+    # app.cluster rather than __main__.
+    from app.cluster import main as run_main
+
+    run_main()
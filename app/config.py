@@ -0,0 +1,21 @@
+"""Numeric settings read from ``TASKTRACKER_*`` environment variables.
+
+Unset or empty variables fall back to the caller's default; anything else
+must parse, so a typo fails at startup rather than being ignored.
+"""
+
+from __future__ import annotations
+
+import os
+
+
+def env_int(name: str, default: int) -> int:
+    """Return the integer in environment variable ``name``, else ``default``."""
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def env_float(name: str, default: float) -> float:
+    """Return the number in environment variable ``name``, else ``default``."""
+    value = os.getenv(name)
+    return float(value) if value else default
@@ -1,6 +1,13 @@
 """Static data payloads for seeding DuckDB."""
 
-from .checklist import STAGES  # noqa: F401
 
-__all__ = ["STAGES"]
+def __getattr__(name: str):
+    # The checklist module is large; import it only when it is first used.
+    if name == "STAGES":
+        from .checklist import STAGES
+
+        return STAGES
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
+
+__all__ = ["STAGES"]
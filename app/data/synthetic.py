@@ -0,0 +1,141 @@
+"""Deterministic synthetic roadmaps for scale testing.
+
+:func:`generate_stages` returns payloads shaped like
+:data:`app.data.checklist.STAGES`, so they can be fed to
+:func:`app.db.seeder.seed_static_data` directly. The same
+:class:`RoadmapSpec` always yields the same roadmap and progress state.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List
+
+if TYPE_CHECKING:
+    from app.db.seeder import SeedReport
+
+StagePayload = Dict[str, Any]
+
+_WORDS = (
+    "build train evaluate deploy model data pipeline feature vector tensor "
+    "gradient loss batch layer attention token embedding schema query index "
+    "cache latency throughput service client review refactor test benchmark"
+).split()
+
+
+@dataclass(frozen=True)
+class RoadmapSpec:
+    """Shape of a generated roadmap.
+
+    ``completion`` is the expected fraction of tasks marked complete. Each
+    repository completes a prefix of its tasks, so the progress state always
+    respects sequential gating.
+    """
+
+    stages: int = 5
+    repos_per_stage: int = 4
+    tasks_per_repo: int = 10
+    description_words: int = 12
+    completion: float = 0.0
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if min(self.stages, self.repos_per_stage, self.tasks_per_repo) < 1:
+            raise ValueError("Stage, repository and task counts must be positive.")
+        if self.description_words < 0:
+            raise ValueError("description_words must not be negative.")
+        if not 0.0 <= self.completion <= 1.0:
+            raise ValueError("completion must be between 0 and 1.")
+
+    @property
+    def total_tasks(self) -> int:
+        return self.stages * self.repos_per_stage * self.tasks_per_repo
+
+
+def generate_stages(spec: RoadmapSpec) -> List[StagePayload]:
+    """Return a ``STAGES``-shaped roadmap for ``spec``."""
+    rng = random.Random(spec.seed)
+    stages: List[StagePayload] = []
+    for s in range(1, spec.stages + 1):
+        stage_id = f"stage-{s}"
+        repositories = []
+        for r in range(1, spec.repos_per_stage + 1):
+            repo_id = f"{stage_id}-repo-{r}"
+            repositories.append(
+                {
+                    "id": repo_id,
+                    "stage_id": stage_id,
+                    "title": f"Repository {s}.{r}",
+                    "description": _description(rng, spec.description_words),
+                    "ordering": r,
+                    "tasks": [
+                        {
+                            "id": f"{repo_id}-task-{t}",
+                            "title": f"Task {s}.{r}.{t}",
+                            "description": _description(rng, spec.description_words),
+                            "ordering": t,
+                        }
+                        for t in range(1, spec.tasks_per_repo + 1)
+                    ],
+                }
+            )
+        stages.append(
+            {
+                "id": stage_id,
+                "title": f"Stage {s}",
+                "description": _description(rng, spec.description_words),
+                "ordering": s,
+                "repositories": repositories,
+            }
+        )
+    return stages
+
+
+def completed_tasks(
+    stages: List[StagePayload],
+    spec: RoadmapSpec,
+) -> list[tuple[str, str]]:
+    """Pick ``(repo_id, task_id)`` pairs to complete, in gating order.
+
+    Each repository completes a binomially distributed prefix of its tasks
+    with mean ``spec.completion``.
+    """
+    rng = random.Random(spec.seed + 1)
+    picked: list[tuple[str, str]] = []
+    for stage in stages:
+        for repo in stage["repositories"]:
+            tasks = sorted(repo["tasks"], key=lambda task: task["ordering"])
+            count = rng.binomialvariate(len(tasks), spec.completion)
+            picked.extend((repo["id"], task["id"]) for task in tasks[:count])
+    return picked
+
+
+def seed_roadmap(spec: RoadmapSpec) -> SeedReport:
+    """Generate ``spec`` and write it, with its progress, to the current DB.
+
+    Returns the report of the checklist sync. The target file is the one
+    :func:`app.db.duckdb.resolve_db_path` points at; any previous checklist
+    in it is diffed away like a checklist edit. Serve the file with
+    ``TASKTRACKER_CHECKLIST_SOURCE=stored`` so startup keeps the roadmap.
+    """
+    from app.db.duckdb import init_db
+    from app.db.progress import TaskUpdate, apply_progress_batch
+    from app.db.seeder import seed_static_data
+
+    stages = generate_stages(spec)
+    init_db()
+    report = seed_static_data(stages)
+    updates = [
+        TaskUpdate(repo_id, task_id, True, f"https://example.com/{task_id}")
+        for repo_id, task_id in completed_tasks(stages, spec)
+    ]
+    if updates:
+        apply_progress_batch(updates)
+    return report
+
+
+def _description(rng: random.Random, words: int) -> str | None:
+    if not words:
+        return None
+    return " ".join(rng.choices(_WORDS, k=words)).capitalize() + "."
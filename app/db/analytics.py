@@ -0,0 +1,319 @@
+"""Progress event log and the completion analytics built on it.
+
+Every task update appends a row to ``progress_events`` in the transaction
+that changes ``task_progress``. Analytics read ``progress_daily``, a
+per-day, per-repository rollup that is brought up to date on demand by
+folding in only the events past its watermark, so requests never rescan
+the full history.
+"""
+
+from __future__ import annotations
+
+import datetime
+from typing import Literal, Sequence
+
+import duckdb
+
+from app.db.duckdb import DEFAULT_USER_ID, get_connection, list_param
+from app.metrics import query_timer
+from app.models.schemas import (
+    CompletionPeriod,
+    RepositoryTime,
+    VelocityPoint,
+    VelocityReport,
+)
+
+DAILY_ROLLUP = "progress_daily"
+VELOCITY_WINDOW_DAYS = 7
+
+# (task_id, repository_id, completed, was_completed, link)
+ProgressEvent = tuple[str, str, bool, bool, str | None]
+
+
+def append_progress_events(
+    conn: duckdb.DuckDBPyConnection,
+    events: Sequence[ProgressEvent],
+    user_id: str = DEFAULT_USER_ID,
+) -> None:
+    """Append ``user_id``'s ``events`` to the log inside the write's transaction."""
+    if not events:
+        return
+    task_ids, repo_ids, completed, was_completed, links = zip(*events)
+    conn.execute(
+        """
+        INSERT INTO progress_events
+            (user_id, task_id, repository_id, completed, was_completed, link)
+        SELECT
+            $6,
+            UNNEST($1::JSON::TEXT[]),
+            UNNEST($2::JSON::TEXT[]),
+            UNNEST($3::JSON::BOOLEAN[]),
+            UNNEST($4::JSON::BOOLEAN[]),
+            UNNEST($5::JSON::TEXT[]);
+        """,
+        [
+            list_param(task_ids),
+            list_param(repo_ids),
+            list_param(completed),
+            list_param(was_completed),
+            list_param(links),
+            user_id,
+        ],
+    )
+
+
+def append_user_progress_events(
+    conn: duckdb.DuckDBPyConnection,
+    events: Sequence[tuple[str, ProgressEvent]],
+) -> None:
+    """Append ``(user_id, event)`` pairs for several users in one statement."""
+    if not events:
+        return
+    user_ids, user_events = zip(*events)
+    task_ids, repo_ids, completed, was_completed, links = zip(*user_events)
+    conn.execute(
+        """
+        INSERT INTO progress_events
+            (user_id, task_id, repository_id, completed, was_completed, link)
+        SELECT
+            UNNEST($1::JSON::TEXT[]),
+            UNNEST($2::JSON::TEXT[]),
+            UNNEST($3::JSON::TEXT[]),
+            UNNEST($4::JSON::BOOLEAN[]),
+            UNNEST($5::JSON::BOOLEAN[]),
+            UNNEST($6::JSON::TEXT[]);
+        """,
+        [
+            list_param(user_ids),
+            list_param(task_ids),
+            list_param(repo_ids),
+            list_param(completed),
+            list_param(was_completed),
+            list_param(links),
+        ],
+    )
+
+
+def refresh_daily_rollup(conn: duckdb.DuckDBPyConnection) -> int:
+    """Fold events past the watermark into ``progress_daily``.
+
+    Returns how many events were folded in. Runs on the writer lease, so no
+    event can be appended between reading the high-water mark and moving
+    the watermark to it.
+    """
+    low, high = _rollup_bounds(conn)
+    if high <= low:
+        return 0
+
+    conn.begin()
+    try:
+        conn.execute(
+            """
+            INSERT INTO progress_daily (day, repository_id, completions, reopenings)
+            SELECT
+                CAST(occurred_at AS DATE),
+                repository_id,
+                COUNT(*) FILTER (WHERE completed AND NOT was_completed),
+                COUNT(*) FILTER (WHERE was_completed AND NOT completed)
+            FROM progress_events
+            WHERE id > $low AND id <= $high
+            GROUP BY ALL
+            ON CONFLICT (day, repository_id) DO UPDATE
+            SET completions = completions + excluded.completions,
+                reopenings = reopenings + excluded.reopenings;
+            """,
+            {"low": low, "high": high},
+        )
+        conn.execute(
+            """
+            INSERT INTO rollup_watermarks (name, event_id) VALUES (?, ?)
+            ON CONFLICT (name) DO UPDATE SET event_id = excluded.event_id;
+            """,
+            (DAILY_ROLLUP, high),
+        )
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return high - low
+
+
+def _rollup_bounds(conn: duckdb.DuckDBPyConnection) -> tuple[int, int]:
+    """Return the rollup watermark and the newest event id."""
+    return conn.execute(
+        """
+        SELECT
+            COALESCE((SELECT event_id FROM rollup_watermarks WHERE name = ?), 0),
+            COALESCE((SELECT MAX(id) FROM progress_events), 0);
+        """,
+        (DAILY_ROLLUP,),
+    ).fetchone()
+
+
+def _refresh_rollup() -> None:
+    """Bring ``progress_daily`` up to date before a report reads it.
+
+    Only the fold itself takes the writer lease, and only when a reader
+    cursor sees events past the watermark; reports then query on a reader,
+    so they never hold up progress writes.
+    """
+    with query_timer("analytics_refresh"):
+        with get_connection(read_only=True) as conn:
+            low, high = _rollup_bounds(conn)
+        if high > low:
+            with get_connection() as conn:
+                refresh_daily_rollup(conn)
+
+
+def completion_velocity(
+    days: int = 28,
+    until: datetime.date | None = None,
+) -> VelocityReport:
+    """Net completions per day over ``days`` days with a trailing average."""
+    until = until or datetime.date.today()
+    start = until - datetime.timedelta(days=days - 1)
+    _refresh_rollup()
+    with get_connection(read_only=True) as conn:
+        with query_timer("analytics_velocity"):
+            rows = conn.execute(
+                """
+                WITH calendar AS (
+                    SELECT CAST(range AS DATE) AS day
+                    FROM range(
+                        CAST($start AS DATE) - $lookback,
+                        CAST($until AS DATE) + 1,
+                        INTERVAL 1 DAY
+                    )
+                ),
+                daily AS (
+                    SELECT
+                        day,
+                        SUM(completions) AS completions,
+                        SUM(reopenings) AS reopenings
+                    FROM progress_daily
+                    WHERE day BETWEEN CAST($start AS DATE) - $lookback
+                        AND CAST($until AS DATE)
+                    GROUP BY day
+                ),
+                series AS (
+                    SELECT
+                        calendar.day,
+                        COALESCE(daily.completions, 0) AS completions,
+                        COALESCE(daily.reopenings, 0) AS reopenings,
+                        AVG(
+                            COALESCE(daily.completions, 0)
+                            - COALESCE(daily.reopenings, 0)
+                        ) OVER (
+                            ORDER BY calendar.day
+                            ROWS BETWEEN $lookback PRECEDING AND CURRENT ROW
+                        ) AS trailing_average
+                    FROM calendar
+                    LEFT JOIN daily USING (day)
+                )
+                SELECT day, completions, reopenings, trailing_average
+                FROM series
+                WHERE day >= CAST($start AS DATE)
+                ORDER BY day;
+                """,
+                {
+                    "start": start,
+                    "until": until,
+                    "lookback": VELOCITY_WINDOW_DAYS - 1,
+                },
+            ).fetchall()
+
+    points = [
+        VelocityPoint(
+            day=day,
+            completions=completions,
+            reopenings=reopenings,
+            trailing_average=round(average, 2),
+        )
+        for day, completions, reopenings, average in rows
+    ]
+    net = sum(point.completions - point.reopenings for point in points)
+    return VelocityReport(
+        days=days,
+        window_days=VELOCITY_WINDOW_DAYS,
+        net_completions=net,
+        average_per_day=round(net / days, 2),
+        points=points,
+    )
+
+
+def completions_per_period(
+    period: Literal["day", "week"] = "day",
+    limit: int = 30,
+) -> list[CompletionPeriod]:
+    """Completions and reopenings per day or ISO week, most recent ``limit``."""
+    _refresh_rollup()
+    with get_connection(read_only=True) as conn:
+        with query_timer("analytics_completions"):
+            rows = conn.execute(
+                """
+                SELECT * FROM (
+                    SELECT
+                        CAST(date_trunc($period, day) AS DATE) AS period_start,
+                        SUM(completions) AS completions,
+                        SUM(reopenings) AS reopenings
+                    FROM progress_daily
+                    GROUP BY period_start
+                    ORDER BY period_start DESC
+                    LIMIT $limit
+                )
+                ORDER BY period_start;
+                """,
+                {"period": period, "limit": limit},
+            ).fetchall()
+    return [
+        CompletionPeriod(
+            period_start=period_start,
+            completions=completions,
+            reopenings=reopenings,
+        )
+        for period_start, completions, reopenings in rows
+    ]
+
+
+def time_per_repository() -> list[RepositoryTime]:
+    """How long each repository has been worked on, from the daily rollup."""
+    _refresh_rollup()
+    with get_connection(read_only=True) as conn:
+        with query_timer("analytics_repositories"):
+            rows = conn.execute(
+                """
+                SELECT
+                    d.repository_id,
+                    r.title,
+                    MIN(d.day) AS first_day,
+                    MAX(d.day) AS last_day,
+                    COUNT(*) FILTER (WHERE d.completions > 0) AS active_days,
+                    SUM(d.completions) AS completions,
+                    SUM(d.reopenings) AS reopenings
+                FROM progress_daily d
+                LEFT JOIN repositories r ON r.id = d.repository_id
+                GROUP BY d.repository_id, r.title, r.stage_id, r.ordering
+                ORDER BY r.stage_id NULLS LAST, r.ordering, d.repository_id;
+                """
+            ).fetchall()
+    return [
+        RepositoryTime(
+            repository_id=repository_id,
+            title=title,
+            first_day=first_day,
+            last_day=last_day,
+            span_days=(last_day - first_day).days + 1,
+            active_days=active_days,
+            completions=completions,
+            reopenings=reopenings,
+        )
+        for (
+            repository_id,
+            title,
+            first_day,
+            last_day,
+            active_days,
+            completions,
+            reopenings,
+        ) in rows
+    ]
@@ -0,0 +1,277 @@
+"""In-memory cache of assembled progress hierarchies."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable
+
+from pydantic import TypeAdapter
+
+from app.config import env_float, env_int
+from app.metrics import Stats, phase_timer
+from app.models.schemas import (
+    ProgressDelta,
+    ProgressMetrics,
+    ProgressSummary,
+    Repository,
+    Stage,
+    Task,
+)
+
+DEFAULT_CACHE_TTL_SECONDS = 300.0
+DEFAULT_CACHE_MAX_ENTRIES = 16
+
+
+@dataclass
+class CacheStats(Stats):
+    """Point-in-time counters for a :class:`ProgressCache`."""
+
+    entries: int
+    max_entries: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    patches: int
+    invalidations: int
+    evictions: int
+
+
+@dataclass
+class _TaskRef:
+    stage: Stage
+    repository: Repository
+    task: Task
+
+
+@dataclass
+class _CacheEntry:
+    summary: ProgressSummary
+    version: int
+    loaded_at: float
+    tasks: dict[str, _TaskRef] = field(default_factory=dict)
+    payload: bytes | None = None
+
+
+class ProgressCache:
+    """Bounded LRU of :class:`ProgressSummary` trees keyed by database and user.
+
+    Entries are built once from the database and then kept current by
+    patching completion state in place after each committed write, so a
+    warm read is a dictionary lookup. Each entry remembers the data version
+    it reflects; reads that expect a different version miss, and entries older
+    than ``ttl_seconds`` are rebuilt on next access regardless.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+        self._patches = 0
+        self._invalidations = 0
+        self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get(self, key: str, version: int | None = None) -> ProgressSummary | None:
+        """Return the cached summary for ``key`` or ``None`` on a miss.
+
+        When ``version`` is given, an entry reflecting any other data version
+        counts as a miss. The returned tree is shared and patched in place by
+        later writes; callers must treat it as read-only.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (
+                self._is_expired(entry)
+                or (version is not None and entry.version != version)
+            ):
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry.summary
+
+    def put(self, key: str, summary: ProgressSummary, version: int) -> None:
+        """Store a freshly assembled summary and index its tasks."""
+        if not self.enabled:
+            return
+        entry = _CacheEntry(summary=summary, version=version, loaded_at=self._clock())
+        for stage in summary.stages:
+            for repo in stage.repositories:
+                for task in repo.tasks:
+                    entry.tasks[task.id] = _TaskRef(stage, repo, task)
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def patch_task(
+        self,
+        key: str,
+        task_id: str,
+        completed: bool,
+        link: str | None,
+        version: int,
+        previous_version: int | None = None,
+    ) -> ProgressDelta | None:
+        """Apply the committed write that produced ``version`` to the cache.
+
+        ``previous_version`` is the version the write was applied on top of
+        (``version - 1`` unless given). Returns the resulting delta, or
+        ``None`` when nothing was patched. An entry that missed an
+        intermediate write, or that does not know the task, is dropped so
+        the next read rebuilds it.
+        """
+        if previous_version is None:
+            previous_version = version - 1
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            ref = entry.tasks.get(task_id)
+            if ref is None or entry.version != previous_version:
+                self._drop(key)
+                return None
+
+            ref.task.completed = completed
+            ref.task.link = link
+            entry.payload = None
+            _refresh_repository(ref.repository)
+            _refresh_stage(ref.stage)
+            _refresh_overall(entry.summary)
+            entry.version = version
+            self._patches += 1
+            return build_progress_delta(
+                entry.summary, ref.stage, ref.repository, ref.task
+            )
+
+    def get_json(self, key: str, version: int) -> bytes | None:
+        """Return the JSON encoding of the cached summary at ``version``.
+
+        The bytes are produced on first request and kept until the next
+        patch, so repeated reads of an unchanged hierarchy skip
+        serialization. Encoding happens under the cache lock so a concurrent
+        patch cannot tear the payload.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.version != version or self._is_expired(entry):
+                return None
+            if entry.payload is None:
+                entry.payload = encode_summary(entry.summary)
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry.payload
+
+    def invalidate(self, key: str | None = None) -> None:
+        """Drop one entry, or every entry when ``key`` is ``None``."""
+        with self._lock:
+            if key is None:
+                self._invalidations += len(self._entries)
+                self._entries.clear()
+            elif key in self._entries:
+                self._drop(key)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                entries=len(self._entries),
+                max_entries=self.max_entries,
+                ttl_seconds=self.ttl_seconds,
+                hits=self._hits,
+                misses=self._misses,
+                patches=self._patches,
+                invalidations=self._invalidations,
+                evictions=self._evictions,
+            )
+
+    def _drop(self, key: str) -> None:
+        del self._entries[key]
+        self._invalidations += 1
+
+    def _is_expired(self, entry: _CacheEntry) -> bool:
+        return self._clock() - entry.loaded_at >= self.ttl_seconds
+
+
+_SUMMARY_ADAPTER = TypeAdapter(ProgressSummary)
+
+
+def encode_summary(summary: ProgressSummary) -> bytes:
+    """Serialize a summary straight to JSON bytes with pydantic-core."""
+    with phase_timer("serialize"):
+        return _SUMMARY_ADAPTER.dump_json(summary)
+
+
+def build_progress_delta(
+    summary: ProgressSummary,
+    stage: Stage,
+    repo: Repository,
+    task: Task,
+) -> ProgressDelta:
+    """Describe the state a task update leaves behind in ``summary``.
+
+    Only the first incomplete task after ``task`` can change its ``enabled``
+    flag, so it is reported as ``next_task`` alongside the rollups.
+    """
+    index = next(i for i, candidate in enumerate(repo.tasks) if candidate is task)
+    next_task = next(
+        (candidate for candidate in repo.tasks[index + 1 :] if not candidate.completed),
+        None,
+    )
+    return ProgressDelta(
+        task=task.model_copy(),
+        next_task=next_task.model_copy() if next_task is not None else None,
+        repository_id=repo.id,
+        repository_progress=repo.progress,
+        stage_id=stage.id,
+        stage_progress=stage.progress,
+        overall_progress=summary.overall_progress,
+    )
+
+
+def _refresh_repository(repo: Repository) -> None:
+    unlocked = True
+    completed = 0
+    for task in repo.tasks:
+        task.enabled = unlocked or task.completed
+        unlocked = unlocked and task.completed
+        completed += task.completed
+    repo.progress = ProgressMetrics.from_counts(completed, len(repo.tasks))
+
+
+def _refresh_stage(stage: Stage) -> None:
+    completed = sum(repo.progress.completed for repo in stage.repositories)
+    total = sum(repo.progress.total for repo in stage.repositories)
+    stage.progress = ProgressMetrics.from_counts(completed, total)
+
+
+def _refresh_overall(summary: ProgressSummary) -> None:
+    completed = sum(stage.progress.completed for stage in summary.stages)
+    total = sum(stage.progress.total for stage in summary.stages)
+    summary.overall_progress = ProgressMetrics.from_counts(completed, total).percent
+
+
+progress_cache = ProgressCache(
+    max_entries=env_int("TASKTRACKER_CACHE_MAX_ENTRIES", DEFAULT_CACHE_MAX_ENTRIES),
+    ttl_seconds=env_float("TASKTRACKER_CACHE_TTL", DEFAULT_CACHE_TTL_SECONDS),
+)
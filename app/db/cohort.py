@@ -0,0 +1,394 @@
+"""Cohort-wide completion analytics across every user's progress.
+
+Two summary tables back the cohort view: ``cohort_task_stats`` counts the
+users who have completed each task, and ``cohort_user_repos`` holds each
+user's completed count and first/last completion time per repository.
+Like ``progress_daily`` they are brought up to date on demand by folding in
+only the ``progress_events`` past their watermark, so a dashboard load
+reads summaries sized by the checklist and the number of active
+(user, repository) pairs, never the full ``task_progress`` table.
+
+A checklist change can move or delete tasks without logging events, so the
+seeder calls :func:`reset_cohort_rollup` and the next read rebuilds the
+summaries from ``task_progress`` once. Completion times always come from
+``task_progress.completed_at``, in a rebuild and for the pairs a fold
+touches alike, so both give the same summaries for the same progress.
+"""
+
+from __future__ import annotations
+
+import duckdb
+
+from app.db.duckdb import get_connection
+from app.metrics import query_timer
+from app.models.schemas import (
+    CohortReport,
+    CohortRepository,
+    CohortStage,
+    CohortTask,
+    ProgressMetrics,
+)
+
+COHORT_ROLLUP = "cohort"
+
+_REPO_TOTALS = """
+    SELECT repository_id, COUNT(*) AS total
+    FROM tasks
+    GROUP BY repository_id
+"""
+
+
+# Each user's completed count and current first/last completion time per
+# repository; callers add filters and the GROUP BY.
+_USER_REPO_ROWS = f"""
+    SELECT
+        tp.user_id,
+        t.repository_id,
+        COUNT(*),
+        MIN(tp.completed_at),
+        CASE WHEN COUNT(*) = ANY_VALUE(totals.total) THEN MAX(tp.completed_at) END
+    FROM task_progress tp
+    JOIN tasks t ON t.id = tp.task_id
+    JOIN ({_REPO_TOTALS}) AS totals ON totals.repository_id = t.repository_id
+    WHERE tp.completed
+"""
+
+
+def reset_cohort_rollup(conn: duckdb.DuckDBPyConnection) -> None:
+    """Drop the cohort watermark so the next refresh rebuilds from scratch."""
+    conn.execute("DELETE FROM rollup_watermarks WHERE name = ?;", (COHORT_ROLLUP,))
+
+
+def refresh_cohort_rollup(conn: duckdb.DuckDBPyConnection) -> int:
+    """Fold events past the watermark into the cohort summaries.
+
+    Each (user, task) pair changed since the watermark contributes the
+    difference between its state before its first event and after its last
+    one to the task counts; the (user, repository) pairs they touch are
+    recomputed from ``task_progress``. Returns how many events were folded in; a rebuild counts every
+    event logged so far. Runs on the writer lease, like
+    :func:`app.db.analytics.refresh_daily_rollup`.
+    """
+    low, high = _rollup_bounds(conn)
+    if low is not None and high <= low:
+        return 0
+
+    conn.begin()
+    try:
+        if low is None:
+            _rebuild(conn)
+            low = 0
+        else:
+            _fold_events(conn, low, high)
+        conn.execute(
+            """
+            INSERT INTO rollup_watermarks (name, event_id) VALUES (?, ?)
+            ON CONFLICT (name) DO UPDATE SET event_id = excluded.event_id;
+            """,
+            (COHORT_ROLLUP, high),
+        )
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return high - low
+
+
+def _rollup_bounds(conn: duckdb.DuckDBPyConnection) -> tuple[int | None, int]:
+    """Return the cohort watermark (``None`` until built) and newest event id."""
+    return conn.execute(
+        """
+        SELECT
+            (SELECT event_id FROM rollup_watermarks WHERE name = ?),
+            COALESCE((SELECT MAX(id) FROM progress_events), 0);
+        """,
+        (COHORT_ROLLUP,),
+    ).fetchone()
+
+
+def _refresh_rollup() -> None:
+    """Bring the cohort summaries up to date before the report reads them.
+
+    Only the fold (or a rebuild after :func:`reset_cohort_rollup`) takes the
+    writer lease, and only when a reader cursor sees it is needed.
+    """
+    with query_timer("cohort_refresh"):
+        with get_connection(read_only=True) as conn:
+            low, high = _rollup_bounds(conn)
+        if low is None or high > low:
+            with get_connection() as conn:
+                refresh_cohort_rollup(conn)
+
+
+def _rebuild(conn: duckdb.DuckDBPyConnection) -> None:
+    conn.execute("DELETE FROM cohort_task_stats;")
+    conn.execute("DELETE FROM cohort_user_repos;")
+    conn.execute(
+        """
+        INSERT INTO cohort_task_stats (task_id, completed_users)
+        SELECT tp.task_id, COUNT(*)
+        FROM task_progress tp
+        JOIN tasks t ON t.id = tp.task_id
+        WHERE tp.completed
+        GROUP BY tp.task_id;
+        """
+    )
+    conn.execute(
+        f"""
+        INSERT INTO cohort_user_repos
+            (user_id, repository_id, completed, started_at, finished_at)
+        {_USER_REPO_ROWS}
+        GROUP BY tp.user_id, t.repository_id;
+        """
+    )
+
+
+def _fold_events(conn: duckdb.DuckDBPyConnection, low: int, high: int) -> None:
+    conn.execute(
+        """
+        CREATE OR REPLACE TEMP TABLE cohort_changes AS
+        SELECT
+            e.user_id,
+            e.task_id,
+            t.repository_id,
+            CAST(arg_max(e.completed, e.id) AS INTEGER)
+                - CAST(arg_min(e.was_completed, e.id) AS INTEGER) AS delta
+        FROM progress_events e
+        JOIN tasks t ON t.id = e.task_id
+        WHERE e.id > $low AND e.id <= $high
+        GROUP BY e.user_id, e.task_id, t.repository_id;
+        """,
+        {"low": low, "high": high},
+    )
+    conn.execute(
+        """
+        INSERT INTO cohort_task_stats (task_id, completed_users)
+        SELECT task_id, SUM(delta) FROM cohort_changes GROUP BY task_id
+        ON CONFLICT (task_id) DO UPDATE
+        SET completed_users = completed_users + excluded.completed_users;
+        """
+    )
+    # Only the touched pairs can have started, finished or reopened.
+    conn.execute(
+        f"""
+        INSERT INTO cohort_user_repos
+            (user_id, repository_id, completed, started_at, finished_at)
+        {_USER_REPO_ROWS}
+          AND (tp.user_id, t.repository_id) IN (
+              SELECT user_id, repository_id FROM cohort_changes
+          )
+        GROUP BY tp.user_id, t.repository_id
+        ON CONFLICT (user_id, repository_id) DO UPDATE
+        SET completed = excluded.completed,
+            started_at = excluded.started_at,
+            finished_at = excluded.finished_at;
+        """
+    )
+    conn.execute(
+        """
+        DELETE FROM cohort_user_repos AS u
+        WHERE (u.user_id, u.repository_id) IN (
+                SELECT user_id, repository_id FROM cohort_changes
+            )
+          AND NOT EXISTS (
+                SELECT 1
+                FROM task_progress tp
+                JOIN tasks t ON t.id = tp.task_id
+                WHERE tp.user_id = u.user_id
+                  AND t.repository_id = u.repository_id
+                  AND tp.completed
+            );
+        """
+    )
+    conn.execute("DROP TABLE cohort_changes;")
+
+
+def cohort_report() -> CohortReport:
+    """Completion distribution, drop-off and time to complete across users.
+
+    A user is part of the cohort once they have completed any task. Drop-off
+    at a task counts the users who completed the task before it but not this
+    one, which under sequential gating is where they stopped.
+    """
+    _refresh_rollup()
+    with get_connection(read_only=True) as conn:
+        conn.begin()
+        with query_timer("cohort_users"):
+            users = conn.execute(
+                "SELECT COUNT(DISTINCT user_id) FROM cohort_user_repos;"
+            ).fetchone()[0]
+        with query_timer("cohort_tasks"):
+            task_rows = conn.execute(
+                """
+                SELECT
+                    t.id,
+                    t.repository_id,
+                    t.title,
+                    t.ordering,
+                    COALESCE(c.completed_users, 0) AS completed_users,
+                    COALESCE(
+                        LAG(COALESCE(c.completed_users, 0)) OVER (
+                            PARTITION BY t.repository_id ORDER BY t.ordering
+                        ) - COALESCE(c.completed_users, 0),
+                        0
+                    ) AS drop_off
+                FROM stages s
+                JOIN repositories r ON r.stage_id = s.id
+                JOIN tasks t ON t.repository_id = r.id
+                LEFT JOIN cohort_task_stats c ON c.task_id = t.id
+                ORDER BY s.ordering, r.ordering, t.ordering;
+                """
+            ).fetchall()
+        with query_timer("cohort_repositories"):
+            repo_rows = conn.execute(
+                f"""
+                WITH repo_stats AS (
+                    SELECT
+                        repository_id,
+                        COUNT(*) AS started_users,
+                        MEDIAN(epoch(finished_at) - epoch(started_at))
+                            FILTER (WHERE finished_at IS NOT NULL) AS median_seconds
+                    FROM cohort_user_repos
+                    GROUP BY repository_id
+                ),
+                histograms AS (
+                    SELECT
+                        repository_id,
+                        list(users ORDER BY completed) AS users,
+                        list(completed ORDER BY completed) AS completed
+                    FROM (
+                        SELECT repository_id, completed, COUNT(*) AS users
+                        FROM cohort_user_repos
+                        GROUP BY repository_id, completed
+                    )
+                    GROUP BY repository_id
+                )
+                SELECT
+                    r.id,
+                    r.stage_id,
+                    r.title,
+                    r.ordering,
+                    totals.total,
+                    COALESCE(rs.started_users, 0),
+                    rs.median_seconds,
+                    h.completed,
+                    h.users
+                FROM stages s
+                JOIN repositories r ON r.stage_id = s.id
+                JOIN ({_REPO_TOTALS}) AS totals ON totals.repository_id = r.id
+                LEFT JOIN repo_stats rs ON rs.repository_id = r.id
+                LEFT JOIN histograms h ON h.repository_id = r.id
+                ORDER BY s.ordering, r.ordering;
+                """
+            ).fetchall()
+        with query_timer("cohort_stages"):
+            stage_rows = conn.execute(
+                f"""
+                WITH stage_totals AS (
+                    SELECT r.stage_id, SUM(totals.total) AS total
+                    FROM repositories r
+                    JOIN ({_REPO_TOTALS}) AS totals ON totals.repository_id = r.id
+                    GROUP BY r.stage_id
+                ),
+                per_user AS (
+                    SELECT r.stage_id, u.user_id, SUM(u.completed) AS completed
+                    FROM cohort_user_repos u
+                    JOIN repositories r ON r.id = u.repository_id
+                    GROUP BY r.stage_id, u.user_id
+                )
+                SELECT
+                    s.id,
+                    s.title,
+                    s.ordering,
+                    st.total,
+                    COUNT(p.user_id),
+                    COUNT(p.user_id) FILTER (WHERE p.completed >= st.total),
+                    COALESCE(SUM(p.completed), 0)
+                FROM stages s
+                JOIN stage_totals st ON st.stage_id = s.id
+                LEFT JOIN per_user p ON p.stage_id = s.id
+                GROUP BY s.id, s.title, s.ordering, st.total
+                ORDER BY s.ordering;
+                """
+            ).fetchall()
+        conn.commit()
+
+    return CohortReport(
+        users=users,
+        stages=[
+            CohortStage(
+                id=stage_id,
+                title=title,
+                ordering=ordering,
+                total_tasks=total,
+                started_users=started,
+                completed_users=finished,
+                average_progress=_percent(completed, total * users),
+            )
+            for (
+                stage_id,
+                title,
+                ordering,
+                total,
+                started,
+                finished,
+                completed,
+            ) in stage_rows
+        ],
+        repositories=[_repository(users, *row) for row in repo_rows],
+        tasks=[
+            CohortTask(
+                id=task_id,
+                repository_id=repo_id,
+                title=title,
+                ordering=ordering,
+                completed_users=completed_users,
+                completion_rate=_percent(completed_users, users),
+                drop_off=drop_off,
+            )
+            for (
+                task_id,
+                repo_id,
+                title,
+                ordering,
+                completed_users,
+                drop_off,
+            ) in task_rows
+        ],
+    )
+
+
+def _repository(
+    users: int,
+    repo_id: str,
+    stage_id: str,
+    title: str,
+    ordering: int,
+    total: int,
+    started: int,
+    median_seconds: float | None,
+    completed_counts: list[int] | None,
+    user_counts: list[int] | None,
+) -> CohortRepository:
+    # distribution[k] is how many cohort users have exactly k tasks complete.
+    distribution = [0] * (total + 1)
+    for completed, count in zip(completed_counts or [], user_counts or []):
+        distribution[min(completed, total)] += count
+    distribution[0] = users - started
+    return CohortRepository(
+        id=repo_id,
+        stage_id=stage_id,
+        title=title,
+        ordering=ordering,
+        total_tasks=total,
+        started_users=started,
+        completed_users=distribution[total],
+        distribution=distribution,
+        median_hours_to_complete=(
+            round(median_seconds / 3600, 2) if median_seconds is not None else None
+        ),
+    )
+
+
+def _percent(count: int, total: int) -> float:
+    return ProgressMetrics.from_counts(count, total).percent
@@ -2,17 +2,47 @@
 
 from __future__ import annotations
 
+import json
 import os
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable, Iterator
 
 import duckdb
 
+from app.config import env_float, env_int
+from app.metrics import Stats
+
 APP_DIR = Path(__file__).resolve().parents[1]
 PROJECT_ROOT = APP_DIR.parent
 DATA_DIR = PROJECT_ROOT / "data"
 DEFAULT_DB_PATH = DATA_DIR / "tasktracker.duckdb"
+DEFAULT_READER_POOL_SIZE = 8
+DEFAULT_MAX_OPEN_DATABASES = 64
+DEFAULT_DB_IDLE_SECONDS = 300.0
+DEFAULT_TENANT_THREADS = 1
+
+# Tenant ids name files in the tenant directory, so they are kept to a
+# conservative, path-safe alphabet. Match with ``fullmatch``: ``$`` would let
+# a trailing newline through.
+TENANT_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]{1,64}")
+DEFAULT_TENANT_ID = "default"
+
+# Progress written without naming a user belongs to the default user, so a
+# single-user instance never has to mention users at all.
+DEFAULT_USER_ID = "default"
+# Pseudo-user whose data version every user's version includes; bumped by
+# changes that affect everyone, such as checklist edits.
+ALL_USERS = "*"
 
+# Baseline schema; the first migration. Every statement is idempotent so it
+# also brings databases created before schema versioning up to date.
 SCHEMA_STATEMENTS: tuple[str, ...] = (
     """
     CREATE TABLE IF NOT EXISTS stages (
@@ -49,26 +79,811 @@ SCHEMA_STATEMENTS: tuple[str, ...] = (
     );
     """,
     "ALTER TABLE task_progress ADD COLUMN IF NOT EXISTS link TEXT;",
+    """
+    CREATE TABLE IF NOT EXISTS data_version (
+        id INTEGER PRIMARY KEY,
+        version BIGINT NOT NULL
+    );
+    """,
+    "INSERT INTO data_version (id, version) VALUES (1, 0) ON CONFLICT DO NOTHING;",
+    """
+    CREATE TABLE IF NOT EXISTS repository_frontier (
+        repository_id TEXT PRIMARY KEY,
+        frontier_ordering INTEGER
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS checklist_metadata (
+        key TEXT PRIMARY KEY,
+        value_json TEXT NOT NULL,
+        updated_at TIMESTAMP
+    );
+    """,
 )
 
+# Append-only log of task state changes and the daily rollups derived from
+# it. Events keep repository ids rather than foreign keys, so history
+# survives checklist edits.
+PROGRESS_EVENT_STATEMENTS: tuple[str, ...] = (
+    "CREATE SEQUENCE IF NOT EXISTS progress_event_ids;",
+    """
+    CREATE TABLE IF NOT EXISTS progress_events (
+        id BIGINT PRIMARY KEY DEFAULT nextval('progress_event_ids'),
+        task_id TEXT NOT NULL,
+        repository_id TEXT NOT NULL,
+        completed BOOLEAN NOT NULL,
+        was_completed BOOLEAN NOT NULL,
+        link TEXT,
+        occurred_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS progress_daily (
+        day DATE NOT NULL,
+        repository_id TEXT NOT NULL,
+        completions INTEGER NOT NULL,
+        reopenings INTEGER NOT NULL,
+        PRIMARY KEY (day, repository_id)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS rollup_watermarks (
+        name TEXT PRIMARY KEY,
+        event_id BIGINT NOT NULL
+    );
+    """,
+)
 
-def get_connection(read_only: bool = False) -> duckdb.DuckDBPyConnection:
-    """Return a DuckDB connection, creating the DB directory if needed."""
-    db_path = resolve_db_path()
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    return duckdb.connect(database=str(db_path), read_only=read_only)
+# Per-user progress. DuckDB cannot change a primary key in place, so
+# ``task_progress`` and ``repository_frontier`` are rebuilt keyed by
+# ``(user_id, ...)`` with existing rows assigned to the default user. The
+# secondary ``user_id`` indexes let one user's rows be found by index scan,
+# so a user's reads cost the same however many users share the database.
+USER_PROGRESS_STATEMENTS: tuple[str, ...] = (
+    # DuckDB keeps a renamed table's old name in its foreign keys, so the
+    # keyed tables are copied aside and recreated under their own names.
+    f"""
+    CREATE TABLE task_progress_legacy AS
+    SELECT '{DEFAULT_USER_ID}' AS user_id, task_id, completed, completed_at, link
+    FROM task_progress;
+    """,
+    "DROP TABLE task_progress;",
+    f"""
+    CREATE TABLE task_progress (
+        user_id TEXT NOT NULL DEFAULT '{DEFAULT_USER_ID}',
+        task_id TEXT NOT NULL REFERENCES tasks(id),
+        completed BOOLEAN NOT NULL DEFAULT FALSE,
+        completed_at TIMESTAMP,
+        link TEXT,
+        PRIMARY KEY (user_id, task_id)
+    );
+    """,
+    "INSERT INTO task_progress SELECT * FROM task_progress_legacy;",
+    "DROP TABLE task_progress_legacy;",
+    "CREATE INDEX task_progress_user_idx ON task_progress (user_id);",
+    f"""
+    CREATE TABLE repository_frontier_legacy AS
+    SELECT '{DEFAULT_USER_ID}' AS user_id, repository_id, frontier_ordering
+    FROM repository_frontier;
+    """,
+    "DROP TABLE repository_frontier;",
+    f"""
+    CREATE TABLE repository_frontier (
+        user_id TEXT NOT NULL DEFAULT '{DEFAULT_USER_ID}',
+        repository_id TEXT NOT NULL,
+        frontier_ordering INTEGER,
+        PRIMARY KEY (user_id, repository_id)
+    );
+    """,
+    "INSERT INTO repository_frontier SELECT * FROM repository_frontier_legacy;",
+    "DROP TABLE repository_frontier_legacy;",
+    "CREATE INDEX repository_frontier_user_idx ON repository_frontier (user_id);",
+    f"""
+    ALTER TABLE progress_events
+    ADD COLUMN user_id TEXT DEFAULT '{DEFAULT_USER_ID}';
+    """,
+    """
+    CREATE TABLE user_data_version (
+        user_id TEXT PRIMARY KEY,
+        version BIGINT NOT NULL
+    );
+    """,
+    f"""
+    INSERT INTO user_data_version (user_id, version)
+    SELECT '{ALL_USERS}', version FROM data_version WHERE id = 1;
+    """,
+)
 
+# Cohort analytics summaries, folded forward from ``progress_events`` like
+# ``progress_daily``. One row per task with a completion count, and one per
+# (user, repository) the user has completed anything in.
+COHORT_STATEMENTS: tuple[str, ...] = (
+    """
+    CREATE TABLE IF NOT EXISTS cohort_task_stats (
+        task_id TEXT PRIMARY KEY,
+        completed_users BIGINT NOT NULL
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS cohort_user_repos (
+        user_id TEXT NOT NULL,
+        repository_id TEXT NOT NULL,
+        completed INTEGER NOT NULL,
+        started_at TIMESTAMP,
+        finished_at TIMESTAMP,
+        PRIMARY KEY (user_id, repository_id)
+    );
+    """,
+)
 
-def resolve_db_path() -> Path:
-    """Resolve the DuckDB path, honoring overrides."""
+# Progress of re-parented tasks between the seeder's detach and attach
+# transactions. Rows only live here while a checklist sync is under way; no
+# foreign key, since the tasks themselves are deleted in between.
+SEED_STASH_STATEMENTS: tuple[str, ...] = (
+    """
+    CREATE TABLE IF NOT EXISTS task_progress_stash (
+        user_id TEXT NOT NULL,
+        task_id TEXT NOT NULL,
+        completed BOOLEAN NOT NULL,
+        completed_at TIMESTAMP,
+        link TEXT,
+        PRIMARY KEY (user_id, task_id)
+    );
+    """,
+)
+
+# Ordered schema migrations; the database is at version ``n`` once the first
+# ``n`` have been applied. Append new migrations, never edit applied ones.
+MIGRATIONS: tuple[tuple[str, ...], ...] = (
+    SCHEMA_STATEMENTS,
+    PROGRESS_EVENT_STATEMENTS,
+    USER_PROGRESS_STATEMENTS,
+    COHORT_STATEMENTS,
+    SEED_STASH_STATEMENTS,
+)
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+@dataclass
+class PoolStats(Stats):
+    """Point-in-time counters for a :class:`ConnectionManager`."""
+
+    db_path: str
+    open: bool
+    max_readers: int
+    readers_created: int
+    readers_idle: int
+    readers_in_use: int
+    reader_leases: int
+    reader_waits: int
+    stream_readers: int
+    writer_leases: int
+    writer_releases: int
+    writer_waits: int
+
+
+class ConnectionManager:
+    """Own one DuckDB database handle and lease cursors from it.
+
+    DuckDB allows a single read-write handle per file and process, so every
+    lease is a cursor on the same long-lived connection: writes share one
+    writer cursor behind a lock, reads borrow from a bounded pool of cursors.
+    ``config`` is passed to ``duckdb.connect`` and ``on_open`` runs on the
+    fresh handle each time it is (re)opened, before any lease sees it.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        max_readers: int = DEFAULT_READER_POOL_SIZE,
+        config: dict[str, object] | None = None,
+        on_open: Callable[[duckdb.DuckDBPyConnection], None] | None = None,
+    ) -> None:
+        self.db_path = db_path
+        self.max_readers = max(1, max_readers)
+        self.config = config or {}
+        self.on_open = on_open
+        self._root: duckdb.DuckDBPyConnection | None = None
+        self._writer: duckdb.DuckDBPyConnection | None = None
+        self._writer_lock = threading.RLock()
+        self._idle: deque[duckdb.DuckDBPyConnection] = deque()
+        self._readers_available = threading.Condition()
+        self._leased: set[int] = set()
+        self._readers_created = 0
+        self._reader_leases = 0
+        self._reader_waits = 0
+        self._stream_readers = 0
+        self._writer_leases = 0
+        self._writer_releases = 0
+        self._writer_waits = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self._root is not None
+
+    def open(self) -> None:
+        """Open the underlying database handle if it is not open yet."""
+        with self._readers_available:
+            if self._root is not None:
+                return
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            root = duckdb.connect(database=str(self.db_path), config=self.config)
+            if self.on_open is not None:
+                try:
+                    self.on_open(root)
+                except BaseException:
+                    root.close()
+                    raise
+            self._root = root
+            self._writer = self._root.cursor()
+
+    def close(self) -> None:
+        """Close every pooled cursor and the database handle."""
+        with self._writer_lock, self._readers_available:
+            while self._idle:
+                self._idle.pop().close()
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            if self._root is not None:
+                self._root.close()
+                self._root = None
+            self._leased.clear()
+            self._readers_created = 0
+            self._readers_available.notify_all()
+
+    @contextmanager
+    def reader(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """Lease a pooled read cursor for the duration of the block."""
+        cursor = self._acquire_reader()
+        try:
+            yield cursor
+        except BaseException:
+            _rollback_quietly(cursor)
+            raise
+        finally:
+            self._release_reader(cursor)
+
+    @contextmanager
+    def stream_reader(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """Lease a dedicated read cursor, outside the pool, for a long read.
+
+        For reads held open at a client's pace, which would otherwise keep
+        pooled cursors from the short reads waiting for them.
+        """
+        self.open()
+        with self._readers_available:
+            if self._root is None:
+                raise duckdb.ConnectionException("Connection pool is closed.")
+            cursor = self._root.cursor()
+            self._stream_readers += 1
+        try:
+            yield cursor
+        finally:
+            with self._readers_available:
+                self._stream_readers -= 1
+            cursor.close()
+
+    @contextmanager
+    def writer(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """Lease the shared writer cursor, serializing writers in-process."""
+        if not self._writer_lock.acquire(blocking=False):
+            self._writer_waits += 1
+            self._writer_lock.acquire()
+        try:
+            self.open()
+            assert self._writer is not None
+            self._writer_leases += 1
+            try:
+                yield self._writer
+            except BaseException:
+                _rollback_quietly(self._writer)
+                raise
+            finally:
+                # Counted while still held: anything the lease committed is
+                # visible to readers once this count has moved.
+                self._writer_releases += 1
+        finally:
+            self._writer_lock.release()
+
+    def stats(self) -> PoolStats:
+        with self._readers_available:
+            return PoolStats(
+                db_path=str(self.db_path),
+                open=self.is_open,
+                max_readers=self.max_readers,
+                readers_created=self._readers_created,
+                readers_idle=len(self._idle),
+                readers_in_use=len(self._leased),
+                reader_leases=self._reader_leases,
+                reader_waits=self._reader_waits,
+                stream_readers=self._stream_readers,
+                writer_leases=self._writer_leases,
+                writer_releases=self._writer_releases,
+                writer_waits=self._writer_waits,
+            )
+
+    def _acquire_reader(self) -> duckdb.DuckDBPyConnection:
+        self.open()
+        with self._readers_available:
+            waited = False
+            while not self._idle and self._readers_created >= self.max_readers:
+                if not waited:
+                    self._reader_waits += 1
+                    waited = True
+                self._readers_available.wait()
+            if self._root is None:
+                raise duckdb.ConnectionException("Connection pool is closed.")
+            if self._idle:
+                cursor = self._idle.pop()
+            else:
+                cursor = self._root.cursor()
+                self._readers_created += 1
+            self._leased.add(id(cursor))
+            self._reader_leases += 1
+            return cursor
+
+    def _release_reader(self, cursor: duckdb.DuckDBPyConnection) -> None:
+        with self._readers_available:
+            if id(cursor) not in self._leased:
+                # Leased before the pool was closed; do not recycle it.
+                cursor.close()
+                return
+            self._leased.discard(id(cursor))
+            self._idle.append(cursor)
+            self._readers_available.notify()
+
+
+@dataclass
+class RegistryStats(Stats):
+    """Point-in-time counters for a :class:`DatabaseRegistry`."""
+
+    open: int
+    pinned: int
+    max_open: int
+    idle_seconds: float | None
+    opened: int
+    evicted: int
+
+
+@dataclass
+class _Slot:
+    manager: ConnectionManager
+    pins: int = 0
+    last_used: float = 0.0
+
+
+class DatabaseRegistry:
+    """Bounded LRU of :class:`ConnectionManager` objects, one per database file.
+
+    Leases pin their manager so it is never closed underneath them. Each
+    lease first closes unpinned managers beyond ``max_open`` (least recently
+    used first) and any left unused for ``idle_seconds``, which bounds the
+    open file handles and DuckDB instances however many tenant files exist.
+    Limits left as ``None`` are read from the environment on each check;
+    outside tenant mode that is one open database and no idle timeout.
+    """
+
+    def __init__(
+        self,
+        max_open: int | None = None,
+        idle_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_open = max_open
+        self._idle_seconds = idle_seconds
+        self._clock = clock
+        self._slots: "OrderedDict[Path, _Slot]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._evicted = 0
+
+    @property
+    def max_open(self) -> int:
+        if self._max_open is not None:
+            return max(1, self._max_open)
+        return _max_open_databases()
+
+    @property
+    def idle_seconds(self) -> float | None:
+        if self._idle_seconds is not None:
+            return self._idle_seconds
+        return _db_idle_seconds()
+
+    def manager(self, db_path: Path) -> ConnectionManager:
+        """Return the manager for ``db_path`` without pinning it."""
+        with self._lock:
+            slot = self._slot(db_path)
+            slot.last_used = self._clock()
+            self._evict()
+            return slot.manager
+
+    @contextmanager
+    def lease(self, db_path: Path) -> Iterator[ConnectionManager]:
+        """Pin the manager for ``db_path`` for the duration of the block."""
+        with self._lock:
+            slot = self._slot(db_path)
+            slot.pins += 1
+            self._evict()
+        try:
+            yield slot.manager
+        finally:
+            with self._lock:
+                slot.pins -= 1
+                slot.last_used = self._clock()
+
+    def close(self, db_path: Path | None = None) -> None:
+        """Close one manager, or every manager when ``db_path`` is ``None``."""
+        with self._lock:
+            paths = list(self._slots) if db_path is None else [db_path]
+            for path in paths:
+                slot = self._slots.pop(path, None)
+                if slot is not None:
+                    slot.manager.close()
+
+    def get(self, db_path: Path) -> ConnectionManager | None:
+        """Return the manager for ``db_path`` if the registry holds one."""
+        slot = self._slots.get(db_path)
+        return slot.manager if slot is not None else None
+
+    def stats(self) -> RegistryStats:
+        with self._lock:
+            return RegistryStats(
+                open=sum(slot.manager.is_open for slot in self._slots.values()),
+                pinned=sum(slot.pins > 0 for slot in self._slots.values()),
+                max_open=self.max_open,
+                idle_seconds=self.idle_seconds,
+                opened=self._opened,
+                evicted=self._evicted,
+            )
+
+    def _slot(self, db_path: Path) -> _Slot:
+        slot = self._slots.get(db_path)
+        if slot is None:
+            slot = _Slot(_create_manager(db_path), last_used=self._clock())
+            self._slots[db_path] = slot
+            self._opened += 1
+        self._slots.move_to_end(db_path)
+        return slot
+
+    def _evict(self) -> None:
+        # Closing happens under the lock so a concurrent lease can never
+        # open a second handle on a file that is still being closed.
+        excess = len(self._slots) - self.max_open
+        idle_seconds = self.idle_seconds
+        idle_before = None if idle_seconds is None else self._clock() - idle_seconds
+        for path, slot in list(self._slots.items()):
+            if slot.pins:
+                continue
+            idle = idle_before is not None and slot.last_used <= idle_before
+            if excess > 0 or idle:
+                del self._slots[path]
+                slot.manager.close()
+                self._evicted += 1
+                excess -= 1
+
+
+_registry = DatabaseRegistry()
+_current_tenant: ContextVar[str | None] = ContextVar("tasktracker_tenant", default=None)
+
+
+def get_connection_manager() -> ConnectionManager:
+    """Return the process-wide manager for the currently resolved DB path."""
+    return _registry.manager(resolve_db_path())
+
+
+@contextmanager
+def get_connection(read_only: bool = False) -> Iterator[duckdb.DuckDBPyConnection]:
+    """Lease a pooled DuckDB cursor; use it as a context manager.
+
+    ``read_only`` selects a pooled reader cursor instead of the shared writer.
+    Readers run concurrently; writers are serialized behind one lock. The
+    database's manager stays pinned open until the block exits.
+    """
+    with _registry.lease(resolve_db_path()) as manager:
+        with manager.reader() if read_only else manager.writer() as conn:
+            yield conn
+
+
+@contextmanager
+def get_stream_connection() -> Iterator[duckdb.DuckDBPyConnection]:
+    """Lease a dedicated read cursor for a long-lived read such as a stream.
+
+    Unlike ``get_connection(read_only=True)`` the cursor is not taken from
+    the bounded pool, so holding it does not hold up other reads; callers
+    bound how many they open.
+    """
+    with _registry.lease(resolve_db_path()) as manager:
+        with manager.stream_reader() as conn:
+            yield conn
+
+
+def open_connection_pool() -> PoolStats:
+    """Open the manager for the current DB path eagerly (e.g. on startup)."""
+    with _registry.lease(resolve_db_path()) as manager:
+        manager.open()
+        return manager.stats()
+
+
+def close_connection_pool(db_path: Path | None = None) -> None:
+    """Close the manager for ``db_path``, or every open manager."""
+    _registry.close(db_path)
+
+
+def connection_pool_stats() -> PoolStats | None:
+    """Return stats for the current DB path's manager, if one is held."""
+    manager = _registry.get(resolve_db_path())
+    return manager.stats() if manager is not None else None
+
+
+def database_registry_stats() -> RegistryStats:
+    """Return stats for the registry of open database files."""
+    return _registry.stats()
+
+
+def tenant_dir() -> Path | None:
+    """Return the per-tenant database directory, or ``None`` outside tenant mode."""
+    value = os.getenv("TASKTRACKER_TENANT_DIR")
+    return Path(value) if value else None
+
+
+def current_tenant() -> str | None:
+    """Return the tenant whose database this context reads and writes."""
+    return _current_tenant.get()
+
+
+@contextmanager
+def tenant_scope(tenant_id: str | None) -> Iterator[None]:
+    """Direct database access in the block to ``tenant_id``'s file.
+
+    ``None`` selects the shared checklist database. Work handed to
+    :data:`app.db.executor.db_executor` inherits the scope.
+    """
+    if tenant_id is not None and not TENANT_ID_PATTERN.fullmatch(tenant_id):
+        raise ValueError(f"Invalid tenant id {tenant_id!r}.")
+    token = _current_tenant.set(tenant_id)
+    try:
+        yield
+    finally:
+        _current_tenant.reset(token)
+
+
+def resolve_catalog_path() -> Path:
+    """Resolve the shared checklist database path, honoring overrides."""
     override = os.getenv("TASKTRACKER_DB_PATH")
     return Path(override) if override else DEFAULT_DB_PATH
 
 
-def init_db() -> None:
-    """Ensure the DuckDB schema exists."""
+def resolve_db_path() -> Path:
+    """Resolve the DuckDB path for the current context.
+
+    Inside a :func:`tenant_scope` in tenant mode that is the tenant's own
+    file; otherwise it is the shared checklist database.
+    """
+    directory = tenant_dir()
+    tenant = _current_tenant.get()
+    if directory is not None and tenant is not None:
+        return directory / f"{tenant}.duckdb"
+    return resolve_catalog_path()
+
+
+def _create_manager(db_path: Path) -> ConnectionManager:
+    directory = tenant_dir()
+    if directory is None or db_path.parent != directory:
+        return ConnectionManager(db_path, _reader_pool_size())
+    from app.db.tenants import prepare_tenant_database
+
+    return ConnectionManager(
+        db_path,
+        _reader_pool_size(),
+        config={
+            "threads": env_int("TASKTRACKER_TENANT_THREADS", DEFAULT_TENANT_THREADS)
+        },
+        on_open=prepare_tenant_database,
+    )
+
+
+def init_db() -> int:
+    """Bring the current database's schema up to date; return its version.
+
+    That is :data:`MIGRATIONS` for the shared database and
+    :data:`app.db.tenants.TENANT_MIGRATIONS` for a tenant's file.
+    """
+    migrations = MIGRATIONS
+    if resolve_db_path() != resolve_catalog_path():
+        from app.db.tenants import TENANT_MIGRATIONS
+
+        migrations = TENANT_MIGRATIONS
     with get_connection() as conn:
-        _execute_statements(conn, SCHEMA_STATEMENTS)
+        return apply_migrations(conn, migrations)
+
+
+def apply_migrations(
+    conn: duckdb.DuckDBPyConnection,
+    migrations: tuple[tuple[str, ...], ...],
+) -> int:
+    """Apply the pending entries of ``migrations``; return the new version.
+
+    A current database costs a single lookup. Otherwise the pending
+    migrations, the frontier backfill and the version bump commit together.
+    """
+    from app.db.frontier import backfill_frontier
+
+    target = len(migrations)
+    current = read_schema_version(conn)
+    if current >= target:
+        return current
+
+    conn.begin()
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_version (
+            id INTEGER PRIMARY KEY,
+            version INTEGER NOT NULL
+        );
+        """
+    )
+    for statements in migrations[current:]:
+        _execute_statements(conn, statements)
+    backfill_frontier(conn)
+    conn.execute(
+        """
+        INSERT INTO schema_version (id, version) VALUES (1, ?)
+        ON CONFLICT (id) DO UPDATE SET version = excluded.version;
+        """,
+        (target,),
+    )
+    conn.commit()
+    return target
+
+
+def read_schema_version(conn: duckdb.DuckDBPyConnection) -> int:
+    """Return the applied schema version; 0 for a new or unversioned database."""
+    try:
+        row = conn.execute("SELECT version FROM schema_version WHERE id = 1;").fetchone()
+    except duckdb.CatalogException:
+        return 0
+    return row[0] if row else 0
+
+
+def read_data_version(
+    conn: duckdb.DuckDBPyConnection,
+    user_id: str = DEFAULT_USER_ID,
+) -> int:
+    """Return the progress data version as seen by ``user_id``.
+
+    That is the later of the user's own last write and the last change
+    that affected every user; both are primary-key lookups.
+    """
+    row = conn.execute(
+        """
+        SELECT GREATEST(
+            (SELECT version FROM user_data_version WHERE user_id = $user),
+            (SELECT version FROM user_data_version WHERE user_id = $all)
+        );
+        """,
+        {"user": user_id, "all": ALL_USERS},
+    ).fetchone()
+    return row[0] or 0
+
+
+def bump_data_version(
+    conn: duckdb.DuckDBPyConnection,
+    user_id: str = DEFAULT_USER_ID,
+) -> int:
+    """Advance ``user_id``'s data version and return the new value.
+
+    Versions are drawn from one database-wide counter, so every bump is
+    larger than any version handed out before it, whichever user it was
+    for. Pass :data:`ALL_USERS` for changes that affect everyone. Call inside
+    the transaction that performs the write so the bump commits (or rolls
+    back) together with it.
+    """
+    version = conn.execute(
+        "UPDATE data_version SET version = version + 1 WHERE id = 1 RETURNING version;"
+    ).fetchone()[0]
+    conn.execute(
+        """
+        INSERT INTO user_data_version (user_id, version) VALUES (?, ?)
+        ON CONFLICT (user_id) DO UPDATE SET version = excluded.version;
+        """,
+        (user_id, version),
+    )
+    return version
+
+
+def bump_data_versions(
+    conn: duckdb.DuckDBPyConnection,
+    user_ids: Iterable[str],
+) -> int:
+    """Advance several users' data versions to one new value and return it.
+
+    Like :func:`bump_data_version`, but a whole group of writes draws a
+    single version, so it costs two statements however many users it spans.
+    """
+    version = conn.execute(
+        "UPDATE data_version SET version = version + 1 WHERE id = 1 RETURNING version;"
+    ).fetchone()[0]
+    conn.execute(
+        """
+        INSERT INTO user_data_version (user_id, version)
+        SELECT UNNEST($users::JSON::TEXT[]), $version
+        ON CONFLICT (user_id) DO UPDATE SET version = excluded.version;
+        """,
+        {"users": list_param(dict.fromkeys(user_ids)), "version": version},
+    )
+    return version
+
+
+def read_data_versions(
+    conn: duckdb.DuckDBPyConnection,
+    user_ids: Iterable[str],
+) -> dict[str, int]:
+    """Return :func:`read_data_version` for several users in one query."""
+    user_ids = list(dict.fromkeys(user_ids))
+    rows = conn.execute(
+        """
+        SELECT user_id, version FROM user_data_version
+        WHERE user_id IN (SELECT UNNEST($users::JSON::TEXT[])) OR user_id = $all;
+        """,
+        {"users": list_param(user_ids), "all": ALL_USERS},
+    ).fetchall()
+    stored = dict(rows)
+    floor = stored.get(ALL_USERS, 0)
+    return {user_id: max(stored.get(user_id, 0), floor) for user_id in user_ids}
+
+
+def read_changed_versions(
+    conn: duckdb.DuckDBPyConnection,
+    since: int,
+) -> list[tuple[str, int]]:
+    """Return ``(user_id, version)`` for users bumped past ``since``, oldest first.
+
+    :data:`ALL_USERS` appears like any user when a bump covered everyone.
+    """
+    return conn.execute(
+        """
+        SELECT user_id, version FROM user_data_version
+        WHERE version > ?
+        ORDER BY version;
+        """,
+        (since,),
+    ).fetchall()
+
+
+def list_param(values: Iterable[object]) -> str:
+    """Encode ``values`` for an ``UNNEST($n::JSON::<type>[])`` parameter.
+
+    DuckDB's Python binding converts list parameters one element at a time
+    (probing for pandas on each), which dominates bulk writes. A single JSON
+    string is parsed natively instead, well over 10x faster.
+    """
+    return json.dumps(list(values), separators=(",", ":"))
+
+
+def _reader_pool_size() -> int:
+    return env_int("TASKTRACKER_DB_POOL_SIZE", DEFAULT_READER_POOL_SIZE)
+
+
+def _max_open_databases() -> int:
+    # Outside tenant mode one database is open at a time, so switching
+    # ``TASKTRACKER_DB_PATH`` closes the previous file.
+    if tenant_dir() is None:
+        return 1
+    return max(1, env_int("TASKTRACKER_MAX_OPEN_DBS", DEFAULT_MAX_OPEN_DATABASES))
+
+
+def _db_idle_seconds() -> float | None:
+    if tenant_dir() is None:
+        return None
+    return env_float("TASKTRACKER_DB_IDLE_SECONDS", DEFAULT_DB_IDLE_SECONDS)
+
+
+def _rollback_quietly(conn: duckdb.DuckDBPyConnection) -> None:
+    try:
+        conn.rollback()
+    except duckdb.Error:
+        pass
 
 
 def _execute_statements(
@@ -77,4 +892,3 @@ def _execute_statements(
 ) -> None:
     for statement in statements:
         conn.execute(statement)
-
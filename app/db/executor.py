@@ -0,0 +1,156 @@
+"""Bounded thread pool that keeps blocking DuckDB work off the event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, TypeVar
+
+from app.config import env_int
+from app.metrics import Stats
+
+T = TypeVar("T")
+
+DEFAULT_DB_WORKERS = 4
+DEFAULT_DB_MAX_PENDING = 64
+
+
+class DatabaseBusyError(Exception):
+    """Raised when too many DB calls are already queued."""
+
+
+@dataclass
+class ExecutorStats(Stats):
+    """Point-in-time counters for a :class:`DatabaseExecutor`."""
+
+    workers: int
+    max_pending: int
+    running: int
+    pending: int
+    submitted: int
+    completed: int
+    rejected: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+
+    @property
+    def wait_seconds_avg(self) -> float:
+        started = self.completed + self.running
+        return self.wait_seconds_total / started if started else 0.0
+
+    def as_dict(self) -> dict[str, object]:
+        return {**super().as_dict(), "wait_seconds_avg": self.wait_seconds_avg}
+
+
+class DatabaseExecutor:
+    """Run blocking DB calls on a dedicated, bounded thread pool.
+
+    ``workers`` caps how many DB calls run at once; at most ``max_pending``
+    more may wait for a worker before :class:`DatabaseBusyError` is raised.
+    Calls run in a copy of the caller's context, so context variables set
+    by request handling are visible to them.
+
+    When :attr:`dispatch` is set, each call runs as
+    ``dispatch(fn, *args, **kwargs)`` on the pool instead; worker processes
+    use it to forward calls to the process that owns the database (see
+    :mod:`app.cluster`).
+    """
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_DB_WORKERS,
+        max_pending: int = DEFAULT_DB_MAX_PENDING,
+    ) -> None:
+        self.workers = max(1, workers)
+        self.max_pending = max(0, max_pending)
+        self.dispatch: Callable[..., Any] | None = None
+        self._pool: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._running = 0
+        self._pending = 0
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="tasktracker-db",
+                )
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    async def run(self, fn: Callable[..., T], /, *args, **kwargs) -> T:
+        """Run ``fn(*args, **kwargs)`` on the pool and await its result."""
+        self.start()
+        with self._lock:
+            if self._pending >= self.max_pending + self.workers - self._running:
+                self._rejected += 1
+                raise DatabaseBusyError("Too many database calls are queued.")
+            self._pending += 1
+            self._submitted += 1
+            pool = self._pool
+        assert pool is not None
+
+        submitted_at = time.perf_counter()
+        context = contextvars.copy_context()
+        dispatch = self.dispatch
+        if dispatch is not None:
+            fn, args = dispatch, (fn, *args)
+
+        def call() -> T:
+            waited = time.perf_counter() - submitted_at
+            with self._lock:
+                self._pending -= 1
+                self._running += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+            try:
+                return context.run(fn, *args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+
+        future = pool.submit(call)
+        future.add_done_callback(self._forget_if_cancelled)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> ExecutorStats:
+        with self._lock:
+            return ExecutorStats(
+                workers=self.workers,
+                max_pending=self.max_pending,
+                running=self._running,
+                pending=self._pending,
+                submitted=self._submitted,
+                completed=self._completed,
+                rejected=self._rejected,
+                wait_seconds_total=self._wait_total,
+                wait_seconds_max=self._wait_max,
+            )
+
+    def _forget_if_cancelled(self, future: Future) -> None:
+        # A call cancelled before a worker picked it up never decrements
+        # the pending count itself.
+        if future.cancelled():
+            with self._lock:
+                self._pending -= 1
+
+
+db_executor = DatabaseExecutor(
+    workers=env_int("TASKTRACKER_DB_WORKERS", DEFAULT_DB_WORKERS),
+    max_pending=env_int("TASKTRACKER_DB_MAX_PENDING", DEFAULT_DB_MAX_PENDING),
+)
@@ -0,0 +1,198 @@
+"""Materialized per-user, per-repository unlock frontier.
+
+A user's frontier in a repository is the lowest ``ordering`` among the
+tasks they have not completed (``NULL`` once every task is complete). A
+task may be completed, and is shown as enabled, exactly when it is complete
+already or its ordering is at or below the frontier, so gating is a
+primary-key lookup rather than a scan over earlier tasks.
+
+Rows exist for the ``(user, repository)`` pairs with stored progress; any
+other pair has nothing complete, so its frontier is the repository's first
+task.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import duckdb
+
+from app.db.duckdb import DEFAULT_USER_ID, list_param
+
+# Frontier of every (user_id, repository_id) pair in ``pairs``, which the
+# caller prepends as a CTE.
+_FRONTIER_SELECT = """
+    SELECT
+        p.user_id,
+        p.repository_id,
+        MIN(t.ordering) FILTER (WHERE NOT COALESCE(tp.completed, FALSE))
+    FROM pairs p
+    LEFT JOIN tasks t ON t.repository_id = p.repository_id
+    LEFT JOIN task_progress tp ON tp.task_id = t.id AND tp.user_id = p.user_id
+    GROUP BY p.user_id, p.repository_id
+"""
+
+# Pairs for one user: every repository, whether or not it has progress.
+_USER_PAIRS = """
+    SELECT $user AS user_id, r.id AS repository_id
+    FROM repositories r
+"""
+
+# Pairs for every user with any stored progress in the repository.
+_PROGRESS_PAIRS = """
+    SELECT DISTINCT tp.user_id, t.repository_id
+    FROM task_progress tp
+    JOIN tasks t ON t.id = tp.task_id
+"""
+
+
+def read_frontier(
+    conn: duckdb.DuckDBPyConnection,
+    repo_id: str,
+    user_id: str = DEFAULT_USER_ID,
+) -> int | None:
+    """Return the user's frontier in a repository, materializing it if missing."""
+    query = """
+        SELECT frontier_ordering FROM repository_frontier
+        WHERE user_id = ? AND repository_id = ?;
+    """
+    row = conn.execute(query, (user_id, repo_id)).fetchone()
+    if row is None:
+        rebuild_frontier(conn, [repo_id], user_id)
+        row = conn.execute(query, (user_id, repo_id)).fetchone()
+    return row[0] if row else None
+
+
+def is_unlocked(frontier: int | None, ordering: int) -> bool:
+    """Return whether every task before ``ordering`` is complete."""
+    return frontier is None or ordering <= frontier
+
+
+def rebuild_frontier(
+    conn: duckdb.DuckDBPyConnection,
+    repo_ids: Sequence[str] | None = None,
+    user_id: str | None = None,
+) -> None:
+    """Recompute frontiers for ``repo_ids`` (all repositories when ``None``).
+
+    With ``user_id`` only that user's rows are rebuilt, one per repository.
+    Without it, rows are rebuilt for every user that has progress stored in
+    the repository; any other user's frontier there is its first task.
+    """
+    params: dict[str, object] = {}
+    conditions: list[str] = []
+    pairs = _PROGRESS_PAIRS
+    pair_filter = "t.repository_id"
+    if user_id is not None:
+        params["user"] = user_id
+        conditions.append("user_id = $user")
+        pairs = _USER_PAIRS
+        pair_filter = "r.id"
+    if repo_ids is not None:
+        params["repo_ids"] = list_param(repo_ids)
+        conditions.append("repository_id IN (SELECT UNNEST($repo_ids::JSON::TEXT[]))")
+        pairs += f"WHERE {pair_filter} IN (SELECT UNNEST($repo_ids::JSON::TEXT[]))"
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    conn.execute(f"DELETE FROM repository_frontier {where};", params)
+    conn.execute(
+        f"""
+        INSERT INTO repository_frontier (user_id, repository_id, frontier_ordering)
+        WITH pairs AS ({pairs})
+        {_FRONTIER_SELECT};
+        """,
+        params,
+    )
+
+
+def rebuild_user_frontiers(
+    conn: duckdb.DuckDBPyConnection,
+    pairs: Sequence[tuple[str, str]],
+) -> None:
+    """Recompute the frontiers of the given ``(user_id, repository_id)`` pairs."""
+    if not pairs:
+        return
+    user_ids, repo_ids = zip(*pairs)
+    params = {"users": list_param(user_ids), "repo_ids": list_param(repo_ids)}
+    pair_rows = """
+        SELECT
+            UNNEST($users::JSON::TEXT[]) AS user_id,
+            UNNEST($repo_ids::JSON::TEXT[]) AS repository_id
+    """
+    conn.execute(
+        f"""
+        DELETE FROM repository_frontier
+        WHERE (user_id, repository_id) IN ({pair_rows});
+        """,
+        params,
+    )
+    conn.execute(
+        f"""
+        INSERT INTO repository_frontier (user_id, repository_id, frontier_ordering)
+        WITH pairs AS ({pair_rows})
+        {_FRONTIER_SELECT};
+        """,
+        params,
+    )
+
+
+def backfill_frontier(conn: duckdb.DuckDBPyConnection) -> None:
+    """Create frontier rows for users' repositories that do not have one yet."""
+    conn.execute(
+        f"""
+        INSERT INTO repository_frontier (user_id, repository_id, frontier_ordering)
+        WITH pairs AS (
+            SELECT * FROM ({_PROGRESS_PAIRS}) AS progress
+            WHERE NOT EXISTS (
+                SELECT 1 FROM repository_frontier f
+                WHERE f.user_id = progress.user_id
+                  AND f.repository_id = progress.repository_id
+            )
+        )
+        {_FRONTIER_SELECT};
+        """
+    )
+
+
+def advance_frontier(
+    conn: duckdb.DuckDBPyConnection,
+    repo_id: str,
+    frontier: int | None,
+    ordering: int,
+    completed: bool,
+    user_id: str = DEFAULT_USER_ID,
+) -> int | None:
+    """Move the frontier after one task changed state; returns the new value.
+
+    Completing the frontier task looks forward only as far as the next
+    incomplete task. Reopening a task below the frontier pulls it back.
+    Anything else leaves it unchanged.
+    """
+    if completed:
+        if frontier is None or ordering != frontier:
+            return frontier
+        new_frontier = conn.execute(
+            """
+            SELECT MIN(t.ordering)
+            FROM tasks t
+            LEFT JOIN task_progress tp ON tp.task_id = t.id AND tp.user_id = ?
+            WHERE t.repository_id = ?
+              AND t.ordering > ?
+              AND NOT COALESCE(tp.completed, FALSE);
+            """,
+            (user_id, repo_id, ordering),
+        ).fetchone()[0]
+    else:
+        if frontier is not None and frontier <= ordering:
+            return frontier
+        new_frontier = ordering
+
+    conn.execute(
+        """
+        UPDATE repository_frontier
+        SET frontier_ordering = ?
+        WHERE user_id = ? AND repository_id = ?;
+        """,
+        (new_frontier, user_id, repo_id),
+    )
+    return new_frontier
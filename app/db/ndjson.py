@@ -0,0 +1,267 @@
+"""Stream the progress hierarchy as newline-delimited JSON records.
+
+The full hierarchy is never built: one ordered query carries each task's
+repository and stage counts alongside it, and rows are pulled from the
+cursor a chunk at a time and written out as soon as a record is complete.
+The stream is::
+
+    {"type": "summary", "version": 7, "overall_progress": 41.3}
+    {"type": "stage", "id": ..., "progress": {...}}
+    {"type": "repository", "id": ..., "progress": {...}, "tasks": [...]}
+    {"type": "repository", ...}
+    {"type": "stage", ...}
+
+Stage and repository records carry the same fields as the ``Stage`` and
+``Repository`` models, minus the nested children of a stage. Memory per
+stream is bounded by the chunk size and the largest repository, not by the
+size of the checklist.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from contextlib import ExitStack
+from typing import Any
+
+from app.config import env_int
+from app.db.duckdb import DEFAULT_USER_ID, get_stream_connection, read_data_version
+from app.db.executor import DatabaseBusyError
+from app.metrics import query_timer
+from app.models.schemas import ProgressMetrics
+
+DEFAULT_CHUNK_ROWS = 2048
+DEFAULT_MAX_RECORD_STREAMS = 8
+
+# A user's per-task rows in display order, each carrying its repository's
+# and stage's counts. The counts are joined in from grouped aggregates:
+# DuckDB evaluates filtered window aggregates over large partitions far more
+# slowly. Without a frontier row the user has no progress in a repository,
+# so only its first task is unlocked.
+RECORDS_QUERY = """
+    WITH repo_counts AS (
+        SELECT
+            t.repository_id,
+            COUNT(*) FILTER (WHERE tp.completed) AS completed,
+            COUNT(*) AS total,
+            MIN(t.ordering) AS first_ordering
+        FROM tasks t
+        LEFT JOIN task_progress tp ON tp.task_id = t.id AND tp.user_id = $user
+        GROUP BY t.repository_id
+    ),
+    stage_counts AS (
+        SELECT r.stage_id, SUM(c.completed) AS completed, SUM(c.total) AS total
+        FROM repo_counts c
+        JOIN repositories r ON r.id = c.repository_id
+        GROUP BY r.stage_id
+    )
+    SELECT
+        s.id,
+        s.title,
+        s.description,
+        s.ordering,
+        r.id,
+        r.title,
+        r.description,
+        r.ordering,
+        t.id,
+        t.title,
+        t.description,
+        t.ordering,
+        COALESCE(tp.completed, FALSE) AS completed,
+        tp.link,
+        COALESCE(tp.completed, FALSE) OR CASE
+            WHEN f.repository_id IS NULL THEN t.ordering <= rc.first_ordering
+            ELSE f.frontier_ordering IS NULL OR t.ordering <= f.frontier_ordering
+        END AS enabled,
+        rc.completed,
+        rc.total,
+        sc.completed,
+        sc.total
+    FROM stages s
+    JOIN stage_counts sc ON sc.stage_id = s.id
+    JOIN repositories r ON r.stage_id = s.id
+    JOIN repo_counts rc ON rc.repository_id = r.id
+    JOIN tasks t ON t.repository_id = r.id
+    LEFT JOIN task_progress tp ON tp.task_id = t.id AND tp.user_id = $user
+    LEFT JOIN repository_frontier f
+        ON f.repository_id = r.id AND f.user_id = $user
+    ORDER BY s.ordering, r.ordering, t.ordering;
+"""
+
+OVERALL_QUERY = """
+    SELECT COUNT(*) FILTER (WHERE tp.completed), COUNT(*)
+    FROM tasks t
+    JOIN repositories r ON r.id = t.repository_id
+    LEFT JOIN task_progress tp ON tp.task_id = t.id AND tp.user_id = $user;
+"""
+
+
+class ProgressRecordStream:
+    """A read snapshot of a user's hierarchy, encoded a chunk of rows at a time.
+
+    Holds a dedicated reader cursor and an open transaction from
+    construction until :meth:`close`, so every record reflects
+    :attr:`version`. The cursor is not taken from the shared pool, so slow
+    clients do not hold up other reads; instead at most
+    ``TASKTRACKER_MAX_RECORD_STREAMS`` streams are open at once, and
+    opening another raises :class:`~app.db.executor.DatabaseBusyError`.
+
+    Construction only reads the version. The queries run from
+    :meth:`next_chunk`: the first call returns the summary line and the
+    second starts the ordered records query, so a response can send its
+    first line before that query completes. Calls may come from different
+    threads but never overlap.
+    """
+
+    def __init__(
+        self,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+        user_id: str = DEFAULT_USER_ID,
+    ) -> None:
+        self.chunk_rows = max(1, chunk_rows)
+        self._params = {"user": user_id}
+        self._lock = threading.Lock()
+        self._leases = ExitStack()
+        if not _stream_slots.acquire(blocking=False):
+            raise DatabaseBusyError("Too many progress streams are open.")
+        self._leases.callback(_stream_slots.release)
+        try:
+            self._conn = self._leases.enter_context(get_stream_connection())
+            self._conn.begin()
+            self.version = read_data_version(self._conn, user_id)
+        except BaseException:
+            self._leases.close()
+            raise
+        self._started = False
+        self._querying = False
+        self._finished = False
+        self._stage_id: str | None = None
+        self._repo: dict[str, Any] | None = None
+
+    def next_chunk(self) -> bytes | None:
+        """Return the records completed by the next chunk of rows.
+
+        The result may be empty when a chunk only extends one repository;
+        ``None`` means the stream is exhausted.
+        """
+        with self._lock:
+            if self._finished:
+                return None
+            if not self._started:
+                self._started = True
+                return self._summary().encode()
+            if not self._querying:
+                self._querying = True
+                with query_timer("records_query"):
+                    self._conn.execute(RECORDS_QUERY, self._params)
+            with query_timer("records_fetch"):
+                rows = self._conn.fetchmany(self.chunk_rows)
+            lines: list[str] = []
+            for row in rows:
+                self._add_row(row, lines)
+            if len(rows) < self.chunk_rows:
+                if self._repo is not None:
+                    lines.append(_encode(self._repo))
+                    self._repo = None
+                self._finish()
+            return "".join(lines).encode()
+
+    def close(self) -> None:
+        """End the snapshot and release the cursor."""
+        with self._lock:
+            self._finish()
+
+    def _summary(self) -> str:
+        with query_timer("records_overall"):
+            overall = self._conn.execute(OVERALL_QUERY, self._params).fetchone()
+        return _encode(
+            {
+                "type": "summary",
+                "version": self.version,
+                "overall_progress": ProgressMetrics.from_counts(*overall).percent,
+            }
+        )
+
+    def _finish(self) -> None:
+        if not self._finished:
+            self._finished = True
+            try:
+                self._conn.commit()
+            finally:
+                self._leases.close()
+
+    def _add_row(self, row: tuple, lines: list[str]) -> None:
+        (
+            stage_id,
+            stage_title,
+            stage_description,
+            stage_order,
+            repo_id,
+            repo_title,
+            repo_description,
+            repo_order,
+            task_id,
+            title,
+            description,
+            ordering,
+            completed,
+            link,
+            enabled,
+            repo_completed,
+            repo_total,
+            stage_completed,
+            stage_total,
+        ) = row
+        if self._repo is None or self._repo["id"] != repo_id:
+            if self._repo is not None:
+                lines.append(_encode(self._repo))
+            if stage_id != self._stage_id:
+                self._stage_id = stage_id
+                lines.append(
+                    _encode(
+                        {
+                            "type": "stage",
+                            "id": stage_id,
+                            "title": stage_title,
+                            "description": stage_description,
+                            "ordering": stage_order,
+                            "progress": _metrics(stage_completed, stage_total),
+                        }
+                    )
+                )
+            self._repo = {
+                "type": "repository",
+                "id": repo_id,
+                "stage_id": stage_id,
+                "title": repo_title,
+                "description": repo_description,
+                "ordering": repo_order,
+                "progress": _metrics(repo_completed, repo_total),
+                "tasks": [],
+            }
+        self._repo["tasks"].append(
+            {
+                "id": task_id,
+                "repository_id": repo_id,
+                "title": title,
+                "description": description,
+                "ordering": ordering,
+                "completed": completed,
+                "enabled": enabled,
+                "link": link,
+            }
+        )
+
+
+def _metrics(completed: int, total: int) -> dict[str, Any]:
+    return ProgressMetrics.from_counts(completed, total).model_dump()
+
+
+def _encode(record: dict[str, Any]) -> str:
+    return json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n"
+
+
+_stream_slots = threading.BoundedSemaphore(
+    max(1, env_int("TASKTRACKER_MAX_RECORD_STREAMS", DEFAULT_MAX_RECORD_STREAMS))
+)
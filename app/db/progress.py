@@ -2,16 +2,44 @@
 
 from __future__ import annotations
 
+import heapq
+import os
 from collections import OrderedDict
 from dataclasses import dataclass
+from typing import Callable, Sequence
 
-from app.db.duckdb import get_connection
+import duckdb
+
+from app.db.analytics import (
+    ProgressEvent,
+    append_progress_events,
+    append_user_progress_events,
+)
+from app.db.cache import build_progress_delta, encode_summary, progress_cache
+from app.db.duckdb import (
+    DEFAULT_USER_ID,
+    bump_data_version,
+    bump_data_versions,
+    get_connection,
+    list_param,
+    read_data_version,
+    read_data_versions,
+    resolve_db_path,
+)
+from app.db.frontier import (
+    advance_frontier,
+    is_unlocked,
+    read_frontier,
+    rebuild_frontier,
+    rebuild_user_frontiers,
+)
+from app.db.summary_sql import query_progress_summary_sql
+from app.metrics import phase_timer, query_timer
 from app.models.schemas import (
+    ProgressBatchResult,
+    ProgressDelta,
     ProgressMetrics,
     ProgressSummary,
-    Repository,
-    Stage,
-    Task,
 )
 
 
@@ -22,9 +50,115 @@ class ProgressValidationError(Exception):
     message: str
 
 
-def fetch_progress_summary() -> ProgressSummary:
-    """Return the full stage -> repo -> task hierarchy with progress metrics."""
+@dataclass(frozen=True)
+class TaskUpdate:
+    """One requested change to a task's completion state."""
+
+    repo_id: str
+    task_id: str
+    completed: bool
+    link: str | None = None
+
+
+SummaryEngine = Callable[[duckdb.DuckDBPyConnection, str], ProgressSummary]
+
+
+@dataclass
+class ProgressSnapshot:
+    """A progress hierarchy together with the data version it reflects."""
+
+    version: int
+    summary: ProgressSummary
+
+
+def progress_cache_key(user_id: str = DEFAULT_USER_ID) -> str:
+    """Return the :data:`progress_cache` key of a user's hierarchy."""
+    return f"{resolve_db_path()}#{user_id}"
+
+
+def get_data_version(user_id: str = DEFAULT_USER_ID) -> int:
+    """Return the progress data version as seen by ``user_id``."""
     with get_connection(read_only=True) as conn:
+        with query_timer("data_version"):
+            return read_data_version(conn, user_id)
+
+
+def fetch_progress_summary(user_id: str = DEFAULT_USER_ID) -> ProgressSummary:
+    """Return the full stage -> repo -> task hierarchy with progress metrics.
+
+    Served from :data:`progress_cache` when warm; the result is shared with
+    other readers and must not be mutated.
+    """
+    return fetch_progress_snapshot(user_id=user_id).summary
+
+
+def fetch_progress_snapshot(
+    known_version: int | None = None,
+    user_id: str = DEFAULT_USER_ID,
+) -> ProgressSnapshot:
+    """Return the hierarchy and its data version, using the cache when current.
+
+    ``known_version`` skips the version lookup when the caller has just read
+    it; a cache entry for any other version is rebuilt.
+    """
+    cache_key = progress_cache_key(user_id)
+    if known_version is None:
+        known_version = get_data_version(user_id)
+    summary = progress_cache.get(cache_key, known_version)
+    if summary is not None:
+        return ProgressSnapshot(known_version, summary)
+
+    with get_connection(read_only=True) as conn:
+        conn.begin()
+        version = read_data_version(conn, user_id)
+        with phase_timer("summary_build"):
+            summary = _summary_engine()(conn, user_id)
+        conn.commit()
+    progress_cache.put(cache_key, summary, version)
+    return ProgressSnapshot(version, summary)
+
+
+def fetch_progress_json(
+    known_version: int | None = None,
+    user_id: str = DEFAULT_USER_ID,
+) -> tuple[int, bytes]:
+    """Return the hierarchy as JSON bytes together with its data version.
+
+    Warm reads return bytes kept by :data:`progress_cache` for the current
+    version, skipping both model assembly and serialization.
+    """
+    cache_key = progress_cache_key(user_id)
+    if known_version is None:
+        known_version = get_data_version(user_id)
+    payload = progress_cache.get_json(cache_key, known_version)
+    if payload is not None:
+        return known_version, payload
+
+    snapshot = fetch_progress_snapshot(known_version, user_id)
+    payload = progress_cache.get_json(cache_key, snapshot.version)
+    if payload is None:
+        # Caching is disabled, so the freshly built summary is ours alone.
+        payload = encode_summary(snapshot.summary)
+    return snapshot.version, payload
+
+
+def _summary_engine() -> SummaryEngine:
+    """Return the hierarchy builder named by ``TASKTRACKER_SUMMARY_ENGINE``."""
+    name = os.getenv("TASKTRACKER_SUMMARY_ENGINE", "python")
+    try:
+        return SUMMARY_ENGINES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown summary engine {name!r}; "
+            f"expected one of {', '.join(sorted(SUMMARY_ENGINES))}."
+        ) from None
+
+
+def _query_progress_summary(
+    conn: duckdb.DuckDBPyConnection,
+    user_id: str = DEFAULT_USER_ID,
+) -> ProgressSummary:
+    with query_timer("summary_join"):
         cursor = conn.execute(
             """
             SELECT
@@ -41,13 +175,18 @@ def fetch_progress_summary() -> ProgressSummary:
                 t.description AS task_description,
                 t.ordering AS task_order,
                 COALESCE(tp.completed, FALSE) AS completed,
-                tp.link AS link
+                tp.link AS link,
+                f.frontier_ordering AS frontier,
+                f.repository_id IS NOT NULL AS has_frontier
             FROM stages s
             JOIN repositories r ON r.stage_id = s.id
             JOIN tasks t ON t.repository_id = r.id
-            LEFT JOIN task_progress tp ON tp.task_id = t.id
+            LEFT JOIN task_progress tp ON tp.task_id = t.id AND tp.user_id = $user
+            LEFT JOIN repository_frontier f
+                ON f.repository_id = r.id AND f.user_id = $user
             ORDER BY s.ordering, r.ordering, t.ordering;
-            """
+            """,
+            {"user": user_id},
         )
         columns = [desc[0] for desc in cursor.description]
         rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
@@ -75,6 +214,8 @@ def fetch_progress_summary() -> ProgressSummary:
                 "title": row["repo_title"],
                 "description": row["repo_description"],
                 "ordering": row["repo_order"],
+                "frontier": row["frontier"],
+                "has_frontier": row["has_frontier"],
                 "tasks": [],
             },
         )
@@ -91,76 +232,61 @@ def fetch_progress_summary() -> ProgressSummary:
             }
         )
 
-    stages: list[Stage] = []
+    # The tree is assembled as plain dicts and validated in one call at the
+    # end: a single pass through the compiled validator is much cheaper than
+    # constructing every Task, Repository and Stage from Python.
+    stages: list[dict] = []
     total_completed = 0
     total_tasks = 0
 
     for stage_data in stage_map.values():
-        repos: list[Repository] = []
+        repos: list[dict] = []
         stage_completed = 0
         stage_total = 0
 
         for repo_data in stage_data["repositories"].values():
-            tasks_raw = sorted(repo_data["tasks"], key=lambda t: t["ordering"])
-            tasks: list[Task] = []
-            unlocked = True
-
-            for task_data in tasks_raw:
-                enabled = unlocked or task_data["completed"]
-                unlocked = unlocked and task_data["completed"]
-                task = Task(
-                    **task_data,
-                    enabled=enabled,
+            tasks = sorted(repo_data["tasks"], key=lambda t: t["ordering"])
+            frontier = repo_data.pop("frontier")
+            if not repo_data.pop("has_frontier"):
+                # No progress stored here for the user: only the first task
+                # is unlocked.
+                frontier = tasks[0]["ordering"]
+
+            for task_data in tasks:
+                task_data["enabled"] = task_data["completed"] or is_unlocked(
+                    frontier, task_data["ordering"]
                 )
-                tasks.append(task)
 
-            completed_count = sum(1 for task in tasks if task.completed)
+            completed_count = sum(1 for task in tasks if task["completed"])
             repo_total = len(tasks)
-            percent = (
-                round((completed_count / repo_total) * 100, 1)
-                if repo_total
-                else 0
+            repo_data["tasks"] = tasks
+            repo_data["progress"] = ProgressMetrics.from_counts(
+                completed_count, repo_total
             )
-            progress = ProgressMetrics(
-                completed=completed_count,
-                total=repo_total,
-                percent=percent,
-            )
-            repo = Repository(
-                **{k: v for k, v in repo_data.items() if k != "tasks"},
-                tasks=tasks,
-                progress=progress,
-            )
-            repos.append(repo)
+            repos.append(repo_data)
 
             stage_completed += completed_count
             stage_total += repo_total
 
-        stage_percent = (
-            round((stage_completed / stage_total) * 100, 1)
-            if stage_total
-            else 0
-        )
-        stage_progress = ProgressMetrics(
-            completed=stage_completed,
-            total=stage_total,
-            percent=stage_percent,
+        stage_data["repositories"] = repos
+        stage_data["progress"] = ProgressMetrics.from_counts(
+            stage_completed, stage_total
         )
-        stage_model = Stage(
-            id=stage_data["id"],
-            title=stage_data["title"],
-            description=stage_data["description"],
-            ordering=stage_data["ordering"],
-            repositories=repos,
-            progress=stage_progress,
-        )
-        stages.append(stage_model)
+        stages.append(stage_data)
 
         total_completed += stage_completed
         total_tasks += stage_total
 
-    overall = round((total_completed / total_tasks) * 100, 1) if total_tasks else 0
-    return ProgressSummary(stages=stages, overall_progress=overall)
+    overall = ProgressMetrics.from_counts(total_completed, total_tasks).percent
+    return ProgressSummary.model_validate(
+        {"stages": stages, "overall_progress": overall}
+    )
+
+
+SUMMARY_ENGINES: dict[str, SummaryEngine] = {
+    "python": _query_progress_summary,
+    "sql": query_progress_summary_sql,
+}
 
 
 def update_task_progress(
@@ -168,68 +294,377 @@ def update_task_progress(
     task_id: str,
     completed: bool,
     link: str | None = None,
-) -> None:
-    """Update a task's completion state with sequential validation."""
+    user_id: str = DEFAULT_USER_ID,
+) -> ProgressDelta:
+    """Update one of ``user_id``'s tasks with sequential validation.
+
+    The user's cached hierarchy is patched in place once the upsert has
+    committed, and the resulting :class:`ProgressDelta` is returned. The
+    API routes submit updates through :data:`app.db.writer.progress_writer`
+    instead, which commits concurrent updates together.
+    """
+    stored_link = link if completed else None
     with get_connection() as conn:
-        task_row = conn.execute(
-            """
-            SELECT repository_id, ordering
-            FROM tasks
-            WHERE id = ?
-            """,
-            (task_id,),
-        ).fetchone()
+        conn.begin()
+        with query_timer("task_lookup"):
+            task_row = conn.execute(
+                """
+                SELECT t.repository_id, t.ordering, COALESCE(tp.completed, FALSE)
+                FROM tasks t
+                LEFT JOIN task_progress tp ON tp.task_id = t.id AND tp.user_id = ?
+                WHERE t.id = ?
+                """,
+                (user_id, task_id),
+            ).fetchone()
 
         if task_row is None:
             raise ProgressValidationError("Task not found.")
 
-        task_repo_id, task_order = task_row
+        task_repo_id, task_order, was_completed = task_row
         if task_repo_id != repo_id:
             raise ProgressValidationError("Task does not belong to repository.")
 
-        if completed:
-            blocking = conn.execute(
+        with query_timer("gating_frontier"):
+            frontier = read_frontier(conn, repo_id, user_id)
+        if completed and not is_unlocked(frontier, task_order):
+            raise ProgressValidationError(
+                "Complete previous tasks before unlocking this item."
+            )
+
+        if completed and not (link and link.strip()):
+            raise ProgressValidationError("Provide a work link to mark complete.")
+
+        with query_timer("progress_upsert"):
+            conn.execute(
                 """
-                SELECT COUNT(*)
-                FROM tasks t
-                LEFT JOIN task_progress tp ON tp.task_id = t.id
-                WHERE t.repository_id = ?
-                  AND t.ordering < ?
-                  AND COALESCE(tp.completed, FALSE) = FALSE;
+                INSERT INTO task_progress
+                    (user_id, task_id, completed, completed_at, link)
+                VALUES (
+                    ?,
+                    ?,
+                    ?,
+                    CASE WHEN ? THEN CURRENT_TIMESTAMP ELSE NULL END,
+                    ?
+                )
+                ON CONFLICT (user_id, task_id) DO UPDATE
+                SET completed = excluded.completed,
+                    completed_at = excluded.completed_at,
+                    link = CASE
+                        WHEN excluded.completed = TRUE THEN excluded.link
+                        ELSE NULL
+                    END;
                 """,
-                (repo_id, task_order),
-            ).fetchone()[0]
+                (
+                    user_id,
+                    task_id,
+                    completed,
+                    completed,
+                    stored_link,
+                ),
+            )
+        with query_timer("event_append"):
+            append_progress_events(
+                conn,
+                [(task_id, repo_id, completed, was_completed, stored_link)],
+                user_id,
+            )
+        with query_timer("frontier_advance"):
+            advance_frontier(conn, repo_id, frontier, task_order, completed, user_id)
+        previous_version = read_data_version(conn, user_id)
+        version = bump_data_version(conn, user_id)
+        conn.commit()
 
-            if blocking:
-                raise ProgressValidationError(
-                    "Complete previous tasks before unlocking this item."
+        delta = progress_cache.patch_task(
+            progress_cache_key(user_id),
+            task_id,
+            completed,
+            stored_link,
+            version,
+            previous_version,
+        )
+    if delta is None:
+        delta = _delta_from_summary(fetch_progress_summary(user_id), task_id)
+    return delta
+
+
+def apply_update_group(
+    requests: Sequence[tuple[TaskUpdate, str]],
+) -> list[ProgressDelta | Exception]:
+    """Apply independent ``(update, user_id)`` requests in one transaction.
+
+    This is a group commit: each request is validated against the state
+    left by the ones before it, exactly as if they had run one by one, but
+    the group is read with one lookup, written with one statement per table
+    and committed once under a single new data version. A request that fails
+    validation writes nothing and gets its error back in its slot; the
+    others still commit. Any other error before the commit rolls back the
+    whole group and is raised. Once the group has committed, a failure to
+    build a delta is returned in the slot instead, so the caller never
+    retries committed updates.
+    """
+    results: list[ProgressDelta | Exception | None] = [None] * len(requests)
+    applied: list[tuple[int, TaskUpdate, str, str | None]] = []
+    with get_connection() as conn:
+        conn.begin()
+        with query_timer("group_validate"):
+            replay = _ProgressReplay(_fetch_replay_rows(conn, requests))
+            events: list[tuple[str, ProgressEvent]] = []
+            for index, (update, user_id) in enumerate(requests):
+                try:
+                    event = replay.apply(update, user_id)
+                except ProgressValidationError as exc:
+                    results[index] = exc
+                    continue
+                events.append((user_id, event))
+                applied.append((index, update, user_id, event[4]))
+
+        users = [user_id for _, _, user_id, _ in applied]
+        previous_versions = read_data_versions(conn, users)
+        if applied:
+            final_state = {
+                (user_id, update.task_id): (update.completed, link)
+                for _, update, user_id, link in applied
+            }
+            with query_timer("group_upsert"):
+                _upsert_progress(conn, final_state)
+            with query_timer("event_append"):
+                append_user_progress_events(conn, events)
+            with query_timer("frontier_rebuild"):
+                rebuild_user_frontiers(
+                    conn,
+                    sorted({(user_id, u.repo_id) for _, u, user_id, _ in applied}),
                 )
+            version = bump_data_versions(conn, users)
+        conn.commit()
 
-        if completed and not (link and link.strip()):
-            raise ProgressValidationError("Provide a work link to mark complete.")
+    # Patch each user's cached tree once per update, in commit order; after
+    # the first patch the entry already carries the group's version.
+    patched_from = previous_versions
+    summaries: dict[str, ProgressSummary] = {}
+    for index, update, user_id, stored_link in applied:
+        delta = progress_cache.patch_task(
+            progress_cache_key(user_id),
+            update.task_id,
+            update.completed,
+            stored_link,
+            version,
+            patched_from[user_id],
+        )
+        patched_from[user_id] = version
+        if delta is None:
+            try:
+                if user_id not in summaries:
+                    summaries[user_id] = fetch_progress_summary(user_id)
+                delta = _delta_from_summary(summaries[user_id], update.task_id)
+            except Exception as exc:
+                results[index] = exc
+                continue
+        results[index] = delta
+    return results
 
-        conn.execute(
-            """
-            INSERT INTO task_progress (task_id, completed, completed_at, link)
-            VALUES (
-                ?,
-                ?,
-                CASE WHEN ? THEN CURRENT_TIMESTAMP ELSE NULL END,
-                ?
-            )
-            ON CONFLICT (task_id) DO UPDATE
-            SET completed = excluded.completed,
-                completed_at = excluded.completed_at,
-                link = CASE
-                    WHEN excluded.completed = TRUE THEN excluded.link
-                    ELSE NULL
-                END;
-            """,
-            (
-                task_id,
-                completed,
-                completed,
-                link if completed else None,
-            ),
+
+def _fetch_replay_rows(
+    conn: duckdb.DuckDBPyConnection,
+    requests: Sequence[tuple[TaskUpdate, str]],
+) -> list[tuple[str, str, str, int, bool]]:
+    """Load what :class:`_ProgressReplay` needs for ``requests``.
+
+    That is every task of each requested (user, repository) pair with the
+    user's state, plus each requested task, so a task named under the wrong
+    repository can be reported as such.
+    """
+    return conn.execute(
+        """
+        WITH requested AS (
+            SELECT
+                UNNEST($users::JSON::TEXT[]) AS user_id,
+                UNNEST($repo_ids::JSON::TEXT[]) AS repository_id,
+                UNNEST($task_ids::JSON::TEXT[]) AS task_id
+        ),
+        wanted AS (
+            SELECT q.user_id, t.id AS task_id
+            FROM (SELECT DISTINCT user_id, repository_id FROM requested) q
+            JOIN tasks t ON t.repository_id = q.repository_id
+            UNION
+            SELECT user_id, task_id FROM requested
+        )
+        SELECT
+            w.user_id,
+            t.id,
+            t.repository_id,
+            t.ordering,
+            COALESCE(tp.completed, FALSE)
+        FROM wanted w
+        JOIN tasks t ON t.id = w.task_id
+        LEFT JOIN task_progress tp ON tp.task_id = t.id AND tp.user_id = w.user_id;
+        """,
+        {
+            "users": list_param(user_id for _, user_id in requests),
+            "repo_ids": list_param(update.repo_id for update, _ in requests),
+            "task_ids": list_param(update.task_id for update, _ in requests),
+        },
+    ).fetchall()
+
+
+def _upsert_progress(
+    conn: duckdb.DuckDBPyConnection,
+    final_state: dict[tuple[str, str], tuple[bool, str | None]],
+) -> None:
+    keys = list(final_state)
+    conn.execute(
+        """
+        INSERT INTO task_progress
+            (user_id, task_id, completed, completed_at, link)
+        SELECT
+            user_id,
+            task_id,
+            completed,
+            CASE WHEN completed THEN CURRENT_TIMESTAMP ELSE NULL END,
+            link
+        FROM (
+            SELECT
+                UNNEST($users::JSON::TEXT[]) AS user_id,
+                UNNEST($task_ids::JSON::TEXT[]) AS task_id,
+                UNNEST($completed::JSON::BOOLEAN[]) AS completed,
+                UNNEST($links::JSON::TEXT[]) AS link
         )
+        ON CONFLICT (user_id, task_id) DO UPDATE
+        SET completed = excluded.completed,
+            completed_at = excluded.completed_at,
+            link = excluded.link;
+        """,
+        {
+            "users": list_param(user_id for user_id, _ in keys),
+            "task_ids": list_param(task_id for _, task_id in keys),
+            "completed": list_param(final_state[key][0] for key in keys),
+            "links": list_param(final_state[key][1] for key in keys),
+        },
+    )
+
+
+def _delta_from_summary(summary: ProgressSummary, task_id: str) -> ProgressDelta:
+    for stage in summary.stages:
+        for repo in stage.repositories:
+            for task in repo.tasks:
+                if task.id == task_id:
+                    return build_progress_delta(summary, stage, repo, task)
+    raise ProgressValidationError("Task not found.")
+
+
+def apply_progress_batch(
+    updates: Sequence[TaskUpdate],
+    user_id: str = DEFAULT_USER_ID,
+) -> ProgressBatchResult:
+    """Validate and apply several of ``user_id``'s task updates in one transaction.
+
+    Updates are checked in order against the stored state as modified by the
+    earlier updates in the same batch, so a batch may complete a chain of
+    tasks. Any violation rejects the whole batch.
+    """
+    with get_connection() as conn:
+        conn.begin()
+        with query_timer("batch_validate"):
+            final_state, events = _validate_batch(conn, updates, user_id)
+        with query_timer("batch_upsert"):
+            _upsert_progress(
+                conn,
+                {(user_id, task_id): state for task_id, state in final_state.items()},
+            )
+        with query_timer("event_append"):
+            append_progress_events(conn, events, user_id)
+        with query_timer("frontier_rebuild"):
+            rebuild_frontier(
+                conn, sorted({update.repo_id for update in updates}), user_id
+            )
+        bump_data_version(conn, user_id)
+        conn.commit()
+        progress_cache.invalidate(progress_cache_key(user_id))
+
+    return ProgressBatchResult(
+        updated=len(final_state),
+        overall_progress=fetch_progress_summary(user_id).overall_progress,
+    )
+
+
+def _validate_batch(
+    conn: duckdb.DuckDBPyConnection,
+    updates: Sequence[TaskUpdate],
+    user_id: str,
+) -> tuple[dict[str, tuple[bool, str | None]], list[ProgressEvent]]:
+    """Replay ``updates`` against stored state.
+
+    Returns each task's final state and one progress event per update.
+    """
+    replay = _ProgressReplay(
+        _fetch_replay_rows(conn, [(update, user_id) for update in updates])
+    )
+    final_state: dict[str, tuple[bool, str | None]] = {}
+    events: list[ProgressEvent] = []
+    for index, update in enumerate(updates, start=1):
+        try:
+            event = replay.apply(update, user_id)
+        except ProgressValidationError as exc:
+            raise ProgressValidationError(
+                f"Update {index} ({update.task_id}): {exc.message}"
+            ) from None
+        events.append(event)
+        final_state[update.task_id] = (update.completed, event[4])
+
+    return final_state, events
+
+
+class _ProgressReplay:
+    """Sequential gating replayed in memory over prefetched task states.
+
+    Built from ``(user_id, task_id, repository_id, ordering, completed)``
+    rows covering every task of each repository an update touches. Each
+    :meth:`apply` validates one update against the state left by the ones
+    applied before it and records its effect.
+    """
+
+    def __init__(self, rows: Sequence[tuple[str, str, str, int, bool]]) -> None:
+        self.tasks: dict[str, tuple[str, int]] = {}
+        self.completed: dict[tuple[str, str], bool] = {}
+        # Per-(user, repository) min-heap of incomplete tasks; completed
+        # entries are discarded lazily when they surface.
+        self.incomplete: dict[tuple[str, str], list[tuple[int, str]]] = {}
+        for user_id, task_id, repo_id, ordering, done in rows:
+            self.tasks[task_id] = (repo_id, ordering)
+            self.completed[(user_id, task_id)] = done
+            if not done:
+                self.incomplete.setdefault((user_id, repo_id), []).append(
+                    (ordering, task_id)
+                )
+        for heap in self.incomplete.values():
+            heapq.heapify(heap)
+
+    def apply(self, update: TaskUpdate, user_id: str) -> ProgressEvent:
+        """Validate ``update`` for ``user_id`` and return its event."""
+        meta = self.tasks.get(update.task_id)
+        if meta is None:
+            raise ProgressValidationError("Task not found.")
+        repo_id, ordering = meta
+        if repo_id != update.repo_id:
+            raise ProgressValidationError("Task does not belong to repository.")
+
+        key = (user_id, update.task_id)
+        was_completed = self.completed[key]
+        if update.completed:
+            heap = self.incomplete.get((user_id, repo_id), [])
+            while heap and self.completed[(user_id, heap[0][1])]:
+                heapq.heappop(heap)
+            if heap and heap[0][0] < ordering:
+                raise ProgressValidationError(
+                    "Complete previous tasks before unlocking this item."
+                )
+            if not (update.link and update.link.strip()):
+                raise ProgressValidationError("Provide a work link to mark complete.")
+        elif was_completed:
+            heapq.heappush(
+                self.incomplete.setdefault((user_id, repo_id), []),
+                (ordering, update.task_id),
+            )
 
+        stored_link = update.link if update.completed else None
+        self.completed[key] = update.completed
+        return (update.task_id, repo_id, update.completed, was_completed, stored_link)
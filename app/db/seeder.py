@@ -2,9 +2,41 @@
 
 from __future__ import annotations
 
+import datetime
+import hashlib
+import importlib.util
 import json
+import os
+import sys
+import time
+from dataclasses import dataclass, field
 
-from app.db.duckdb import get_connection
+import duckdb
+
+from app.db.cache import progress_cache
+from app.db.cohort import reset_cohort_rollup
+from app.db.duckdb import (
+    ALL_USERS,
+    DEFAULT_USER_ID,
+    bump_data_version,
+    get_connection,
+    list_param,
+)
+from app.db.frontier import rebuild_frontier
+from app.metrics import query_timer
+
+# Static tables in dependency order, with the columns the checklist defines.
+CHECKLIST_TABLES: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("stages", ("id", "title", "description", "ordering")),
+    ("repositories", ("id", "stage_id", "title", "description", "ordering")),
+    ("tasks", ("id", "repository_id", "title", "description", "ordering")),
+)
+_PARENT_COLUMNS = {"repositories": "stage_id", "tasks": "repository_id"}
+_COLUMN_TYPES = {"ordering": "INTEGER"}
+CHECKLIST_MODULE = "app.data.checklist"
+CHECKLIST_SOURCES = ("module", "stored")
+
+Rows = dict[str, tuple]
 
 
 def _load_stages_from_db() -> list[dict] | None:
@@ -28,108 +60,469 @@ def _load_stages_from_db() -> list[dict] | None:
         return json.loads(result[0])
 
 
-def seed_static_data() -> None:
-    """Seed the DuckDB database with the static checklist if missing."""
-    # Check if data already exists
+@dataclass
+class TableDiff:
+    """Row ids to insert, update, re-parent and delete for one static table."""
+
+    added: list[str] = field(default_factory=list)
+    updated: list[str] = field(default_factory=list)
+    moved: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.updated or self.moved or self.removed)
+
+
+@dataclass
+class SeedReport:
+    """Outcome of a :func:`seed_static_data` call."""
+
+    seeded: bool
+    seconds: float
+    stages: int = 0
+    repositories: int = 0
+    tasks: int = 0
+    diff: dict[str, TableDiff] = field(default_factory=dict)
+
+    @property
+    def added(self) -> int:
+        return sum(len(table.added) for table in self.diff.values())
+
+    @property
+    def updated(self) -> int:
+        return sum(len(table.updated) for table in self.diff.values())
+
+    @property
+    def moved(self) -> int:
+        return sum(len(table.moved) for table in self.diff.values())
+
+    @property
+    def removed(self) -> int:
+        return sum(len(table.removed) for table in self.diff.values())
+
+
+def checklist_hash(stages: list[dict]) -> str:
+    """Return a stable content hash of a checklist definition."""
+    canonical = json.dumps(
+        stages, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def checklist_source() -> str:
+    """Return where startup takes the checklist from.
+
+    ``TASKTRACKER_CHECKLIST_SOURCE`` is ``module`` (the default) to sync the
+    database to :mod:`app.data.checklist`, or ``stored`` to serve the
+    definition already in the database, such as a generated roadmap.
+    """
+    name = os.getenv("TASKTRACKER_CHECKLIST_SOURCE", "module")
+    if name not in CHECKLIST_SOURCES:
+        raise ValueError(
+            f"Unknown checklist source {name!r}; "
+            f"expected one of {', '.join(CHECKLIST_SOURCES)}."
+        )
+    return name
+
+
+def seed_static_data(
+    stages: list[dict] | None = None,
+    keep_stored: bool = False,
+) -> SeedReport:
+    """Bring the static checklist tables in line with the checklist definition.
+
+    ``stages`` overrides the definition in :mod:`app.data.checklist`, e.g.
+    with a generated roadmap. The definition's content hash is stored
+    alongside it; when it matches, nothing else is read. Otherwise only the
+    added, changed and removed stages, repositories and tasks are written,
+    so progress on tasks that survive the change is kept. A sync that died
+    part-way is finished by the next call, stashed progress included.
+
+    When the checklist module has not been imported yet, its source file's
+    hash is checked first, so an unchanged checklist is never imported.
+    With ``keep_stored`` and no ``stages``, the stored definition is kept
+    as it is; the module is only used for a database that has none.
+    """
+    started = time.perf_counter()
+    if stages is None and keep_stored:
+        stages = _load_stages_from_db()
     with get_connection() as conn:
-        existing = conn.execute(
-            "SELECT COUNT(*) FROM stages;"
-        ).fetchone()[0]
-        if existing > 0:
-            return  # Already seeded
+        with query_timer("checklist_hash"):
+            stored = _stored_hashes(conn)
 
-    # Load from DuckDB metadata table
-    stages = _load_stages_from_db()
+        source_digest = None
+        if stages is None:
+            source_digest = _checklist_source_hash()
+            if source_digest is not None and source_digest == stored.get(
+                "checklist_source_hash"
+            ):
+                return SeedReport(seeded=False, seconds=time.perf_counter() - started)
+            stages = _load_checklist()
 
-    # Fallback: load from Python and store in DB for next time
-    if stages is None:
-        try:
-            from app.data.checklist import STAGES
-            stages = STAGES
-
-            # Store in metadata table for future use
-            import datetime
-            with get_connection() as conn:
-                conn.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS checklist_metadata (
-                        key TEXT PRIMARY KEY,
-                        value_json TEXT NOT NULL,
-                        updated_at TIMESTAMP
-                    );
-                    """
-                )
-                conn.execute(
-                    """
-                    INSERT INTO checklist_metadata (key, value_json, updated_at)
-                    VALUES ('stages', ?, ?)
-                    ON CONFLICT (key) DO UPDATE
-                    SET value_json = excluded.value_json,
-                        updated_at = excluded.updated_at;
-                    """,
-                    (json.dumps(stages, indent=2), datetime.datetime.now()),
-                )
-        except ImportError:
+        digest = checklist_hash(stages)
+        if stored.get("stages_hash") == digest:
+            if source_digest != stored.get("checklist_source_hash"):
+                _store_source_hash(conn, source_digest)
+            return SeedReport(seeded=False, seconds=time.perf_counter() - started)
+
+        desired = _flatten(stages)
+        with query_timer("checklist_current_rows"):
+            current = {
+                table: _current_rows(conn, table, columns)
+                for table, columns in CHECKLIST_TABLES
+            }
+        diff = _diff_checklist(current, desired)
+        with query_timer("checklist_detach"):
+            _detach_rows(conn, desired, diff)
+
+        conn.begin()
+        with query_timer("checklist_attach"):
+            _attach_rows(conn, desired, diff)
+        with query_timer("frontier_rebuild"):
+            rebuild_frontier(conn)
+        reset_cohort_rollup(conn)
+        with query_timer("checklist_store"):
+            _store_definition(conn, stages, digest)
+            _store_source_hash(conn, source_digest)
+        bump_data_version(conn, ALL_USERS)
+        conn.commit()
+
+    progress_cache.invalidate()
+    return SeedReport(
+        seeded=any(diff.values()),
+        seconds=time.perf_counter() - started,
+        stages=len(desired["stages"]),
+        repositories=len(desired["repositories"]),
+        tasks=len(desired["tasks"]),
+        diff=diff,
+    )
+
+
+def _load_checklist() -> list[dict]:
+    try:
+        from app.data.checklist import STAGES
+    except ImportError:
+        stages = _load_stages_from_db()
+        if stages is None:
             raise RuntimeError(
                 "Checklist data not available. "
                 "Run: uv run python scripts/migrate_checklist_to_db.py"
             )
+        return stages
+    return STAGES
 
-    with get_connection() as conn:
-        for stage in stages:
+
+def _checklist_source_hash() -> str | None:
+    """Hash the checklist module's source without importing it.
+
+    Returns ``None`` once the module is imported, since its ``STAGES`` may
+    differ from the file (tests patch it), or when there is no source file.
+    """
+    if CHECKLIST_MODULE in sys.modules:
+        return None
+    try:
+        spec = importlib.util.find_spec(CHECKLIST_MODULE)
+    except ImportError:
+        return None
+    if spec is None or not spec.origin or not os.path.isfile(spec.origin):
+        return None
+    with open(spec.origin, "rb") as source:
+        return hashlib.sha256(source.read()).hexdigest()
+
+
+def _stored_hashes(conn: duckdb.DuckDBPyConnection) -> dict[str, str]:
+    rows = conn.execute(
+        """
+        SELECT key, value_json
+        FROM checklist_metadata
+        WHERE key IN ('stages_hash', 'checklist_source_hash');
+        """
+    ).fetchall()
+    return {key: json.loads(value) for key, value in rows}
+
+
+def _store_source_hash(
+    conn: duckdb.DuckDBPyConnection,
+    source_digest: str | None,
+) -> None:
+    """Record which checklist source the stored definition came from.
+
+    Definitions passed in explicitly have no source, and clearing the key
+    makes the next startup compare the checklist module by content.
+    """
+    if source_digest is None:
+        conn.execute(
+            "DELETE FROM checklist_metadata WHERE key = 'checklist_source_hash';"
+        )
+        return
+    conn.execute(
+        """
+        INSERT INTO checklist_metadata (key, value_json, updated_at)
+        VALUES ('checklist_source_hash', ?, ?)
+        ON CONFLICT (key) DO UPDATE
+        SET value_json = excluded.value_json,
+            updated_at = excluded.updated_at;
+        """,
+        (json.dumps(source_digest), datetime.datetime.now()),
+    )
+
+
+def _store_definition(
+    conn: duckdb.DuckDBPyConnection,
+    stages: list[dict],
+    digest: str,
+) -> None:
+    now = datetime.datetime.now()
+    conn.executemany(
+        """
+        INSERT INTO checklist_metadata (key, value_json, updated_at)
+        VALUES (?, ?, ?)
+        ON CONFLICT (key) DO UPDATE
+        SET value_json = excluded.value_json,
+            updated_at = excluded.updated_at;
+        """,
+        [
+            ("stages", json.dumps(stages, separators=(",", ":")), now),
+            ("stages_hash", json.dumps(digest), now),
+        ],
+    )
+
+
+def _flatten(stages: list[dict]) -> dict[str, Rows]:
+    """Map each static table to ``{id: row}`` for a checklist definition."""
+    rows: dict[str, Rows] = {table: {} for table, _ in CHECKLIST_TABLES}
+    for stage in stages:
+        rows["stages"][stage["id"]] = (
+            stage["id"],
+            stage["title"],
+            stage["description"],
+            stage["ordering"],
+        )
+        for repo in stage["repositories"]:
+            rows["repositories"][repo["id"]] = (
+                repo["id"],
+                repo["stage_id"],
+                repo["title"],
+                repo["description"],
+                repo["ordering"],
+            )
+            for task in repo["tasks"]:
+                rows["tasks"][task["id"]] = (
+                    task["id"],
+                    repo["id"],
+                    task["title"],
+                    task["description"],
+                    task["ordering"],
+                )
+    return rows
+
+
+def _current_rows(
+    conn: duckdb.DuckDBPyConnection,
+    table: str,
+    columns: tuple[str, ...],
+) -> Rows:
+    result = conn.execute(f"SELECT {', '.join(columns)} FROM {table};").fetchall()
+    return {row[0]: tuple(row) for row in result}
+
+
+def _diff_checklist(
+    current: dict[str, Rows],
+    desired: dict[str, Rows],
+) -> dict[str, TableDiff]:
+    diff: dict[str, TableDiff] = {}
+    for table, columns in CHECKLIST_TABLES:
+        parent = columns.index(_PARENT_COLUMNS[table]) if table in _PARENT_COLUMNS else None
+        table_diff = TableDiff()
+        for row_id, row in desired[table].items():
+            existing = current[table].get(row_id)
+            if existing is None:
+                table_diff.added.append(row_id)
+            elif parent is not None and existing[parent] != row[parent]:
+                table_diff.moved.append(row_id)
+            elif existing != row:
+                table_diff.updated.append(row_id)
+        table_diff.removed = [
+            row_id for row_id in current[table] if row_id not in desired[table]
+        ]
+        diff[table] = table_diff
+
+    # Tasks under a re-parented repository must be detached with it.
+    moved_repos = set(diff["repositories"].moved)
+    if moved_repos:
+        task_diff = diff["tasks"]
+        for task_id, row in current["tasks"].items():
+            if row[1] in moved_repos and task_id in desired["tasks"]:
+                if task_id in task_diff.updated:
+                    task_diff.updated.remove(task_id)
+                if task_id not in task_diff.moved:
+                    task_diff.moved.append(task_id)
+    return diff
+
+
+def _detach_rows(
+    conn: duckdb.DuckDBPyConnection,
+    desired: dict[str, Rows],
+    diff: dict[str, TableDiff],
+) -> list[tuple]:
+    """Apply in-place edits, then delete removed and re-parented rows.
+
+    DuckDB rejects changing a referenced row's key-indexed columns and
+    deleting a parent in the transaction that removed its children, so
+    re-parented rows are deleted and re-inserted by :func:`_attach_rows`,
+    and deletes run child-first with one table per transaction. Progress of
+    re-parented tasks is moved to ``task_progress_stash`` by the transaction
+    that deletes it, which also clears the stored hashes: a crash before the
+    attach commits makes the next startup re-diff, and its attach restores
+    the stash.
+    """
+    conn.begin()
+    for table, columns in CHECKLIST_TABLES:
+        rows = desired[table]
+        in_place = tuple(c for c in columns if c != _PARENT_COLUMNS.get(table))
+        _update_rows(
+            conn,
+            table,
+            in_place,
+            [
+                tuple(value for c, value in zip(columns, rows[i]) if c in in_place)
+                for i in diff[table].updated
+            ],
+        )
+    conn.execute(
+        """
+        INSERT INTO task_progress_stash
+            (user_id, task_id, completed, completed_at, link)
+        SELECT user_id, task_id, completed, completed_at, link
+        FROM task_progress
+        WHERE task_id IN (SELECT UNNEST($1::JSON::TEXT[]))
+        ON CONFLICT (user_id, task_id) DO UPDATE
+        SET completed = excluded.completed,
+            completed_at = excluded.completed_at,
+            link = excluded.link;
+        """,
+        [list_param(diff["tasks"].moved)],
+    )
+    conn.execute(
+        """
+        DELETE FROM checklist_metadata
+        WHERE key IN ('stages_hash', 'checklist_source_hash');
+        """
+    )
+    conn.execute(
+        """
+        DELETE FROM task_progress
+        WHERE task_id IN (SELECT UNNEST($1::JSON::TEXT[]));
+        """,
+        [list_param(diff["tasks"].removed + diff["tasks"].moved)],
+    )
+    conn.commit()
+
+    for table, _ in reversed(CHECKLIST_TABLES):
+        doomed = diff[table].removed + diff[table].moved
+        if doomed:
+            conn.begin()
             conn.execute(
-                """
-                INSERT INTO stages (id, title, description, ordering)
-                VALUES (?, ?, ?, ?)
-                ON CONFLICT (id) DO NOTHING;
-                """,
-                (
-                    stage["id"],
-                    stage["title"],
-                    stage["description"],
-                    stage["ordering"],
-                ),
+                f"DELETE FROM {table} WHERE id IN (SELECT UNNEST($1::JSON::TEXT[]));",
+                [list_param(doomed)],
             )
+            conn.commit()
 
-            for repo in stage["repositories"]:
-                conn.execute(
-                    """
-                    INSERT INTO repositories (id, stage_id, title, description, ordering)
-                    VALUES (?, ?, ?, ?, ?)
-                    ON CONFLICT (id) DO NOTHING;
-                    """,
-                    (
-                        repo["id"],
-                        repo["stage_id"],
-                        repo["title"],
-                        repo["description"],
-                        repo["ordering"],
-                    ),
-                )
 
-                for task in repo["tasks"]:
-                    conn.execute(
-                        """
-                        INSERT INTO tasks (id, repository_id, title, description, ordering)
-                        VALUES (?, ?, ?, ?, ?)
-                        ON CONFLICT (id) DO NOTHING;
-                        """,
-                        (
-                            task["id"],
-                            repo["id"],
-                            task["title"],
-                            task["description"],
-                            task["ordering"],
-                        ),
-                    )
-                    conn.execute(
-                        """
-                        INSERT INTO task_progress (task_id, completed, completed_at)
-                        SELECT ?, FALSE, NULL
-                        WHERE NOT EXISTS (
-                            SELECT 1 FROM task_progress WHERE task_id = ?
-                        );
-                        """,
-                        (task["id"], task["id"]),
-                    )
+def _attach_rows(
+    conn: duckdb.DuckDBPyConnection,
+    desired: dict[str, Rows],
+    diff: dict[str, TableDiff],
+) -> None:
+    """Insert new and re-parented rows parent-first and restore their progress.
+
+    Every stashed row whose task exists is restored, including rows left by
+    an earlier sync that did not finish, and the stash is emptied.
+    """
+    for table, columns in CHECKLIST_TABLES:
+        rows = desired[table]
+        _insert_rows(
+            conn,
+            table,
+            columns,
+            [rows[i] for i in diff[table].added + diff[table].moved],
+        )
+    conn.execute(
+        """
+        INSERT INTO task_progress (user_id, task_id, completed, completed_at, link)
+        SELECT user_id, task_id, completed, completed_at, link
+        FROM task_progress_stash
+        WHERE task_id IN (SELECT id FROM tasks)
+        ON CONFLICT (user_id, task_id) DO NOTHING;
+        """
+    )
+    conn.execute("DELETE FROM task_progress_stash;")
+    conn.execute(
+        """
+        INSERT INTO task_progress (user_id, task_id, completed, completed_at)
+        SELECT $2, UNNEST($1::JSON::TEXT[]), FALSE, NULL
+        ON CONFLICT (user_id, task_id) DO NOTHING;
+        """,
+        [list_param(diff["tasks"].added + diff["tasks"].moved), DEFAULT_USER_ID],
+    )
+
+
+def _insert_rows(
+    conn: duckdb.DuckDBPyConnection,
+    table: str,
+    columns: tuple[str, ...],
+    rows: list[tuple],
+) -> None:
+    """Insert ``rows`` with a single ``INSERT ... SELECT UNNEST(...)``."""
+    if not rows:
+        return
+    selects = ", ".join(
+        f"UNNEST(${index}::JSON::{_column_type(column)}[])"
+        for index, column in enumerate(columns, start=1)
+    )
+    conn.execute(
+        f"""
+        INSERT INTO {table} ({', '.join(columns)})
+        SELECT {selects}
+        ON CONFLICT (id) DO NOTHING;
+        """,
+        _columns(rows, len(columns)),
+    )
+
+
+def _update_rows(
+    conn: duckdb.DuckDBPyConnection,
+    table: str,
+    columns: tuple[str, ...],
+    rows: list[tuple],
+) -> None:
+    """Overwrite changed ``rows`` with a single ``UPDATE ... FROM``."""
+    if not rows:
+        return
+    selects = ", ".join(
+        f"UNNEST(${index}::JSON::{_column_type(column)}[]) AS {column}"
+        for index, column in enumerate(columns, start=1)
+    )
+    assignments = ", ".join(f"{column} = src.{column}" for column in columns[1:])
+    conn.execute(
+        f"""
+        UPDATE {table}
+        SET {assignments}
+        FROM (SELECT {selects}) AS src
+        WHERE {table}.id = src.id;
+        """,
+        _columns(rows, len(columns)),
+    )
+
+
+def _column_type(column: str) -> str:
+    return _COLUMN_TYPES.get(column, "TEXT")
+
 
+def _columns(rows: list[tuple], width: int) -> list[str]:
+    """Transpose row tuples into per-column UNNEST parameters."""
+    columns: list[list] = [[] for _ in range(width)]
+    for row in rows:
+        for column, value in zip(columns, row):
+            column.append(value)
+    return [list_param(column) for column in columns]
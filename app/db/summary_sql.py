@@ -0,0 +1,168 @@
+"""Progress hierarchy assembly with gating and rollups computed in DuckDB."""
+
+from __future__ import annotations
+
+import duckdb
+
+from app.db.duckdb import DEFAULT_USER_ID
+from app.metrics import query_timer
+from app.models.schemas import ProgressMetrics, ProgressSummary
+
+# Per-task rows in display order for user ``$user``. A task is enabled when
+# it is complete or sits at or below the user's materialized frontier in its
+# repository (the lowest incomplete ordering; NULL once everything is
+# complete). Without a frontier row the user has no progress there, so only
+# the first task is unlocked.
+TASKS_QUERY = """
+    WITH first_tasks AS (
+        SELECT repository_id, MIN(ordering) AS ordering
+        FROM tasks
+        GROUP BY repository_id
+    )
+    SELECT
+        r.stage_id,
+        t.repository_id,
+        t.id,
+        t.title,
+        t.description,
+        t.ordering,
+        COALESCE(tp.completed, FALSE) AS completed,
+        tp.link,
+        COALESCE(tp.completed, FALSE) OR CASE
+            WHEN f.repository_id IS NULL THEN t.ordering <= ft.ordering
+            ELSE f.frontier_ordering IS NULL OR t.ordering <= f.frontier_ordering
+        END AS enabled
+    FROM stages s
+    JOIN repositories r ON r.stage_id = s.id
+    JOIN tasks t ON t.repository_id = r.id
+    JOIN first_tasks ft ON ft.repository_id = r.id
+    LEFT JOIN task_progress tp ON tp.task_id = t.id AND tp.user_id = $user
+    LEFT JOIN repository_frontier f
+        ON f.repository_id = r.id AND f.user_id = $user
+    ORDER BY s.ordering, r.ordering, t.ordering;
+"""
+
+# Completed/total counts of user ``$user`` per repository, per stage and
+# overall in one pass, joined back to the stage/repository metadata. Stages
+# and repositories without tasks are left out, matching the row-based engine.
+ROLLUP_QUERY = """
+    WITH rollup AS (
+        SELECT
+            r.stage_id,
+            t.repository_id,
+            GROUPING(r.stage_id, t.repository_id) AS level,
+            COUNT(*) AS total,
+            COUNT(*) FILTER (WHERE tp.completed) AS completed
+        FROM repositories r
+        JOIN tasks t ON t.repository_id = r.id
+        LEFT JOIN task_progress tp ON tp.task_id = t.id AND tp.user_id = $user
+        GROUP BY GROUPING SETS ((r.stage_id, t.repository_id), (r.stage_id), ())
+    )
+    SELECT
+        rollup.level,
+        rollup.stage_id,
+        rollup.repository_id,
+        rollup.completed,
+        rollup.total,
+        COALESCE(r.title, s.title) AS title,
+        COALESCE(r.description, s.description) AS description,
+        COALESCE(r.ordering, s.ordering) AS ordering
+    FROM rollup
+    LEFT JOIN stages s ON s.id = rollup.stage_id AND rollup.level = 1
+    LEFT JOIN repositories r ON r.id = rollup.repository_id AND rollup.level = 0;
+"""
+
+
+def query_progress_summary_sql(
+    conn: duckdb.DuckDBPyConnection,
+    user_id: str = DEFAULT_USER_ID,
+) -> ProgressSummary:
+    """Build ``user_id``'s hierarchy from pre-aggregated DuckDB results.
+
+    Python only stitches rows into models; it never sorts, counts or walks a
+    repository to decide gating. The rows are gathered into plain dicts and
+    validated into models with a single ``model_validate`` call.
+    """
+    stages_meta: dict[str, tuple] = {}
+    repos_meta: dict[str, tuple] = {}
+    overall = ProgressMetrics()
+    with query_timer("summary_rollup"):
+        rollup_rows = conn.execute(ROLLUP_QUERY, {"user": user_id}).fetchall()
+    with query_timer("summary_tasks"):
+        task_rows = conn.execute(TASKS_QUERY, {"user": user_id}).fetchall()
+
+    for (
+        level,
+        stage_id,
+        repo_id,
+        completed,
+        total,
+        title,
+        description,
+        ordering,
+    ) in rollup_rows:
+        metrics = ProgressMetrics.from_counts(completed, total)
+        if level == 0:
+            repos_meta[repo_id] = (title, description, ordering, metrics)
+        elif level == 1:
+            stages_meta[stage_id] = (title, description, ordering, metrics)
+        else:
+            overall = metrics
+
+    stages: list[dict] = []
+    stage: dict | None = None
+    repo: dict | None = None
+    for (
+        stage_id,
+        repo_id,
+        task_id,
+        title,
+        description,
+        ordering,
+        completed,
+        link,
+        enabled,
+    ) in task_rows:
+        if stage is None or stage["id"] != stage_id:
+            stage_title, stage_description, stage_order, stage_progress = (
+                stages_meta[stage_id]
+            )
+            stage = {
+                "id": stage_id,
+                "title": stage_title,
+                "description": stage_description,
+                "ordering": stage_order,
+                "progress": stage_progress,
+                "repositories": [],
+            }
+            stages.append(stage)
+        if repo is None or repo["id"] != repo_id:
+            repo_title, repo_description, repo_order, repo_progress = (
+                repos_meta[repo_id]
+            )
+            repo = {
+                "id": repo_id,
+                "stage_id": stage_id,
+                "title": repo_title,
+                "description": repo_description,
+                "ordering": repo_order,
+                "progress": repo_progress,
+                "tasks": [],
+            }
+            stage["repositories"].append(repo)
+        repo["tasks"].append(
+            {
+                "id": task_id,
+                "repository_id": repo_id,
+                "title": title,
+                "description": description,
+                "ordering": ordering,
+                "completed": completed,
+                "enabled": enabled,
+                "link": link,
+            }
+        )
+
+    return ProgressSummary.model_validate(
+        {"stages": stages, "overall_progress": overall.percent}
+    )
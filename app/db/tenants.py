@@ -0,0 +1,161 @@
+"""Per-tenant DuckDB files sharing one read-only checklist database.
+
+In tenant mode (``TASKTRACKER_TENANT_DIR`` set) each workspace's progress
+lives in ``<tenant dir>/<tenant id>.duckdb``, so tenants never contend for
+one writer and a tenant can be backed up, moved or deleted as a file. The
+checklist is not copied into every file: the shared database at
+``TASKTRACKER_DB_PATH`` is seeded once on startup, closed, and then
+attached read-only to each tenant as ``checklist``, where views expose its
+``stages``, ``repositories`` and ``tasks`` under their usual names. Every
+query in :mod:`app.db` therefore runs unchanged against a tenant file.
+
+DuckDB does not allow foreign keys across databases, so a tenant's
+``task_progress`` does not reference ``tasks``. Instead each tenant records
+the checklist hash it last reconciled with; when a tenant is opened after
+the checklist changed, progress on deleted tasks is dropped and the derived
+frontier and cohort summaries are rebuilt, as the seeder does for the
+shared database.
+"""
+
+from __future__ import annotations
+
+import datetime
+
+import duckdb
+
+from app.db.cohort import reset_cohort_rollup
+from app.db.duckdb import (
+    ALL_USERS,
+    COHORT_STATEMENTS,
+    DEFAULT_USER_ID,
+    PROGRESS_EVENT_STATEMENTS,
+    apply_migrations,
+    bump_data_version,
+    resolve_catalog_path,
+)
+from app.db.frontier import rebuild_frontier
+
+CATALOG_ALIAS = "checklist"
+
+# A tenant file's schema: views onto the attached checklist, and the same
+# progress tables as the shared database in their current shapes.
+TENANT_SCHEMA_STATEMENTS: tuple[str, ...] = (
+    *(
+        f"CREATE OR REPLACE VIEW {table} AS SELECT * FROM {CATALOG_ALIAS}.{table};"
+        for table in ("stages", "repositories", "tasks", "checklist_metadata")
+    ),
+    f"""
+    CREATE TABLE IF NOT EXISTS task_progress (
+        user_id TEXT NOT NULL DEFAULT '{DEFAULT_USER_ID}',
+        task_id TEXT NOT NULL,
+        completed BOOLEAN NOT NULL DEFAULT FALSE,
+        completed_at TIMESTAMP,
+        link TEXT,
+        PRIMARY KEY (user_id, task_id)
+    );
+    """,
+    "CREATE INDEX IF NOT EXISTS task_progress_user_idx ON task_progress (user_id);",
+    f"""
+    CREATE TABLE IF NOT EXISTS repository_frontier (
+        user_id TEXT NOT NULL DEFAULT '{DEFAULT_USER_ID}',
+        repository_id TEXT NOT NULL,
+        frontier_ordering INTEGER,
+        PRIMARY KEY (user_id, repository_id)
+    );
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS repository_frontier_user_idx
+    ON repository_frontier (user_id);
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS data_version (
+        id INTEGER PRIMARY KEY,
+        version BIGINT NOT NULL
+    );
+    """,
+    "INSERT INTO data_version (id, version) VALUES (1, 0) ON CONFLICT DO NOTHING;",
+    """
+    CREATE TABLE IF NOT EXISTS user_data_version (
+        user_id TEXT PRIMARY KEY,
+        version BIGINT NOT NULL
+    );
+    """,
+    f"""
+    INSERT INTO user_data_version (user_id, version) VALUES ('{ALL_USERS}', 0)
+    ON CONFLICT DO NOTHING;
+    """,
+    *PROGRESS_EVENT_STATEMENTS,
+    f"""
+    ALTER TABLE progress_events
+    ADD COLUMN IF NOT EXISTS user_id TEXT DEFAULT '{DEFAULT_USER_ID}';
+    """,
+    *COHORT_STATEMENTS,
+    """
+    CREATE TABLE IF NOT EXISTS tenant_sync (
+        id INTEGER PRIMARY KEY,
+        stages_hash TEXT,
+        synced_at TIMESTAMP
+    );
+    """,
+)
+
+# Ordered tenant schema migrations, versioned independently of
+# :data:`app.db.duckdb.MIGRATIONS`. Append new migrations, never edit
+# applied ones.
+TENANT_MIGRATIONS: tuple[tuple[str, ...], ...] = (TENANT_SCHEMA_STATEMENTS,)
+
+
+def prepare_tenant_database(conn: duckdb.DuckDBPyConnection) -> None:
+    """Attach the checklist and bring a freshly opened tenant file up to date.
+
+    Runs as the tenant's :class:`~app.db.duckdb.ConnectionManager` ``on_open``
+    hook, so it costs one ``ATTACH`` and two lookups when nothing changed.
+    """
+    # ATTACH takes no parameters, so the path is inlined as a SQL literal.
+    catalog = str(resolve_catalog_path()).replace("'", "''")
+    conn.execute(f"ATTACH '{catalog}' AS {CATALOG_ALIAS} (READ_ONLY);")
+    apply_migrations(conn, TENANT_MIGRATIONS)
+    reconcile_tenant(conn)
+
+
+def reconcile_tenant(conn: duckdb.DuckDBPyConnection) -> bool:
+    """Catch a tenant's progress up with checklist changes; return whether it did.
+
+    Progress on tasks the checklist no longer has is deleted, then the
+    frontier is rebuilt, the cohort summaries are reset and every user's
+    data version is bumped, in one transaction with the new hash.
+    """
+    row = conn.execute(
+        f"""
+        SELECT
+            (SELECT value_json FROM {CATALOG_ALIAS}.checklist_metadata
+             WHERE key = 'stages_hash'),
+            (SELECT stages_hash FROM tenant_sync WHERE id = 1);
+        """
+    ).fetchone()
+    catalog_hash, synced_hash = row
+    if catalog_hash is None or catalog_hash == synced_hash:
+        return False
+
+    conn.begin()
+    try:
+        conn.execute(
+            "DELETE FROM task_progress WHERE task_id NOT IN (SELECT id FROM tasks);"
+        )
+        rebuild_frontier(conn)
+        reset_cohort_rollup(conn)
+        bump_data_version(conn, ALL_USERS)
+        conn.execute(
+            """
+            INSERT INTO tenant_sync (id, stages_hash, synced_at) VALUES (1, ?, ?)
+            ON CONFLICT (id) DO UPDATE
+            SET stages_hash = excluded.stages_hash, synced_at = excluded.synced_at;
+            """,
+            (catalog_hash, datetime.datetime.now()),
+        )
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return True
+
@@ -0,0 +1,328 @@
+"""Bulk export and import of task progress as Parquet or CSV files.
+
+Exports are a single DuckDB ``COPY`` of ``task_progress`` joined with its
+task and repository metadata. Imports read a file with DuckDB's own readers
+into a staging table, check it set-wise against the checklist and the gating
+rules, and merge it into ``task_progress`` in one transaction, so a large
+history moves between machines without going through the API row by row.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Literal
+
+import duckdb
+
+from app.db.cache import progress_cache
+from app.db.duckdb import (
+    ALL_USERS,
+    DEFAULT_USER_ID,
+    bump_data_version,
+    get_connection,
+)
+from app.db.frontier import rebuild_frontier
+from app.db.progress import (
+    ProgressValidationError,
+    fetch_progress_summary,
+    progress_cache_key,
+)
+from app.metrics import query_timer
+from app.models.schemas import ProgressImportResult
+
+TransferFormat = Literal["parquet", "csv"]
+TRANSFER_FORMATS: tuple[TransferFormat, ...] = ("parquet", "csv")
+MEDIA_TYPES: dict[TransferFormat, str] = {
+    "parquet": "application/vnd.apache.parquet",
+    "csv": "text/csv",
+}
+
+# Rejection messages name at most this many offending task ids.
+_SAMPLE_SIZE = 5
+
+_EXPORT_QUERY = """
+    SELECT
+        tp.user_id,
+        s.id AS stage_id,
+        r.id AS repository_id,
+        r.title AS repository_title,
+        t.id AS task_id,
+        t.title AS task_title,
+        t.ordering AS task_ordering,
+        tp.completed,
+        tp.completed_at,
+        tp.link
+    FROM task_progress tp
+    JOIN tasks t ON t.id = tp.task_id
+    JOIN repositories r ON r.id = t.repository_id
+    JOIN stages s ON s.id = r.stage_id
+    WHERE $user IS NULL OR tp.user_id = $user
+    ORDER BY tp.user_id, s.ordering, r.ordering, t.ordering
+"""
+
+_READERS: dict[TransferFormat, str] = {
+    "parquet": "read_parquet($path)",
+    "csv": "read_csv($path, header = true, all_varchar = true)",
+}
+
+
+def resolve_format(path: Path, fmt: str | None = None) -> TransferFormat:
+    """Return ``fmt``, or the format implied by ``path``'s suffix."""
+    name = (fmt or path.suffix.removeprefix(".")).lower()
+    if name not in TRANSFER_FORMATS:
+        raise ValueError(
+            f"Unknown transfer format {name!r}; "
+            f"expected one of {', '.join(TRANSFER_FORMATS)}."
+        )
+    return name  # type: ignore[return-value]
+
+
+def export_progress(
+    path: Path,
+    fmt: TransferFormat = "parquet",
+    user_id: str | None = DEFAULT_USER_ID,
+) -> int:
+    """Write ``user_id``'s stored task states to ``path``; returns the row count.
+
+    ``user_id=None`` exports every user's progress.
+    """
+    options = "FORMAT parquet" if fmt == "parquet" else "FORMAT csv, HEADER"
+    with get_connection(read_only=True) as conn:
+        with query_timer("progress_export"):
+            return conn.execute(
+                f"COPY ({_EXPORT_QUERY}) TO $path ({options});",
+                {"path": str(path), "user": user_id},
+            ).fetchone()[0]
+
+
+def import_progress(
+    path: Path,
+    fmt: TransferFormat = "parquet",
+    user_id: str | None = DEFAULT_USER_ID,
+) -> ProgressImportResult:
+    """Merge the task states in ``path`` into ``user_id``'s progress.
+
+    The file needs ``task_id``, ``repository_id``, ``completed``,
+    ``completed_at`` and ``link`` columns, as written by
+    :func:`export_progress`; other columns are ignored. With
+    ``user_id=None`` each row goes to the user in its ``user_id`` column
+    instead. Unlike a batch, which is replayed update by update, an import
+    is a snapshot: gating is checked on the merged end state of every
+    repository it touches. Any violation rejects the whole file.
+    """
+    with get_connection() as conn:
+        conn.begin()
+        with query_timer("import_stage"):
+            rows = _stage(conn, path, fmt, user_id)
+        with query_timer("import_validate"):
+            _validate_staged(conn)
+        with query_timer("import_merge"):
+            updated = _merge_staged(conn)
+            repo_ids = [
+                repo_id
+                for (repo_id,) in conn.execute(
+                    "SELECT DISTINCT repository_id FROM progress_import;"
+                ).fetchall()
+            ]
+            conn.execute("DROP TABLE progress_import;")
+        with query_timer("frontier_rebuild"):
+            rebuild_frontier(conn, repo_ids, user_id)
+        bump_data_version(conn, ALL_USERS if user_id is None else user_id)
+        conn.commit()
+        progress_cache.invalidate(
+            None if user_id is None else progress_cache_key(user_id)
+        )
+
+    return ProgressImportResult(
+        rows=rows,
+        updated=updated,
+        overall_progress=fetch_progress_summary(
+            DEFAULT_USER_ID if user_id is None else user_id
+        ).overall_progress,
+    )
+
+
+def _stage(
+    conn: duckdb.DuckDBPyConnection,
+    path: Path,
+    fmt: TransferFormat,
+    user_id: str | None,
+) -> int:
+    user_column = "CAST(user_id AS TEXT)" if user_id is None else "$user"
+    params = {"path": str(path)}
+    if user_id is not None:
+        params["user"] = user_id
+    try:
+        conn.execute(
+            f"""
+            CREATE OR REPLACE TEMP TABLE progress_import AS
+            SELECT
+                {user_column} AS user_id,
+                CAST(task_id AS TEXT) AS task_id,
+                CAST(repository_id AS TEXT) AS repository_id,
+                CAST(completed AS BOOLEAN) AS completed,
+                CAST(completed_at AS TIMESTAMP) AS completed_at,
+                CAST(link AS TEXT) AS link
+            FROM {_READERS[fmt]};
+            """,
+            params,
+        )
+    except duckdb.Error as exc:
+        raise ProgressValidationError(f"Could not read {fmt} file: {exc}") from exc
+    return conn.execute("SELECT COUNT(*) FROM progress_import;").fetchone()[0]
+
+
+def _validate_staged(conn: duckdb.DuckDBPyConnection) -> None:
+    _reject_rows(
+        conn,
+        """
+        SELECT COALESCE(task_id, '<missing>') FROM progress_import
+        WHERE user_id IS NULL
+           OR task_id IS NULL
+           OR repository_id IS NULL
+           OR completed IS NULL
+        """,
+        "{count} rows lack a user_id, task_id, repository_id or completed value",
+    )
+    _reject_rows(
+        conn,
+        """
+        SELECT task_id FROM progress_import
+        GROUP BY user_id, task_id HAVING COUNT(*) > 1
+        """,
+        "{count} tasks appear more than once",
+    )
+    _reject_rows(
+        conn,
+        """
+        SELECT s.task_id FROM progress_import s
+        LEFT JOIN tasks t ON t.id = s.task_id
+        WHERE t.id IS NULL
+        """,
+        "{count} rows reference unknown tasks",
+    )
+    _reject_rows(
+        conn,
+        """
+        SELECT s.task_id FROM progress_import s
+        JOIN tasks t ON t.id = s.task_id
+        WHERE t.repository_id <> s.repository_id
+        """,
+        "{count} tasks do not belong to their repository",
+    )
+    _reject_rows(
+        conn,
+        """
+        SELECT task_id FROM progress_import
+        WHERE completed AND NULLIF(TRIM(link), '') IS NULL
+        """,
+        "{count} completed tasks have no work link",
+    )
+    # A completed task may not sit past the first incomplete one of its
+    # repository once the file is merged over the user's stored state.
+    _reject_rows(
+        conn,
+        """
+        WITH touched AS (
+            SELECT DISTINCT user_id, repository_id FROM progress_import
+        ),
+        merged AS (
+            SELECT
+                u.user_id,
+                t.id,
+                t.repository_id,
+                t.ordering,
+                COALESCE(s.completed, tp.completed, FALSE) AS completed
+            FROM touched u
+            JOIN tasks t ON t.repository_id = u.repository_id
+            LEFT JOIN progress_import s
+                ON s.task_id = t.id AND s.user_id = u.user_id
+            LEFT JOIN task_progress tp
+                ON tp.task_id = t.id AND tp.user_id = u.user_id
+        ),
+        frontiers AS (
+            SELECT
+                user_id,
+                repository_id,
+                MIN(ordering) FILTER (WHERE NOT completed) AS frontier
+            FROM merged
+            GROUP BY user_id, repository_id
+        ),
+        gated AS (
+            SELECT merged.*, frontiers.frontier
+            FROM merged
+            JOIN frontiers USING (user_id, repository_id)
+        )
+        SELECT id FROM gated
+        WHERE completed AND ordering > frontier
+        """,
+        "{count} tasks would be complete before earlier tasks in their repository",
+    )
+
+
+def _reject_rows(conn: duckdb.DuckDBPyConnection, query: str, message: str) -> None:
+    """Raise if ``query`` returns any task ids, naming the first few."""
+    row = conn.execute(
+        f"""
+        SELECT COUNT(*), list(id ORDER BY id)[1:{_SAMPLE_SIZE}]
+        FROM ({query}) AS offending(id);
+        """
+    ).fetchone()
+    count, sample = row
+    if count:
+        raise ProgressValidationError(
+            f"Import rejected: {message.format(count=count)} ({', '.join(sample)})."
+        )
+
+
+def _merge_staged(conn: duckdb.DuckDBPyConnection) -> int:
+    """Log state changes as events and upsert the staged rows.
+
+    Completions keep the file's ``completed_at`` so imported history lands
+    on the right day in the analytics rollup. Returns how many tasks changed
+    state.
+    """
+    updated = conn.execute(
+        """
+        INSERT INTO progress_events
+            (user_id, task_id, repository_id, completed, was_completed, link,
+             occurred_at)
+        SELECT
+            s.user_id,
+            s.task_id,
+            s.repository_id,
+            s.completed,
+            COALESCE(tp.completed, FALSE),
+            CASE WHEN s.completed THEN s.link END,
+            CASE
+                WHEN s.completed THEN COALESCE(s.completed_at, CURRENT_TIMESTAMP)
+                ELSE CURRENT_TIMESTAMP
+            END
+        FROM progress_import s
+        LEFT JOIN task_progress tp
+            ON tp.task_id = s.task_id AND tp.user_id = s.user_id
+        WHERE s.completed <> COALESCE(tp.completed, FALSE)
+        ORDER BY s.completed_at NULLS LAST, s.task_id;
+        """
+    ).fetchone()[0]
+    conn.execute(
+        """
+        INSERT INTO task_progress (user_id, task_id, completed, completed_at, link)
+        SELECT
+            s.user_id,
+            s.task_id,
+            s.completed,
+            CASE WHEN s.completed THEN
+                COALESCE(s.completed_at, tp.completed_at, CURRENT_TIMESTAMP)
+            END,
+            CASE WHEN s.completed THEN s.link END
+        FROM progress_import s
+        LEFT JOIN task_progress tp
+            ON tp.task_id = s.task_id AND tp.user_id = s.user_id
+        ON CONFLICT (user_id, task_id) DO UPDATE
+        SET completed = excluded.completed,
+            completed_at = excluded.completed_at,
+            link = excluded.link;
+        """
+    )
+    return updated
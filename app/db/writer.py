@@ -0,0 +1,281 @@
+"""Single-writer queue that group-commits task progress updates.
+
+DuckDB serializes writers, so concurrent updates handed to the DB executor
+each wait for the writer lease and then pay for their own transaction and
+commit. :class:`ProgressWriter` instead funnels updates into one queue that
+a single thread drains: whatever arrived while the previous group was
+committing is applied as the next group, in one transaction, via
+:func:`app.db.progress.apply_update_group`. The busier the queue, the larger
+the groups and the fewer commits per update.
+
+Each caller still gets its own outcome: its future resolves with its
+:class:`~app.models.schemas.ProgressDelta` once the group has committed, or
+raises its own :class:`~app.db.progress.ProgressValidationError`. Committed
+deltas are also handed to :attr:`ProgressWriter.on_commit` from the writer
+thread, so listeners see them in commit order.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import queue
+import threading
+from concurrent.futures import Future
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from app.config import env_int
+from app.db.duckdb import DEFAULT_USER_ID, resolve_db_path
+from app.db.executor import DatabaseBusyError, db_executor
+from app.db.progress import (
+    TaskUpdate,
+    apply_update_group,
+    update_task_progress,
+)
+from app.metrics import Stats, query_timer
+from app.models.schemas import ProgressDelta
+
+DEFAULT_WRITE_GROUP_SIZE = 64
+DEFAULT_WRITE_MAX_PENDING = 1024
+
+
+@dataclass
+class WriterStats(Stats):
+    """Point-in-time counters for a :class:`ProgressWriter`."""
+
+    max_group: int
+    max_pending: int
+    pending: int
+    submitted: int
+    completed: int
+    rejected: int
+    groups: int
+    largest_group: int
+    group_fallbacks: int
+
+    @property
+    def average_group(self) -> float:
+        return self.completed / self.groups if self.groups else 0.0
+
+    def as_dict(self) -> dict[str, object]:
+        return {**super().as_dict(), "average_group": self.average_group}
+
+
+@dataclass
+class _Request:
+    update: TaskUpdate
+    user_id: str
+    db_path: Path
+    context: contextvars.Context
+    future: Future
+
+
+class ProgressWriter:
+    """Apply task updates from one thread, committing them in groups.
+
+    At most ``max_group`` queued updates share a transaction; beyond
+    ``max_pending`` waiting updates :class:`DatabaseBusyError` is raised, as
+    :class:`~app.db.executor.DatabaseExecutor` does. Each group runs in its
+    first request's context, and requests for different database files
+    (tenants) are never grouped together.
+
+    When :attr:`on_commit` is set it is called with each committed delta
+    and its user, in the request's context, before the request's future
+    resolves. Calls come from the writer thread in commit order, which is
+    what progress events need; the awaiting requests resume in any order.
+    """
+
+    def __init__(
+        self,
+        max_group: int = DEFAULT_WRITE_GROUP_SIZE,
+        max_pending: int = DEFAULT_WRITE_MAX_PENDING,
+    ) -> None:
+        self.max_group = max(1, max_group)
+        self.max_pending = max(1, max_pending)
+        self.on_commit: Callable[[ProgressDelta, str], None] | None = None
+        self._queue: queue.Queue[_Request | None] = queue.Queue(self.max_pending)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+        self._groups = 0
+        self._largest_group = 0
+        self._fallbacks = 0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="tasktracker-writer",
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def shutdown(self) -> None:
+        """Apply every queued update, then stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def submit(
+        self,
+        update: TaskUpdate,
+        user_id: str = DEFAULT_USER_ID,
+    ) -> Future:
+        """Queue ``update``; the future resolves once its group has committed."""
+        self.start()
+        request = _Request(
+            update=update,
+            user_id=user_id,
+            db_path=resolve_db_path(),
+            context=contextvars.copy_context(),
+            future=Future(),
+        )
+        try:
+            self._queue.put_nowait(request)
+        except queue.Full:
+            with self._lock:
+                self._rejected += 1
+            raise DatabaseBusyError("Too many progress updates are queued.") from None
+        with self._lock:
+            self._submitted += 1
+        return request.future
+
+    async def update(
+        self,
+        update: TaskUpdate,
+        user_id: str = DEFAULT_USER_ID,
+    ) -> ProgressDelta:
+        """Submit ``update`` and await its delta without blocking the loop.
+
+        In a worker process whose DB calls are dispatched to the database
+        owner, the update is queued on the owner's writer instead, so it
+        groups with updates from every worker.
+        """
+        if db_executor.dispatch is not None:
+            return await db_executor.run(write_update, update, user_id)
+        return await asyncio.wrap_future(self.submit(update, user_id))
+
+    def stats(self) -> WriterStats:
+        with self._lock:
+            return WriterStats(
+                max_group=self.max_group,
+                max_pending=self.max_pending,
+                pending=self._queue.qsize(),
+                submitted=self._submitted,
+                completed=self._completed,
+                rejected=self._rejected,
+                groups=self._groups,
+                largest_group=self._largest_group,
+                group_fallbacks=self._fallbacks,
+            )
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            # Everything that queued up while the last group committed joins
+            # this one; nothing waits for stragglers.
+            while len(batch) < self.max_group:
+                try:
+                    request = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if request is None:
+                    stopping = True
+                    break
+                batch.append(request)
+
+            groups: dict[Path, list[_Request]] = {}
+            for request in batch:
+                groups.setdefault(request.db_path, []).append(request)
+            for group in groups.values():
+                self._commit(group)
+
+    def _commit(self, group: list[_Request]) -> None:
+        live = [
+            request
+            for request in group
+            if request.future.set_running_or_notify_cancel()
+        ]
+        if not live:
+            return
+        if len(live) == 1:
+            # A lone update gains nothing from grouping, and the single-update
+            # path's statements are cheaper than the set-based ones.
+            self._apply_alone(live[0])
+            return
+        try:
+            with query_timer("write_group"):
+                results = live[0].context.run(
+                    apply_update_group,
+                    [(request.update, request.user_id) for request in live],
+                )
+        except Exception:
+            # Something other than validation failed and the group rolled
+            # back; apply the requests one by one so only the culprit fails.
+            with self._lock:
+                self._fallbacks += 1
+            for request in live:
+                self._apply_alone(request)
+            return
+
+        for request, result in zip(live, results):
+            if isinstance(result, Exception):
+                request.future.set_exception(result)
+            else:
+                self._committed(request, result)
+                request.future.set_result(result)
+        self._record(len(live))
+
+    def _apply_alone(self, request: _Request) -> None:
+        update = request.update
+        try:
+            delta = request.context.run(
+                update_task_progress,
+                update.repo_id,
+                update.task_id,
+                update.completed,
+                update.link,
+                request.user_id,
+            )
+        except Exception as exc:
+            request.future.set_exception(exc)
+        else:
+            self._committed(request, delta)
+            request.future.set_result(delta)
+        self._record(1)
+
+    def _committed(self, request: _Request, delta: ProgressDelta) -> None:
+        on_commit = self.on_commit
+        if on_commit is not None:
+            # A listener's failure must not stop the writer thread.
+            with suppress(Exception):
+                request.context.run(on_commit, delta, request.user_id)
+
+    def _record(self, size: int) -> None:
+        with self._lock:
+            self._completed += size
+            self._groups += 1
+            self._largest_group = max(self._largest_group, size)
+
+
+progress_writer = ProgressWriter(
+    max_group=env_int("TASKTRACKER_WRITE_GROUP_SIZE", DEFAULT_WRITE_GROUP_SIZE),
+    max_pending=env_int("TASKTRACKER_WRITE_MAX_PENDING", DEFAULT_WRITE_MAX_PENDING),
+)
+
+
+def write_update(update: TaskUpdate, user_id: str = DEFAULT_USER_ID) -> ProgressDelta:
+    """Apply ``update`` through :data:`progress_writer`, blocking until it commits."""
+    return progress_writer.submit(update, user_id).result()
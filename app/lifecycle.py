@@ -0,0 +1,55 @@
+"""Open and release the database resources of the process that owns them."""
+
+import logging
+
+from app.api.stream import publish_delta
+from app.db.duckdb import (
+    close_connection_pool,
+    init_db,
+    open_connection_pool,
+    resolve_catalog_path,
+    tenant_dir,
+)
+from app.db.executor import db_executor
+from app.db.seeder import checklist_source, seed_static_data
+from app.db.writer import progress_writer
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def start_database() -> None:
+    """Open the DB connection pool and initialize schema before serving.
+
+    In tenant mode the shared checklist database is closed again once
+    seeded, so tenant files can attach it read-only as they are opened.
+    """
+    open_connection_pool()
+    db_executor.start()
+    progress_writer.on_commit = publish_delta
+    progress_writer.start()
+    init_db()
+    report = seed_static_data(keep_stored=checklist_source() == "stored")
+    if report.seeded:
+        logger.info(
+            "Synced checklist (%d stages, %d repositories, %d tasks): "
+            "%d added, %d updated, %d moved, %d removed in %.1f ms",
+            report.stages,
+            report.repositories,
+            report.tasks,
+            report.added,
+            report.updated,
+            report.moved,
+            report.removed,
+            report.seconds * 1000,
+        )
+    else:
+        logger.info("Checklist unchanged (checked in %.1f ms)", report.seconds * 1000)
+    if tenant_dir() is not None:
+        close_connection_pool(resolve_catalog_path())
+
+
+def stop_database() -> None:
+    """Drain the writer and DB worker threads, then release DuckDB connections."""
+    progress_writer.shutdown()
+    db_executor.shutdown()
+    close_connection_pool()
@@ -3,14 +3,17 @@
 from pathlib import Path
 
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
 from app import __version__
 from app.api import api_router
-from app.db.duckdb import init_db
-from app.db.seeder import seed_static_data
+from app.cluster import owner_address, start_worker, stop_worker
+from app.db.executor import DatabaseBusyError
+from app.lifecycle import start_database, stop_database
+from app.metrics import RequestMetricsMiddleware
+from app.tenancy import TenantMiddleware
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 STATIC_DIR = BASE_DIR / "static"
@@ -22,6 +25,8 @@ app = FastAPI(
     description="Sequential progress tracker for 20 staged ML repositories",
 )
 
+app.add_middleware(TenantMiddleware)
+app.add_middleware(RequestMetricsMiddleware)
 app.include_router(api_router, prefix="/api")
 app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 templates = Jinja2Templates(directory=str(TEMPLATE_DIR))
@@ -29,9 +34,36 @@ templates = Jinja2Templates(directory=str(TEMPLATE_DIR))
 
 @app.on_event("startup")
 async def on_startup() -> None:
-    """Initialize database schema before serving traffic."""
-    init_db()
-    seed_static_data()
+    """Open the database, or connect to the process that owns it.
+
+    Under ``python main.py --workers N`` each worker process forwards its
+    database calls to the launcher, which holds the DuckDB file; see
+    :mod:`app.cluster`.
+    """
+    address = owner_address()
+    if address is not None:
+        start_worker(address)
+    else:
+        start_database()
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    """Release the database, or disconnect from its owner."""
+    if owner_address() is not None:
+        stop_worker()
+    else:
+        stop_database()
+
+
+@app.exception_handler(DatabaseBusyError)
+async def database_busy_handler(request: Request, exc: DatabaseBusyError) -> JSONResponse:
+    """Shed load with a retryable 503 when the DB queue is full."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -0,0 +1,263 @@
+"""In-process request and query metrics rendered as Prometheus text.
+
+Histograms live in :data:`registry`. Request timing and in-flight counts
+come from :class:`RequestMetricsMiddleware`; DB code wraps its statements in
+:func:`query_timer` and the hierarchy build and serialization steps in
+:func:`phase_timer`, so time spent in SQL, in Python tree building and in
+serialization can be told apart.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Callable, Iterator, Mapping
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Seconds; fine-grained at the low end, where point queries land.
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+@dataclass
+class Stats:
+    """Base for the point-in-time counter dataclasses components report.
+
+    :meth:`as_dict` is what :meth:`MetricsRegistry.register_stats` collectors
+    return; subclasses with derived values add them to it.
+    """
+
+    def as_dict(self) -> dict[str, object]:
+        return asdict(self)
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram keyed by label values."""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: tuple[str, ...],
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        # labels -> (per-bucket counts incl. +Inf, sum)
+        self._series: dict[Labels, tuple[list[int], list[float]]] = {}
+
+    def observe(self, seconds: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += seconds
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return sum(series[0]) if series else 0
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            snapshot = {key: (list(c), s[0]) for key, (c, s) in self._series.items()}
+        for key, (counts, total) in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_float(bound)
+                bucket_labels = _format_labels(key + (("le", le),))
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            labels = _format_labels(key)
+            lines.append(f"{self.name}_sum{labels} {_format_float(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+    def _key(self, labels: Mapping[str, str]) -> Labels:
+        return tuple((name, str(labels[name])) for name in self.label_names)
+
+
+class MetricsRegistry:
+    """The process's metrics plus collectors for point-in-time stats."""
+
+    def __init__(self) -> None:
+        self.request_duration = Histogram(
+            "tasktracker_http_request_duration_seconds",
+            "HTTP request latency by route.",
+            ("method", "route", "status"),
+        )
+        self.query_duration = Histogram(
+            "tasktracker_db_query_duration_seconds",
+            "DuckDB statement latency by named query.",
+            ("query",),
+        )
+        self.phase_duration = Histogram(
+            "tasktracker_progress_phase_duration_seconds",
+            "Progress hierarchy build and serialization time.",
+            ("phase",),
+        )
+        self._collectors: dict[str, Callable[[], Mapping[str, object] | None]] = {}
+        # Scopes of requests being served, keyed by id(scope).
+        self._active_lock = threading.Lock()
+        self._active: dict[int, Scope] = {}
+
+    def register_stats(
+        self, prefix: str, collect: Callable[[], Mapping[str, object] | None]
+    ) -> None:
+        """Expose numeric fields of ``collect()`` as ``tasktracker_<prefix>_*``."""
+        self._collectors[prefix] = collect
+
+    def request_started(self, scope: Scope) -> None:
+        with self._active_lock:
+            self._active[id(scope)] = scope
+
+    def request_finished(self, scope: Scope) -> None:
+        with self._active_lock:
+            self._active.pop(id(scope), None)
+
+    def in_flight(self) -> dict[tuple[str, str], int]:
+        """Count requests being served by ``(method, route)``.
+
+        Labels are read from the live request scopes, so a request counts
+        under its route as soon as it has been routed.
+        """
+        with self._active_lock:
+            scopes = list(self._active.values())
+        counts: dict[tuple[str, str], int] = {}
+        for scope in scopes:
+            key = (scope["method"], route_label(scope))
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    def render(self) -> str:
+        lines = self.request_duration.render()
+        name = "tasktracker_http_requests_in_flight"
+        lines.append(f"# HELP {name} HTTP requests currently being served.")
+        lines.append(f"# TYPE {name} gauge")
+        for (method, route), count in sorted(self.in_flight().items()):
+            labels = (("method", method), ("route", route))
+            lines.append(f"{name}{_format_labels(labels)} {count}")
+        lines.extend(self.query_duration.render())
+        lines.extend(self.phase_duration.render())
+        for prefix, collect in self._collectors.items():
+            stats = collect() or {}
+            for field, value in stats.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                name = f"tasktracker_{prefix}_{field}"
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {_format_float(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def query_timer(name: str):
+    """Time a named DuckDB statement (execute plus fetch)."""
+    return registry.query_duration.time(query=name)
+
+
+def phase_timer(name: str):
+    """Time a named step of producing the progress hierarchy."""
+    return registry.phase_duration.time(phase=name)
+
+
+class RequestMetricsMiddleware:
+    """Record per-route latency and in-flight counts for HTTP requests.
+
+    Requests are labelled with the matched route template (for example
+    ``/progress/{repo_id}/{task_id}``), so label cardinality stays bounded.
+    Latency runs until the last body chunk is sent.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: MetricsRegistry | None = None) -> None:
+        self.app = app
+        self.metrics = metrics or registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        self.metrics.request_started(scope)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.metrics.request_finished(scope)
+            self.metrics.request_duration.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=route_label(scope),
+                status=status,
+            )
+
+
+def route_label(scope: Scope) -> str:
+    """Return the route template the router matched, or ``"unmatched"``."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{name}="{_escape(value)}"' for name, value in labels)
+    return "{" + inner + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_float(value: float) -> str:
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
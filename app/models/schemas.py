@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
-from typing import List
+from datetime import date
+from typing import Annotated, List
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, StringConstraints
+
+# Whose progress a request reads or writes: a path segment under
+# ``/users/{user_id}``, or the ``user_id`` query parameter elsewhere.
+UserId = Annotated[str, StringConstraints(pattern=r"^[A-Za-z0-9._@-]{1,128}$")]
 
 
 class Task(BaseModel):
@@ -23,6 +28,11 @@ class ProgressMetrics(BaseModel):
     total: int = 0
     percent: float = Field(0, ge=0, le=100)
 
+    @classmethod
+    def from_counts(cls, completed: int, total: int) -> "ProgressMetrics":
+        percent = round((completed / total) * 100, 1) if total else 0
+        return cls(completed=completed, total=total, percent=percent)
+
 
 class Repository(BaseModel):
     id: str
@@ -48,7 +58,107 @@ class ProgressSummary(BaseModel):
     overall_progress: float = Field(0, ge=0, le=100)
 
 
+class ProgressDelta(BaseModel):
+    task: Task
+    next_task: Task | None = None
+    repository_id: str
+    repository_progress: ProgressMetrics
+    stage_id: str
+    stage_progress: ProgressMetrics
+    overall_progress: float = Field(0, ge=0, le=100)
+
+
 class TaskProgressUpdate(BaseModel):
     completed: bool
     link: str | None = None
 
+
+class TaskProgressBatchItem(TaskProgressUpdate):
+    repo_id: str
+    task_id: str
+
+
+class TaskProgressBatch(BaseModel):
+    updates: List[TaskProgressBatchItem] = Field(min_length=1)
+
+
+class ProgressBatchResult(BaseModel):
+    updated: int
+    overall_progress: float = Field(0, ge=0, le=100)
+
+
+class ProgressImportResult(BaseModel):
+    rows: int
+    updated: int
+    overall_progress: float = Field(0, ge=0, le=100)
+
+
+class VelocityPoint(BaseModel):
+    day: date
+    completions: int
+    reopenings: int
+    trailing_average: float
+
+
+class VelocityReport(BaseModel):
+    days: int
+    window_days: int
+    net_completions: int
+    average_per_day: float
+    points: List[VelocityPoint]
+
+
+class CompletionPeriod(BaseModel):
+    period_start: date
+    completions: int
+    reopenings: int
+
+
+class RepositoryTime(BaseModel):
+    repository_id: str
+    title: str | None = None
+    first_day: date
+    last_day: date
+    span_days: int
+    active_days: int
+    completions: int
+    reopenings: int
+
+
+class CohortTask(BaseModel):
+    id: str
+    repository_id: str
+    title: str
+    ordering: int
+    completed_users: int
+    completion_rate: float = Field(0, ge=0, le=100)
+    drop_off: int
+
+
+class CohortRepository(BaseModel):
+    id: str
+    stage_id: str
+    title: str
+    ordering: int
+    total_tasks: int
+    started_users: int
+    completed_users: int
+    distribution: List[int]
+    median_hours_to_complete: float | None = None
+
+
+class CohortStage(BaseModel):
+    id: str
+    title: str
+    ordering: int
+    total_tasks: int
+    started_users: int
+    completed_users: int
+    average_progress: float = Field(0, ge=0, le=100)
+
+
+class CohortReport(BaseModel):
+    users: int
+    stages: List[CohortStage]
+    repositories: List[CohortRepository]
+    tasks: List[CohortTask]
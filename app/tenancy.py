@@ -0,0 +1,65 @@
+"""Route each request to its tenant's database in tenant mode.
+
+See :mod:`app.db.tenants`. Outside tenant mode (no
+``TASKTRACKER_TENANT_DIR``) the middleware passes requests straight through.
+"""
+
+from __future__ import annotations
+
+import json
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.db.duckdb import (
+    DEFAULT_TENANT_ID,
+    TENANT_ID_PATTERN,
+    tenant_dir,
+    tenant_scope,
+)
+
+TENANT_HEADER = b"x-tenant-id"
+
+
+class TenantMiddleware:
+    """Scope each request's database access to the tenant in ``X-Tenant-ID``.
+
+    Requests without the header use :data:`DEFAULT_TENANT_ID`; malformed ids
+    are rejected with 400 before any database file is touched. The scope
+    is a context variable, so it follows the request into the DB executor
+    and through streamed response bodies.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or tenant_dir() is None:
+            await self.app(scope, receive, send)
+            return
+
+        tenant_id = DEFAULT_TENANT_ID
+        for name, value in scope["headers"]:
+            if name == TENANT_HEADER:
+                tenant_id = value.decode("latin-1")
+                break
+        if not TENANT_ID_PATTERN.fullmatch(tenant_id):
+            await _reject(send, f"Invalid {TENANT_HEADER.decode()} header.")
+            return
+
+        with tenant_scope(tenant_id):
+            await self.app(scope, receive, send)
+
+
+async def _reject(send: Send, detail: str) -> None:
+    body = json.dumps({"detail": detail}).encode("utf-8")
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 400,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,154 @@
+"""Timing helpers shared by the benchmark modules."""
+
+from __future__ import annotations
+
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable
+
+
+@dataclass
+class BenchResult:
+    """Latency percentiles, throughput and peak memory of one benchmark."""
+
+    name: str
+    tasks: int
+    iterations: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    ops_per_second: float
+    peak_memory_bytes: int
+
+    def as_dict(self) -> dict[str, object]:
+        return asdict(self)
+
+    def summary_line(self) -> str:
+        return (
+            f"{self.name:<24} {self.tasks:>8} tasks  "
+            f"p50 {self.p50_ms:9.3f} ms  p95 {self.p95_ms:9.3f} ms  "
+            f"p99 {self.p99_ms:9.3f} ms  {self.ops_per_second:9.1f} op/s  "
+            f"peak {self.peak_memory_bytes / 1024:9.1f} KiB"
+        )
+
+
+def measure(
+    name: str,
+    tasks: int,
+    fn: Callable[[], object],
+    iterations: int,
+    setup: Callable[[], object] | None = None,
+    warmup: int = 1,
+) -> BenchResult:
+    """Time ``iterations`` calls of ``fn``; ``setup`` runs untimed before each.
+
+    Peak memory comes from one extra traced call, so tracing overhead does
+    not skew the latencies.
+    """
+    for _ in range(warmup):
+        if setup is not None:
+            setup()
+        fn()
+
+    samples: list[float] = []
+    gc.collect()
+    for _ in range(iterations):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+
+    if setup is not None:
+        setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return BenchResult(
+        name=name,
+        tasks=tasks,
+        iterations=iterations,
+        p50_ms=percentile(samples, 50) * 1000,
+        p95_ms=percentile(samples, 95) * 1000,
+        p99_ms=percentile(samples, 99) * 1000,
+        mean_ms=statistics.fmean(samples) * 1000,
+        ops_per_second=len(samples) / sum(samples) if sum(samples) else 0.0,
+        peak_memory_bytes=peak,
+    )
+
+
+def percentile(samples: list[float], pct: int) -> float:
+    """Return the ``pct``-th percentile of ``samples`` (inclusive method)."""
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[pct - 1]
+
+
+def environment() -> dict[str, object]:
+    """Describe the run so result files can be compared across commits."""
+    import duckdb
+    import pydantic
+
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(),
+        "duckdb": duckdb.__version__,
+        "pydantic": pydantic.VERSION,
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def write_results(path: Path, results: list[BenchResult]) -> None:
+    payload = {
+        "environment": environment(),
+        "results": [result.as_dict() for result in results],
+    }
+    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+
+def compare(baseline_path: Path, results: list[BenchResult]) -> list[str]:
+    """Return one line per benchmark with its p50 change against a baseline."""
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    previous = {
+        (row["name"], row["tasks"]): row for row in baseline.get("results", [])
+    }
+    lines = []
+    for result in results:
+        row = previous.get((result.name, result.tasks))
+        if row is None or not row["p50_ms"]:
+            continue
+        change = (result.p50_ms - row["p50_ms"]) / row["p50_ms"] * 100
+        lines.append(
+            f"{result.name:<24} {result.tasks:>8} tasks  "
+            f"p50 {row['p50_ms']:9.3f} -> {result.p50_ms:9.3f} ms ({change:+6.1f}%)"
+        )
+    return lines
+
+
+def _git(*args: str) -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", *args],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip()
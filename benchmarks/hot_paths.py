@@ -0,0 +1,222 @@
+"""Benchmark the progress read/write hot paths across roadmap sizes.
+
+Run with ``python -m benchmarks.hot_paths``; pass ``--output`` to write the
+results as JSON and ``--baseline`` to compare against an earlier file::
+
+    python -m benchmarks.hot_paths --sizes 1000,10000 --output before.json
+    python -m benchmarks.hot_paths --sizes 1000,10000 --baseline before.json
+
+Each size gets its own temporary DuckDB file populated by the synthetic
+roadmap generator. The HTTP routes are driven in-process through the ASGI
+app, without the startup hook, which would reseed the real checklist.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import tempfile
+from pathlib import Path
+
+import httpx
+
+from app.data.synthetic import (
+    RoadmapSpec,
+    completed_tasks,
+    generate_stages,
+    seed_roadmap,
+)
+from app.db.cache import progress_cache
+from app.db.duckdb import close_connection_pool, init_db
+from app.db.executor import db_executor
+from app.db.ndjson import ProgressRecordStream
+from app.db.progress import fetch_progress_summary, update_task_progress
+from app.db.seeder import seed_static_data
+from benchmarks.harness import BenchResult, compare, measure, write_results
+
+STAGES = 10
+TASKS_PER_REPO = 20
+
+
+def spec_for(tasks: int, completion: float, seed: int) -> RoadmapSpec:
+    """Roadmap of ten stages with twenty-task repositories, about ``tasks`` big."""
+    return RoadmapSpec(
+        stages=STAGES,
+        repos_per_stage=max(1, tasks // (STAGES * TASKS_PER_REPO)),
+        tasks_per_repo=TASKS_PER_REPO,
+        completion=completion,
+        seed=seed,
+    )
+
+
+def run_size(spec: RoadmapSpec, workdir: Path, iterations: int) -> list[BenchResult]:
+    db_path = workdir / f"roadmap-{spec.total_tasks}.duckdb"
+    os.environ["TASKTRACKER_DB_PATH"] = str(db_path)
+    seed_roadmap(spec)
+    stages = generate_stages(spec)
+    tasks = spec.total_tasks
+    repo_id, task_id = _frontier_task(stages, spec)
+    results: list[BenchResult] = []
+
+    # Reads: every call rebuilds the hierarchy, or every call hits the cache.
+    results.append(
+        measure(
+            "fetch_summary_cold",
+            tasks,
+            fetch_progress_summary,
+            iterations,
+            setup=progress_cache.invalidate,
+        )
+    )
+    results.append(
+        measure("fetch_summary_cached", tasks, fetch_progress_summary, iterations)
+    )
+    # Streaming reads bypass the cache; peak memory should not grow with size.
+    results.append(measure("stream_records", tasks, _drain_records, iterations))
+
+    # Writes: complete and reopen the same frontier task, alternately.
+    toggle = _Toggle()
+    results.append(
+        measure(
+            "update_task_progress",
+            tasks,
+            lambda: update_task_progress(
+                repo_id, task_id, toggle.next(), "https://example.com/bench"
+            ),
+            iterations,
+        )
+    )
+
+    results.append(
+        measure("seed_unchanged", tasks, lambda: seed_static_data(stages), iterations)
+    )
+    fresh = _FreshDatabase(workdir, db_path)
+    results.append(
+        measure(
+            "seed_fresh",
+            tasks,
+            lambda: seed_static_data(stages),
+            max(3, iterations // 10),
+            setup=fresh.next,
+        )
+    )
+    fresh.restore()
+
+    results.extend(_http_results(tasks, repo_id, task_id, iterations))
+    close_connection_pool()
+    return results
+
+
+def _http_results(
+    tasks: int, repo_id: str, task_id: str, iterations: int
+) -> list[BenchResult]:
+    from app.main import app
+
+    loop = asyncio.new_event_loop()
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    )
+    toggle = _Toggle()
+
+    def get_progress() -> None:
+        response = loop.run_until_complete(client.get("/api/v1/progress"))
+        response.raise_for_status()
+
+    def post_progress() -> None:
+        completed = toggle.next()
+        response = loop.run_until_complete(
+            client.post(
+                f"/api/v1/progress/{repo_id}/{task_id}",
+                json={"completed": completed, "link": "https://example.com/bench"},
+            )
+        )
+        response.raise_for_status()
+
+    try:
+        return [
+            measure("http_get_progress", tasks, get_progress, iterations),
+            measure("http_post_progress", tasks, post_progress, iterations),
+        ]
+    finally:
+        loop.run_until_complete(client.aclose())
+        loop.close()
+
+
+def _drain_records() -> None:
+    stream = ProgressRecordStream()
+    while stream.next_chunk() is not None:
+        pass
+
+
+def _frontier_task(stages: list[dict], spec: RoadmapSpec) -> tuple[str, str]:
+    """Return the first incomplete task of the first unfinished repository."""
+    done = {task_id for _, task_id in completed_tasks(stages, spec)}
+    for stage in stages:
+        for repo in stage["repositories"]:
+            for task in repo["tasks"]:
+                if task["id"] not in done:
+                    return repo["id"], task["id"]
+    raise ValueError("Roadmap is fully complete; lower --completion.")
+
+
+class _Toggle:
+    def __init__(self) -> None:
+        self.completed = False
+
+    def next(self) -> bool:
+        self.completed = not self.completed
+        return self.completed
+
+
+class _FreshDatabase:
+    """Point the app at a new empty database file before each seed."""
+
+    def __init__(self, workdir: Path, original: Path) -> None:
+        self.workdir = workdir
+        self.original = original
+        self.count = 0
+
+    def next(self) -> None:
+        self.count += 1
+        path = self.workdir / f"fresh-{self.original.stem}-{self.count}.duckdb"
+        os.environ["TASKTRACKER_DB_PATH"] = str(path)
+        init_db()
+
+    def restore(self) -> None:
+        os.environ["TASKTRACKER_DB_PATH"] = str(self.original)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        default="1000,10000",
+        help="comma-separated approximate task counts",
+    )
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--completion", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument("--baseline", type=Path, help="results JSON to compare with")
+    args = parser.parse_args()
+
+    results: list[BenchResult] = []
+    with tempfile.TemporaryDirectory(prefix="tasktracker-bench-") as workdir:
+        for size in (int(value) for value in args.sizes.split(",")):
+            spec = spec_for(size, args.completion, args.seed)
+            for result in run_size(spec, Path(workdir), args.iterations):
+                print(result.summary_line())
+                results.append(result)
+        db_executor.shutdown()
+
+    if args.output:
+        write_results(args.output, results)
+        print(f"Wrote {args.output}")
+    if args.baseline:
+        print()
+        print("\n".join(compare(args.baseline, results)))
+
+
+if __name__ == "__main__":
+    main()
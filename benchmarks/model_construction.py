@@ -0,0 +1,184 @@
+"""Compare ways of building a large ``ProgressSummary`` from query rows.
+
+Run with ``python -m benchmarks.model_construction``. Every strategy builds
+the same hierarchy from in-memory rows shaped like the summary query
+results, so the numbers isolate model construction cost:
+
+* per-model validate: ``Task(...)`` etc. for every object (the old path);
+* model_construct: skip validation, but run pydantic's Python-level
+  constructor per object;
+* single validate: gather plain dicts and validate the tree in one call,
+  which is what the summary engines do.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Callable
+
+from app.models.schemas import (
+    ProgressMetrics,
+    ProgressSummary,
+    Repository,
+    Stage,
+    Task,
+)
+
+Row = tuple[str, str, str, str, str, int, bool, str | None]
+
+# Fixed metrics keep rollup arithmetic out of the measurement.
+_REPO_METRICS = ProgressMetrics.from_counts(1, 3)
+
+
+def synthetic_rows(
+    stages: int, repos_per_stage: int, tasks_per_repo: int
+) -> list[Row]:
+    """Rows of ``(stage, repo, task, title, description, ordering, completed, link)``."""
+    rows: list[Row] = []
+    for s in range(stages):
+        for r in range(repos_per_stage):
+            for t in range(tasks_per_repo):
+                rows.append(
+                    (
+                        f"stage-{s}",
+                        f"repo-{s}-{r}",
+                        f"task-{s}-{r}-{t}",
+                        f"Task {t}",
+                        "Lorem ipsum dolor sit amet. " * 4,
+                        t + 1,
+                        t % 3 == 0,
+                        None,
+                    )
+                )
+    return rows
+
+
+def build_models(rows: list[Row], trusted: bool) -> ProgressSummary:
+    """Construct every model individually, validated or via ``model_construct``."""
+    make = _construct if trusted else _validate
+    stages: list[Stage] = []
+    stage: Stage | None = None
+    repo: Repository | None = None
+    for stage_id, repo_id, task_id, title, description, ordering, done, link in rows:
+        if stage is None or stage.id != stage_id:
+            stage = make(Stage, id=stage_id, title=stage_id, ordering=len(stages))
+            stages.append(stage)
+        if repo is None or repo.id != repo_id:
+            repo = make(
+                Repository,
+                id=repo_id,
+                stage_id=stage_id,
+                title=repo_id,
+                ordering=len(stage.repositories),
+                progress=_REPO_METRICS,
+            )
+            stage.repositories.append(repo)
+        repo.tasks.append(
+            make(
+                Task,
+                id=task_id,
+                repository_id=repo_id,
+                title=title,
+                description=description,
+                ordering=ordering,
+                completed=done,
+                enabled=True,
+                link=link,
+            )
+        )
+    return make(ProgressSummary, stages=stages, overall_progress=0.0)
+
+
+def build_tree(rows: list[Row]) -> ProgressSummary:
+    """Gather plain dicts and validate the whole tree once (the app's path)."""
+    stages: list[dict] = []
+    stage: dict | None = None
+    repo: dict | None = None
+    for stage_id, repo_id, task_id, title, description, ordering, done, link in rows:
+        if stage is None or stage["id"] != stage_id:
+            stage = {
+                "id": stage_id,
+                "title": stage_id,
+                "ordering": len(stages),
+                "repositories": [],
+            }
+            stages.append(stage)
+        if repo is None or repo["id"] != repo_id:
+            repo = {
+                "id": repo_id,
+                "stage_id": stage_id,
+                "title": repo_id,
+                "ordering": len(stage["repositories"]),
+                "progress": _REPO_METRICS,
+                "tasks": [],
+            }
+            stage["repositories"].append(repo)
+        repo["tasks"].append(
+            {
+                "id": task_id,
+                "repository_id": repo_id,
+                "title": title,
+                "description": description,
+                "ordering": ordering,
+                "completed": done,
+                "enabled": True,
+                "link": link,
+            }
+        )
+    return ProgressSummary.model_validate({"stages": stages, "overall_progress": 0.0})
+
+
+def _validate(cls, **fields):
+    return cls(**fields)
+
+
+def _construct(cls, **fields):
+    return cls.model_construct(**fields)
+
+
+def measure(fn: Callable[[], object], repeat: int) -> tuple[float, int]:
+    """Return the best wall time and the peak traced allocation of ``fn``."""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stages", type=int, default=10)
+    parser.add_argument("--repos", type=int, default=50, help="repositories per stage")
+    parser.add_argument("--tasks", type=int, default=200, help="tasks per repository")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = synthetic_rows(args.stages, args.repos, args.tasks)
+    print(f"{len(rows)} tasks")
+    strategies: dict[str, Callable[[], object]] = {
+        "per-model validate": lambda: build_models(rows, trusted=False),
+        "model_construct": lambda: build_models(rows, trusted=True),
+        "single validate": lambda: build_tree(rows),
+    }
+    baseline: tuple[float, int] | None = None
+    for label, fn in strategies.items():
+        seconds, peak = measure(fn, args.repeat)
+        baseline = baseline or (seconds, peak)
+        print(
+            f"{label:>18}: {seconds * 1000:9.1f} ms ({baseline[0] / seconds:4.2f}x)"
+            f"  peak {peak / 2**20:7.1f} MiB ({baseline[1] / peak:4.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
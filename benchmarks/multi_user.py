@@ -0,0 +1,166 @@
+"""Benchmark per-user reads and writes as the number of users grows.
+
+Run with ``python -m benchmarks.multi_user``; ``--output`` and
+``--baseline`` work as in :mod:`benchmarks.hot_paths`::
+
+    python -m benchmarks.multi_user --users 100,1000,10000
+
+The real checklist is seeded into a temporary DuckDB file, then users are
+added in bulk with SQL, each with a random prefix of every repository
+complete. At each user count the same probe user's hierarchy is read and
+one of its tasks toggled, so the latencies should stay flat as other
+users' progress piles up.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+from pathlib import Path
+
+from app.db.cache import progress_cache
+from app.db.duckdb import (
+    ALL_USERS,
+    bump_data_version,
+    close_connection_pool,
+    get_connection,
+    init_db,
+)
+from app.db.executor import db_executor
+from app.db.frontier import rebuild_frontier
+from app.db.progress import (
+    fetch_progress_summary,
+    get_data_version,
+    update_task_progress,
+)
+from app.db.seeder import seed_static_data
+from benchmarks.harness import BenchResult, compare, measure, write_results
+
+PROBE_USER = "bench-probe"
+
+# Completes a pseudo-random prefix of every repository for users
+# ``$first .. $last - 1``, so their frontiers are spread across the checklist.
+_ADD_USERS = """
+    INSERT INTO task_progress (user_id, task_id, completed, completed_at, link)
+    WITH ranked AS (
+        SELECT
+            id,
+            repository_id,
+            ROW_NUMBER() OVER (PARTITION BY repository_id ORDER BY ordering) AS rank,
+            COUNT(*) OVER (PARTITION BY repository_id) AS total
+        FROM tasks
+    )
+    SELECT
+        'user-' || u.range,
+        ranked.id,
+        TRUE,
+        CURRENT_TIMESTAMP,
+        'https://example.com/bench'
+    FROM range($first, $last) AS u
+    JOIN ranked ON ranked.rank <= hash(u.range, ranked.repository_id) % (total + 1);
+"""
+
+
+def add_users(first: int, last: int) -> None:
+    """Give users ``first`` to ``last - 1`` progress and materialize frontiers."""
+    with get_connection() as conn:
+        conn.begin()
+        conn.execute(_ADD_USERS, {"first": first, "last": last})
+        rebuild_frontier(conn)
+        bump_data_version(conn, ALL_USERS)
+        conn.commit()
+    progress_cache.invalidate()
+
+
+def run_users(users: int, tasks: int, iterations: int) -> list[BenchResult]:
+    repo_id, task_id = _first_task()
+    completed = False
+
+    def toggle() -> None:
+        nonlocal completed
+        completed = not completed
+        update_task_progress(
+            repo_id, task_id, completed, "https://example.com/bench", PROBE_USER
+        )
+
+    def probe_summary() -> None:
+        fetch_progress_summary(PROBE_USER)
+
+    results = [
+        measure(
+            f"fetch_summary_cold@{users}",
+            tasks,
+            probe_summary,
+            iterations,
+            setup=progress_cache.invalidate,
+        ),
+        measure(f"fetch_summary_cached@{users}", tasks, probe_summary, iterations),
+        measure(f"update_task_progress@{users}", tasks, toggle, iterations),
+        measure(
+            f"data_version@{users}",
+            tasks,
+            lambda: get_data_version(PROBE_USER),
+            iterations,
+        ),
+    ]
+    return results
+
+
+def _first_task() -> tuple[str, str]:
+    with get_connection(read_only=True) as conn:
+        return conn.execute(
+            """
+            SELECT t.repository_id, t.id
+            FROM tasks t
+            JOIN repositories r ON r.id = t.repository_id
+            JOIN stages s ON s.id = r.stage_id
+            ORDER BY s.ordering, r.ordering, t.ordering
+            LIMIT 1;
+            """
+        ).fetchone()
+
+
+def _task_count() -> int:
+    with get_connection(read_only=True) as conn:
+        return conn.execute("SELECT COUNT(*) FROM tasks;").fetchone()[0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--users",
+        default="100,1000,10000",
+        help="comma-separated ascending user counts",
+    )
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument("--baseline", type=Path, help="results JSON to compare with")
+    args = parser.parse_args()
+
+    results: list[BenchResult] = []
+    with tempfile.TemporaryDirectory(prefix="tasktracker-bench-") as workdir:
+        os.environ["TASKTRACKER_DB_PATH"] = str(Path(workdir) / "users.duckdb")
+        init_db()
+        seed_static_data()
+        tasks = _task_count()
+        added = 0
+        for users in sorted(int(value) for value in args.users.split(",")):
+            add_users(added, users)
+            added = users
+            for result in run_users(users, tasks, args.iterations):
+                print(result.summary_line())
+                results.append(result)
+        close_connection_pool()
+        db_executor.shutdown()
+
+    if args.output:
+        write_results(args.output, results)
+        print(f"Wrote {args.output}")
+    if args.baseline:
+        print()
+        print("\n".join(compare(args.baseline, results)))
+
+
+if __name__ == "__main__":
+    main()
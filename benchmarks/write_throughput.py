@@ -0,0 +1,127 @@
+"""Benchmark concurrent progress writes: per-call commits vs group commit.
+
+Run with ``python -m benchmarks.write_throughput``; ``--output`` and
+``--baseline`` work as in :mod:`benchmarks.hot_paths`::
+
+    python -m benchmarks.write_throughput --concurrency 1,16,64
+
+Each iteration is a burst of ``--burst`` task toggles spread over many
+users, with at most ``--concurrency`` in flight from one event loop. The
+``executor`` rows run :func:`app.db.progress.update_task_progress` on the
+DB executor, one transaction per update, as the routes used to; the
+``writer`` rows submit the same updates through
+:data:`app.db.writer.progress_writer`, which commits them in groups.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import os
+import tempfile
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from app.data.checklist import STAGES
+from app.db.duckdb import close_connection_pool, init_db
+from app.db.executor import db_executor
+from app.db.progress import TaskUpdate, update_task_progress
+from app.db.seeder import seed_static_data
+from app.db.writer import progress_writer
+from benchmarks.harness import BenchResult, compare, measure, write_results
+
+REPO_ID = STAGES[0]["repositories"][0]["id"]
+TASK_ID = STAGES[0]["repositories"][0]["tasks"][0]["id"]
+USERS = 16  # the default progress cache bound, so deltas patch warm entries
+
+Submit = Callable[[TaskUpdate, str], Awaitable[object]]
+
+
+async def _via_executor(update: TaskUpdate, user_id: str) -> object:
+    return await db_executor.run(
+        update_task_progress,
+        update.repo_id,
+        update.task_id,
+        update.completed,
+        update.link,
+        user_id,
+    )
+
+
+def burst_runner(
+    submit: Submit,
+    burst: int,
+    concurrency: int,
+) -> Callable[[], None]:
+    """Return a callable that runs one burst of toggles through ``submit``."""
+    toggles = itertools.count()
+
+    async def one_burst() -> None:
+        limit = asyncio.Semaphore(concurrency)
+
+        async def toggle(index: int) -> None:
+            completed = (next(toggles) // USERS) % 2 == 0
+            update = TaskUpdate(REPO_ID, TASK_ID, completed, "https://example.com/b")
+            async with limit:
+                await submit(update, f"user-{index % USERS}")
+
+        await asyncio.gather(*(toggle(index) for index in range(burst)))
+
+    return lambda: asyncio.run(one_burst())
+
+
+def run_concurrency(concurrency: int, burst: int, iterations: int) -> list[BenchResult]:
+    results = []
+    for label, submit in (
+        ("executor", _via_executor),
+        ("writer", progress_writer.update),
+    ):
+        results.append(
+            measure(
+                f"{label}_burst{burst}@{concurrency}",
+                burst,
+                burst_runner(submit, burst, concurrency),
+                iterations,
+            )
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--concurrency",
+        default="1,16,64",
+        help="comma-separated in-flight update limits",
+    )
+    parser.add_argument("--burst", type=int, default=512, help="updates per burst")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument("--baseline", type=Path, help="results JSON to compare with")
+    args = parser.parse_args()
+
+    results: list[BenchResult] = []
+    with tempfile.TemporaryDirectory(prefix="tasktracker-bench-") as workdir:
+        os.environ["TASKTRACKER_DB_PATH"] = str(Path(workdir) / "writes.duckdb")
+        init_db()
+        seed_static_data()
+        for concurrency in (int(value) for value in args.concurrency.split(",")):
+            for result in run_concurrency(concurrency, args.burst, args.iterations):
+                updates_per_second = result.ops_per_second * args.burst
+                print(f"{result.summary_line()}  {updates_per_second:9.1f} updates/s")
+                results.append(result)
+        progress_writer.shutdown()
+        db_executor.shutdown()
+        close_connection_pool()
+
+    if args.output:
+        write_results(args.output, results)
+        print(f"Wrote {args.output}")
+    if args.baseline:
+        print()
+        print("\n".join(compare(args.baseline, results)))
+
+
+if __name__ == "__main__":
+    main()
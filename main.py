@@ -1,14 +1,37 @@
-"""Convenience launcher for local development."""
+"""Launcher: auto-reloading dev server, or several workers for production."""
+
+import argparse
 
 import uvicorn
 
 
 def main() -> None:
-    """Start the FastAPI server with auto-reload."""
+    """Start the FastAPI server.
+
+    Without ``--workers`` this is the single-process dev server with
+    auto-reload. ``--workers N`` runs N worker processes in front of this
+    process, which owns the database (see :mod:`app.cluster`).
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="worker processes to serve with (disables auto-reload)",
+    )
+    args = parser.parse_args()
+
+    if args.workers > 0:
+        from app.cluster import serve
+
+        serve(args.host, args.port, args.workers)
+        return
     uvicorn.run(
         "app.main:app",
-        host="127.0.0.1",
-        port=8000,
+        host=args.host,
+        port=args.port,
         reload=True,
     )
 
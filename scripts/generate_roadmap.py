@@ -0,0 +1,57 @@
+"""Generate a synthetic roadmap and write it to DuckDB (or print it as JSON)."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.data.synthetic import RoadmapSpec, generate_stages, seed_roadmap
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--stages", type=int, default=10)
+    parser.add_argument("--repos", type=int, default=50, help="repositories per stage")
+    parser.add_argument("--tasks", type=int, default=200, help="tasks per repository")
+    parser.add_argument("--description-words", type=int, default=12)
+    parser.add_argument(
+        "--completion", type=float, default=0.0, help="fraction of tasks completed"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--db", type=Path, help="DuckDB file to write")
+    parser.add_argument(
+        "--json", action="store_true", help="print the STAGES payload instead"
+    )
+    args = parser.parse_args()
+
+    spec = RoadmapSpec(
+        stages=args.stages,
+        repos_per_stage=args.repos,
+        tasks_per_repo=args.tasks,
+        description_words=args.description_words,
+        completion=args.completion,
+        seed=args.seed,
+    )
+    if args.json:
+        json.dump(generate_stages(spec), sys.stdout, separators=(",", ":"))
+        return
+    if args.db is None:
+        parser.error("--db is required unless --json is given")
+
+    os.environ["TASKTRACKER_DB_PATH"] = str(args.db)
+    started = time.perf_counter()
+    seed_roadmap(spec)
+    print(f"✓ Wrote {spec.total_tasks} tasks to {args.db}")
+    print(f"  {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -40,7 +40,7 @@ def migrate() -> None:
             SET value_json = excluded.value_json,
                 updated_at = excluded.updated_at;
             """,
-            (json.dumps(STAGES, indent=2), now),
+            (json.dumps(STAGES, separators=(",", ":")), now),
         )
 
         print("✓ Checklist data migrated to DuckDB")
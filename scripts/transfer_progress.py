@@ -0,0 +1,111 @@
+"""Export task progress to, or import it from, a Parquet or CSV file.
+
+    python scripts/transfer_progress.py export backup.parquet
+    python scripts/transfer_progress.py import backup.parquet --db other.duckdb
+    python scripts/transfer_progress.py export everyone.parquet --all-users
+    python scripts/transfer_progress.py export acme.parquet --tenant acme
+
+The format follows the file suffix unless ``--format`` is given. Progress
+belongs to the default user unless ``--user`` names another one;
+``--all-users`` moves every user's rows, keyed by their ``user_id`` column.
+In tenant mode (``TASKTRACKER_TENANT_DIR`` set) ``--tenant`` picks the
+workspace file; stop the server first, as it holds tenant files open.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.db.duckdb import (
+    DEFAULT_TENANT_ID,
+    DEFAULT_USER_ID,
+    TENANT_ID_PATTERN,
+    close_connection_pool,
+    init_db,
+    tenant_dir,
+    tenant_scope,
+)
+from app.db.progress import ProgressValidationError
+from app.db.seeder import seed_static_data
+from app.db.transfer import (
+    TRANSFER_FORMATS,
+    export_progress,
+    import_progress,
+    resolve_format,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="\n".join(__doc__.splitlines()[1:]),
+    )
+    parser.add_argument("action", choices=("export", "import"))
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--format", choices=TRANSFER_FORMATS)
+    parser.add_argument("--db", type=Path, help="DuckDB file (default: app setting)")
+    parser.add_argument(
+        "--tenant",
+        default=DEFAULT_TENANT_ID,
+        help="workspace in tenant mode (default: %(default)s)",
+    )
+    users = parser.add_mutually_exclusive_group()
+    users.add_argument("--user", default=DEFAULT_USER_ID, help="whose progress")
+    users.add_argument(
+        "--all-users",
+        action="store_const",
+        const=None,
+        dest="user",
+        help="every user's progress",
+    )
+    args = parser.parse_args()
+
+    try:
+        fmt = resolve_format(args.path, args.format)
+    except ValueError as exc:
+        parser.error(str(exc))
+    if args.db is not None:
+        os.environ["TASKTRACKER_DB_PATH"] = str(args.db)
+
+    tenant = None
+    if tenant_dir() is not None:
+        if not TENANT_ID_PATTERN.match(args.tenant):
+            parser.error(f"invalid tenant id {args.tenant!r}")
+        tenant = args.tenant
+        # Seed the shared checklist database before the tenant attaches it.
+        init_db()
+        seed_static_data()
+        close_connection_pool()
+    with tenant_scope(tenant):
+        run(args, fmt)
+
+
+def run(args: argparse.Namespace, fmt: str) -> None:
+    init_db()
+    started = time.perf_counter()
+    if args.action == "export":
+        rows = export_progress(args.path, fmt, args.user)
+        print(f"✓ Exported {rows} task states to {args.path}")
+    else:
+        try:
+            result = import_progress(args.path, fmt, args.user)
+        except ProgressValidationError as exc:
+            sys.exit(f"✗ {exc.message}")
+        print(
+            f"✓ Imported {result.rows} task states from {args.path} "
+            f"({result.updated} changed, {result.overall_progress}% complete)"
+        )
+    print(f"  {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -417,6 +417,38 @@ function renderProgressBar(percent = 0) {
   `;
 }
 
+function renderOverallProgress(value) {
+  overallProgressEl.textContent = `${value.toFixed?.(1) ?? value}%`;
+}
+
+function renderAll() {
+  renderStageList();
+  renderRepoDetails();
+  renderStageSummary();
+  renderRepoSummary();
+  renderLinksList();
+}
+
+function applyProgressDelta(delta) {
+  const stage = state.stages.find((s) => s.id === delta.stage_id);
+  const repo = stage?.repositories.find((r) => r.id === delta.repository_id);
+  if (!repo) {
+    return false;
+  }
+
+  [delta.task, delta.next_task].forEach((patch) => {
+    if (!patch) return;
+    const index = repo.tasks.findIndex((task) => task.id === patch.id);
+    if (index !== -1) {
+      repo.tasks[index] = patch;
+    }
+  });
+  repo.progress = delta.repository_progress;
+  stage.progress = delta.stage_progress;
+  renderOverallProgress(delta.overall_progress);
+  return true;
+}
+
 async function loadHierarchy() {
   stageListEl.innerHTML =
     '<li class="stage-item empty">Loading checklist…</li>';
@@ -429,7 +461,7 @@ async function loadHierarchy() {
 
     const data = await response.json();
     state.stages = data.stages;
-    overallProgressEl.textContent = `${data.overall_progress.toFixed?.(1) ?? data.overall_progress}%`;
+    renderOverallProgress(data.overall_progress);
 
     if (!state.selectedRepoId && state.stages[0]?.repositories[0]) {
       state.selectedRepoId = state.stages[0].repositories[0].id;
@@ -440,11 +472,7 @@ async function loadHierarchy() {
       }
     }
 
-    renderStageList();
-    renderRepoDetails();
-    renderStageSummary();
-    renderRepoSummary();
-    renderLinksList();
+    renderAll();
   } catch (error) {
     console.error(error);
     stageListEl.innerHTML =
@@ -464,17 +492,45 @@ async function updateTaskCompletion(repoId, taskId, completed, link) {
       throw new Error("Update failed");
     }
 
-    await loadHierarchy();
+    const delta = await response.json();
+    if (applyProgressDelta(delta)) {
+      renderAll();
+    } else {
+      await loadHierarchy();
+    }
   } catch (error) {
     console.error(error);
     alert("Could not update task. Ensure prerequisites are met.");
   }
 }
 
+function subscribeToProgress() {
+  if (!window.EventSource) return;
+  const source = new EventSource("/api/v1/progress/stream");
+  let connected = false;
+
+  source.addEventListener("open", () => {
+    // Events published while disconnected are lost; resync on reconnect.
+    if (connected) {
+      loadHierarchy();
+    }
+    connected = true;
+  });
+  source.addEventListener("delta", (event) => {
+    if (applyProgressDelta(JSON.parse(event.data))) {
+      renderAll();
+    } else {
+      loadHierarchy();
+    }
+  });
+  source.addEventListener("refresh", () => loadHierarchy());
+}
+
 function init() {
   setupSlidePanels();
   renderCodingChecklist();
   loadHierarchy();
+  subscribeToProgress();
 }
 
 document.addEventListener("DOMContentLoaded", init);
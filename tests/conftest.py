@@ -11,7 +11,7 @@ ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
-from app.db.duckdb import init_db  # noqa: E402
+from app.db.duckdb import close_connection_pool, init_db  # noqa: E402
 from app.db.seeder import seed_static_data  # noqa: E402
 
 
@@ -23,4 +23,16 @@ def fresh_db(tmp_path, monkeypatch):
     init_db()
     seed_static_data()
     yield
+    close_connection_pool()
+
+
+@pytest.fixture()
+def client(fresh_db):
+    """Return a TestClient bound to the temporary database."""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
 
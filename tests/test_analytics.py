@@ -0,0 +1,178 @@
+"""Tests for the progress event log and completion analytics."""
+
+from __future__ import annotations
+
+import datetime
+import threading
+
+import duckdb
+import pytest
+
+from app.data.checklist import STAGES
+from app.db.analytics import (
+    completion_velocity,
+    completions_per_period,
+    refresh_daily_rollup,
+    time_per_repository,
+)
+from app.db.duckdb import get_connection
+from app.db.progress import TaskUpdate, apply_progress_batch, update_task_progress
+
+REPO = STAGES[0]["repositories"][0]
+TASKS = REPO["tasks"]
+
+
+def _events():
+    with get_connection(read_only=True) as conn:
+        return conn.execute(
+            """
+            SELECT task_id, completed, was_completed, link
+            FROM progress_events
+            ORDER BY id;
+            """
+        ).fetchall()
+
+
+def _backdate(days: int) -> None:
+    """Move every event logged so far ``days`` days into the past."""
+    with get_connection() as conn:
+        conn.execute(
+            "UPDATE progress_events SET occurred_at = occurred_at - to_days(?);",
+            (days,),
+        )
+
+
+def test_updates_append_events_in_the_same_transaction(fresh_db):
+    update_task_progress(REPO["id"], TASKS[0]["id"], True, "https://example.com/0")
+    update_task_progress(REPO["id"], TASKS[0]["id"], False)
+    apply_progress_batch(
+        [
+            TaskUpdate(REPO["id"], TASKS[0]["id"], True, "https://example.com/a"),
+            TaskUpdate(REPO["id"], TASKS[1]["id"], True, "https://example.com/b"),
+        ]
+    )
+
+    assert _events() == [
+        (TASKS[0]["id"], True, False, "https://example.com/0"),
+        (TASKS[0]["id"], False, True, None),
+        (TASKS[0]["id"], True, False, "https://example.com/a"),
+        (TASKS[1]["id"], True, False, "https://example.com/b"),
+    ]
+
+
+def test_rejected_update_logs_nothing(fresh_db):
+    try:
+        update_task_progress(REPO["id"], TASKS[1]["id"], True, "https://example.com/1")
+    except Exception:
+        pass
+
+    assert _events() == []
+
+
+def test_rollup_folds_in_only_new_events(fresh_db):
+    today = datetime.date.today()
+    update_task_progress(REPO["id"], TASKS[0]["id"], True, "https://example.com/0")
+    update_task_progress(REPO["id"], TASKS[1]["id"], True, "https://example.com/1")
+    _backdate(8)
+    update_task_progress(REPO["id"], TASKS[1]["id"], False)
+    update_task_progress(REPO["id"], TASKS[1]["id"], True, "https://example.com/1")
+
+    with get_connection() as conn:
+        assert refresh_daily_rollup(conn) == 4
+        assert refresh_daily_rollup(conn) == 0
+
+    update_task_progress(REPO["id"], TASKS[2]["id"], True, "https://example.com/2")
+    with get_connection() as conn:
+        assert refresh_daily_rollup(conn) == 1
+        rows = conn.execute(
+            "SELECT day, completions, reopenings FROM progress_daily ORDER BY day;"
+        ).fetchall()
+    assert rows == [
+        (today - datetime.timedelta(days=8), 2, 0),
+        (today, 2, 1),
+    ]
+
+    velocity = completion_velocity(days=14)
+    assert len(velocity.points) == 14
+    assert velocity.net_completions == 3
+    assert velocity.points[-1].day == today
+    assert velocity.points[-1].completions == 2
+    # Only today's net completion falls inside the trailing week.
+    assert velocity.points[-1].trailing_average == round(1 / 7, 2)
+
+    weeks = completions_per_period("week")
+    assert sum(week.completions for week in weeks) == 4
+    assert all(week.period_start.weekday() == 0 for week in weeks)
+
+    [repo_time] = time_per_repository()
+    assert repo_time.repository_id == REPO["id"]
+    assert repo_time.span_days == 9
+    assert repo_time.active_days == 2
+    assert (repo_time.completions, repo_time.reopenings) == (4, 1)
+
+
+def test_analytics_routes(client):
+    client.post(
+        f"/api/v1/progress/{REPO['id']}/{TASKS[0]['id']}",
+        json={"completed": True, "link": "https://example.com/0"},
+    )
+
+    velocity = client.get("/api/v1/analytics/velocity", params={"days": 7})
+    assert velocity.status_code == 200
+    assert velocity.json()["net_completions"] == 1
+
+    completions = client.get("/api/v1/analytics/completions", params={"period": "week"})
+    assert completions.status_code == 200
+    assert completions.json()[0]["completions"] == 1
+
+    repositories = client.get("/api/v1/analytics/repositories")
+    assert repositories.json()[0]["repository_id"] == REPO["id"]
+
+    assert client.get("/api/v1/analytics/completions?period=month").status_code == 422
+
+
+def test_reports_do_not_wait_for_progress_writes(fresh_db):
+    update_task_progress(REPO["id"], TASKS[0]["id"], True, "https://example.com/0")
+    completion_velocity()  # folds the event in
+    reports = []
+
+    def read_reports():
+        reports.append(completion_velocity(days=7))
+        reports.append(completions_per_period())
+        reports.append(time_per_repository())
+
+    with get_connection():
+        reader = threading.Thread(target=read_reports)
+        reader.start()
+        reader.join(timeout=10)
+        finished = not reader.is_alive()
+    reader.join()
+
+    assert finished
+    assert reports[2][0].completions == 1
+
+
+class _FailingWatermark:
+    """Proxy a cursor, failing the rollup's watermark update."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def execute(self, query, *args):
+        if "INSERT INTO rollup_watermarks" in query:
+            raise duckdb.Error("watermark update failed")
+        return self._conn.execute(query, *args)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def test_failed_rollup_refresh_rolls_back(fresh_db):
+    update_task_progress(REPO["id"], TASKS[0]["id"], True, "https://example.com/0")
+
+    with get_connection() as conn:
+        with pytest.raises(duckdb.Error):
+            refresh_daily_rollup(_FailingWatermark(conn))
+        # The cursor is usable again and the partial fold is gone.
+        assert conn.execute("SELECT COUNT(*) FROM progress_daily;").fetchone()[0] == 0
+        assert refresh_daily_rollup(conn) == 1
@@ -0,0 +1,104 @@
+"""HTTP-level tests for the progress API."""
+
+from __future__ import annotations
+
+
+def test_update_route_returns_delta(client):
+    summary = client.get("/api/v1/progress").json()
+    repo = summary["stages"][0]["repositories"][0]
+    task = repo["tasks"][0]
+
+    response = client.post(
+        f"/api/v1/progress/{repo['id']}/{task['id']}",
+        json={"completed": True, "link": "https://example.com/work"},
+    )
+
+    assert response.status_code == 200
+    delta = response.json()
+    assert delta["task"]["completed"] is True
+    assert delta["next_task"]["id"] == repo["tasks"][1]["id"]
+    assert delta["next_task"]["enabled"] is True
+    assert delta["repository_progress"]["completed"] == 1
+
+
+def test_update_route_rejects_out_of_order_completion(client):
+    summary = client.get("/api/v1/progress").json()
+    repo = summary["stages"][0]["repositories"][0]
+    task = repo["tasks"][1]
+
+    response = client.post(
+        f"/api/v1/progress/{repo['id']}/{task['id']}",
+        json={"completed": True, "link": "https://example.com/work"},
+    )
+
+    assert response.status_code == 400
+
+
+def test_progress_etag_supports_conditional_get(client):
+    first = client.get("/api/v1/progress")
+    etag = first.headers["ETag"]
+
+    cached = client.get("/api/v1/progress", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    repo = first.json()["stages"][0]["repositories"][0]
+    client.post(
+        f"/api/v1/progress/{repo['id']}/{repo['tasks'][0]['id']}",
+        json={"completed": True, "link": "https://example.com/work"},
+    )
+
+    refreshed = client.get("/api/v1/progress", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["ETag"] != etag
+
+
+def test_batch_route_applies_updates(client):
+    repo = client.get("/api/v1/progress").json()["stages"][0]["repositories"][0]
+    updates = [
+        {
+            "repo_id": repo["id"],
+            "task_id": task["id"],
+            "completed": True,
+            "link": f"https://example.com/{task['id']}",
+        }
+        for task in repo["tasks"][:2]
+    ]
+
+    response = client.post("/api/v1/progress/batch", json={"updates": updates})
+    assert response.status_code == 200
+    assert response.json()["updated"] == 2
+
+    response = client.post("/api/v1/progress/batch", json={"updates": updates[::-1]})
+    assert response.status_code == 200
+
+    response = client.post(
+        "/api/v1/progress/batch",
+        json={"updates": [{**updates[0], "task_id": "missing-task"}]},
+    )
+    assert response.status_code == 400
+
+
+def test_metrics_endpoint_reports_routes_and_queries(client):
+    client.get("/api/v1/progress")
+    client.post(
+        "/api/v1/progress/missing-repo/missing-task",
+        json={"completed": False},
+    )
+
+    response = client.get("/api/v1/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert (
+        'tasktracker_http_request_duration_seconds_count{method="GET",'
+        'route="/progress",status="200"}'
+    ) in body
+    assert 'route="/progress/{repo_id}/{task_id}",status="400"' in body
+    # The metrics request itself is still being served while it renders.
+    assert (
+        'tasktracker_http_requests_in_flight{method="GET",route="/metrics"} 1'
+    ) in body
+    assert 'tasktracker_db_query_duration_seconds_count{query="task_lookup"}' in body
+    assert "tasktracker_db_executor_submitted" in body
@@ -0,0 +1,40 @@
+"""Tests for the benchmark harness."""
+
+from __future__ import annotations
+
+import json
+
+from benchmarks.harness import compare, measure, percentile, write_results
+
+
+def test_percentile_interpolates_inclusive():
+    samples = [float(value) for value in range(1, 101)]
+
+    assert percentile(samples, 50) == 50.5
+    assert percentile(samples, 99) == 99.01
+    assert percentile([3.0], 95) == 3.0
+
+
+def test_measure_runs_setup_untimed_and_compares_to_baseline(tmp_path):
+    calls = {"setup": 0, "fn": 0}
+
+    def setup():
+        calls["setup"] += 1
+
+    def fn():
+        calls["fn"] += 1
+
+    result = measure("noop", 10, fn, iterations=5, setup=setup, warmup=1)
+
+    # One warm-up, five timed calls and one traced call.
+    assert calls == {"setup": 7, "fn": 7}
+    assert result.iterations == 5
+    assert result.p50_ms <= result.p95_ms <= result.p99_ms
+    assert result.ops_per_second > 0
+
+    path = tmp_path / "results.json"
+    write_results(path, [result])
+    payload = json.loads(path.read_text())
+    assert payload["results"][0]["name"] == "noop"
+    assert "commit" in payload["environment"]
+    assert len(compare(path, [result])) == 1
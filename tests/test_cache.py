@@ -0,0 +1,81 @@
+"""Tests for the in-memory progress hierarchy cache."""
+
+from __future__ import annotations
+
+from app.db.cache import ProgressCache, progress_cache
+from app.db.duckdb import get_connection, resolve_db_path
+from app.db.progress import (
+    _query_progress_summary,
+    fetch_progress_json,
+    fetch_progress_summary,
+    update_task_progress,
+)
+from app.models.schemas import ProgressSummary
+
+
+def test_warm_reads_are_cache_hits(fresh_db):
+    before = progress_cache.stats()
+    first = fetch_progress_summary()
+    second = fetch_progress_summary()
+    after = progress_cache.stats()
+
+    assert first is second
+    assert after.misses - before.misses == 1
+    assert after.hits - before.hits == 1
+
+
+def test_updates_patch_cached_summary(fresh_db):
+    summary = fetch_progress_summary()
+    repo = summary.stages[0].repositories[0]
+    update_task_progress(repo.id, repo.tasks[0].id, True, "https://example.com/a")
+    update_task_progress(repo.id, repo.tasks[1].id, True, "https://example.com/b")
+    update_task_progress(repo.id, repo.tasks[0].id, False)
+
+    with get_connection(read_only=True) as conn:
+        assert fetch_progress_summary() == _query_progress_summary(conn)
+
+
+def test_entries_expire_and_evict():
+    now = [0.0]
+    cache = ProgressCache(max_entries=1, ttl_seconds=10, clock=lambda: now[0])
+    summary = ProgressSummary(stages=[], overall_progress=0)
+
+    cache.put("a", summary, 1)
+    assert cache.get("a") is summary
+    assert cache.get("a", 2) is None
+
+    cache.put("a", summary, 1)
+    now[0] = 10.0
+    assert cache.get("a") is None
+
+    cache.put("a", summary, 1)
+    cache.put("b", summary, 1)
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert stats.entries == 1
+    assert stats.evictions == 1
+
+
+def test_patch_drops_entries_that_missed_a_write(fresh_db):
+    summary = fetch_progress_summary()
+    repo = summary.stages[0].repositories[0]
+    key = str(resolve_db_path())
+
+    assert progress_cache.patch_task(key, repo.tasks[0].id, True, "x", 99) is None
+    assert progress_cache.get(key) is None
+
+
+def test_serialized_payload_is_reused_until_a_write(fresh_db):
+    version, payload = fetch_progress_json()
+    again_version, again = fetch_progress_json()
+    assert again is payload
+    assert again_version == version
+    assert ProgressSummary.model_validate_json(payload) == fetch_progress_summary()
+
+    repo = fetch_progress_summary().stages[0].repositories[0]
+    update_task_progress(repo.id, repo.tasks[0].id, True, "https://example.com/a")
+
+    new_version, refreshed = fetch_progress_json()
+    assert new_version == version + 1
+    summary = ProgressSummary.model_validate_json(refreshed)
+    assert summary.stages[0].repositories[0].tasks[0].completed is True
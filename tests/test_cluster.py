@@ -0,0 +1,180 @@
+"""Tests for serving from worker processes in front of a database owner."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing.connection import Client
+
+import pytest
+
+from app.cluster import OWNER_AUTHKEY_ENV, OWNER_SOCKET_ENV, OwnerClient, OwnerServer
+from app.data.checklist import STAGES
+from app.db.duckdb import bump_data_version, get_connection
+from app.db.progress import TaskUpdate
+from app.db.writer import write_update
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = STAGES[0]["repositories"][0]
+TASKS = REPO["tasks"]
+LINK = "https://example.com/work"
+AUTHKEY = b"test-owner-key"
+
+
+@pytest.fixture()
+def owner(tmp_path, monkeypatch):
+    """Run ``python -m app.cluster`` on a temporary database; yield its socket."""
+    address = str(tmp_path / "owner.sock")
+    monkeypatch.setenv("TASKTRACKER_DB_PATH", str(tmp_path / "owner.duckdb"))
+    monkeypatch.setenv(OWNER_AUTHKEY_ENV, AUTHKEY.hex())
+    process = subprocess.Popen(
+        [sys.executable, "-m", "app.cluster", "--socket", address],
+        cwd=ROOT_DIR,
+        env=dict(os.environ),
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while not os.path.exists(address):
+            assert process.poll() is None, "owner process exited"
+            assert time.monotonic() < deadline, "owner did not start listening"
+            time.sleep(0.05)
+        yield address
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def _other_worker(address: str) -> OwnerClient:
+    other = OwnerClient(address, AUTHKEY)
+    other.connect()
+    return other
+
+
+def test_worker_serves_reads_locally_and_sees_other_workers_writes(
+    owner, monkeypatch
+):
+    from fastapi.testclient import TestClient
+
+    from app import cluster
+    from app.main import app
+
+    monkeypatch.setenv(OWNER_SOCKET_ENV, owner)
+    other = _other_worker(owner)
+    base = f"/api/v1/progress/{REPO['id']}"
+    try:
+        with TestClient(app) as client:
+            response = client.post(
+                f"{base}/{TASKS[0]['id']}",
+                json={"completed": True, "link": LINK},
+            )
+            assert response.status_code == 200
+            locked = client.post(
+                f"{base}/{TASKS[2]['id']}",
+                json={"completed": True, "link": LINK},
+            )
+            assert locked.status_code == 400
+
+            # The worker sees its own write, then serves repeats from memory.
+            first = client.get("/api/v1/progress")
+            calls = cluster.owner_client.stats().calls
+            second = client.get("/api/v1/progress")
+            assert cluster.owner_client.stats().calls == calls
+            assert second.content == first.content
+            assert first.json()["stages"][0]["repositories"][0]["tasks"][0]["completed"]
+
+            # A write through another worker reaches this one as a notice.
+            other.call(write_update, TaskUpdate(REPO["id"], TASKS[1]["id"], True, LINK))
+            deadline = time.monotonic() + 5
+            while (latest := client.get("/api/v1/progress")).headers["etag"] == (
+                first.headers["etag"]
+            ):
+                assert time.monotonic() < deadline, "no version notice arrived"
+                time.sleep(0.01)
+            tasks = latest.json()["stages"][0]["repositories"][0]["tasks"]
+            assert [task["completed"] for task in tasks[:2]] == [True, True]
+
+            records = client.get("/api/v1/progress", params={"format": "ndjson"})
+            assert records.headers["etag"] == latest.headers["etag"]
+            assert records.text.count("\n") > 1
+        assert cluster.owner_client is None
+    finally:
+        other.close()
+
+
+def test_owner_relays_progress_events_to_every_worker(owner):
+    received = threading.Event()
+    events = []
+
+    def on_event(*event):
+        events.append(event)
+        received.set()
+
+    sender = _other_worker(owner)
+    listener = OwnerClient(owner, AUTHKEY, on_event=on_event)
+    listener.connect()
+    try:
+        sender.publish("delta", {"task": 1}, None, "alice")
+        assert received.wait(5)
+    finally:
+        sender.close()
+        listener.close()
+
+    assert events == [("delta", {"task": 1}, None, "alice")]
+
+
+def test_owner_publishes_committed_deltas_to_every_worker(owner):
+    received = threading.Event()
+    events = []
+
+    def on_event(*event):
+        events.append(event)
+        received.set()
+
+    writer = _other_worker(owner)
+    listener = OwnerClient(owner, AUTHKEY, on_event=on_event)
+    listener.connect()
+    try:
+        delta = writer.call(write_update, TaskUpdate(REPO["id"], TASKS[0]["id"], True, LINK))
+        assert received.wait(5)
+    finally:
+        writer.close()
+        listener.close()
+
+    assert events == [("delta", delta.model_dump(mode="json"), None, "default")]
+
+
+def test_commit_under_a_lease_held_across_an_announce_is_announced(fresh_db, tmp_path):
+    server = OwnerServer(str(tmp_path / "owner.sock"), AUTHKEY)
+    server.start()
+    subscription = Client(server.address, "AF_UNIX", authkey=AUTHKEY)
+    caller = Client(server.address, "AF_UNIX", authkey=AUTHKEY)
+    read_alice = ("call", "app.db.progress", "get_data_version", ("alice",), {}, None)
+    try:
+        subscription.send(("subscribe",))
+        assert subscription.recv()[0] == "subscribed"
+        caller.send(read_alice)
+        caller.recv()
+        while subscription.poll(0.2):
+            subscription.recv()  # versions written by seeding
+
+        with get_connection() as conn:
+            conn.begin()
+            version = bump_data_version(conn, "bob")
+            # Another call announces while bob's write is still uncommitted.
+            caller.send(read_alice)
+            caller.recv()
+            conn.commit()
+        caller.send(read_alice)
+        caller.recv()
+
+        assert subscription.poll(5), "bob's commit was never announced"
+        kind, _, _, rows = subscription.recv()
+        assert kind == "versions"
+        assert ("bob", version) in rows
+    finally:
+        caller.close()
+        subscription.close()
+        server.close()
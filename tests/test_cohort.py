@@ -0,0 +1,164 @@
+"""Tests for cohort analytics over every user's progress."""
+
+from __future__ import annotations
+
+import threading
+
+from app.data.checklist import STAGES
+from app.db.cohort import cohort_report, refresh_cohort_rollup, reset_cohort_rollup
+from app.db.duckdb import get_connection
+from app.db.progress import TaskUpdate, apply_progress_batch, update_task_progress
+
+REPO = STAGES[0]["repositories"][0]
+TASKS = REPO["tasks"]
+
+
+def _complete(user_id: str, count: int) -> None:
+    apply_progress_batch(
+        [
+            TaskUpdate(REPO["id"], task["id"], True, f"https://example.com/{task['id']}")
+            for task in TASKS[:count]
+        ],
+        user_id,
+    )
+
+
+def _summaries():
+    with get_connection(read_only=True) as conn:
+        tasks = conn.execute(
+            """
+            SELECT task_id, completed_users FROM cohort_task_stats
+            WHERE completed_users <> 0
+            ORDER BY task_id;
+            """
+        ).fetchall()
+        repos = conn.execute(
+            """
+            SELECT user_id, repository_id, completed, finished_at IS NOT NULL
+            FROM cohort_user_repos
+            ORDER BY user_id, repository_id;
+            """
+        ).fetchall()
+    return tasks, repos
+
+
+def test_report_counts_distribution_and_drop_off(fresh_db):
+    _complete("alice", 2)
+    _complete("bob", 1)
+    _complete("carol", len(TASKS))
+
+    report = cohort_report()
+
+    assert report.users == 3
+    repo = next(repo for repo in report.repositories if repo.id == REPO["id"])
+    assert repo.started_users == 3
+    assert repo.completed_users == 1
+    assert repo.distribution[1] == 1
+    assert repo.distribution[2] == 1
+    assert repo.distribution[len(TASKS)] == 1
+    assert repo.median_hours_to_complete is not None
+
+    tasks = [task for task in report.tasks if task.repository_id == REPO["id"]]
+    assert [task.completed_users for task in tasks[:3]] == [3, 2, 1]
+    assert [task.drop_off for task in tasks[:3]] == [0, 1, 1]
+    assert tasks[0].completion_rate == 100.0
+
+    stage = report.stages[0]
+    assert stage.started_users == 3
+    assert 0 < stage.average_progress < 100
+
+
+def test_refresh_folds_only_new_events(fresh_db):
+    _complete("alice", 2)
+    with get_connection() as conn:
+        refresh_cohort_rollup(conn)
+        assert refresh_cohort_rollup(conn) == 0
+
+    update_task_progress(
+        REPO["id"], TASKS[2]["id"], True, "https://example.com/x", "alice"
+    )
+
+    with get_connection() as conn:
+        assert refresh_cohort_rollup(conn) == 1
+
+
+def test_incremental_refresh_matches_rebuild(fresh_db):
+    with get_connection() as conn:
+        refresh_cohort_rollup(conn)
+    _complete("alice", len(TASKS))
+    _complete("bob", 3)
+    update_task_progress(REPO["id"], TASKS[-1]["id"], False, None, "alice")
+    update_task_progress(REPO["id"], TASKS[0]["id"], False, None, "bob")
+    update_task_progress(
+        REPO["id"], TASKS[0]["id"], True, "https://example.com/y", "bob"
+    )
+    _complete("carol", 1)
+    update_task_progress(REPO["id"], TASKS[0]["id"], False, None, "carol")
+    with get_connection() as conn:
+        refresh_cohort_rollup(conn)
+    incremental = _summaries()
+
+    with get_connection() as conn:
+        reset_cohort_rollup(conn)
+        refresh_cohort_rollup(conn)
+
+    assert _summaries() == incremental
+    assert [(user, done) for user, _, done, _ in incremental[1]] == [
+        ("alice", len(TASKS) - 1),
+        ("bob", 3),
+    ]
+
+
+def test_recompletion_times_match_rebuild(fresh_db):
+    _complete("alice", len(TASKS))
+    _complete("bob", 1)
+    with get_connection() as conn:
+        refresh_cohort_rollup(conn)
+    # Reopened and re-completed in a later fold than the first completion.
+    for user_id, task in (("alice", TASKS[-1]), ("bob", TASKS[0])):
+        update_task_progress(REPO["id"], task["id"], False, None, user_id)
+        update_task_progress(REPO["id"], task["id"], True, "https://example.com/z", user_id)
+
+    def user_repos():
+        with get_connection() as conn:
+            refresh_cohort_rollup(conn)
+            return conn.execute(
+                """
+                SELECT user_id, repository_id, completed, started_at, finished_at
+                FROM cohort_user_repos
+                ORDER BY user_id, repository_id;
+                """
+            ).fetchall()
+
+    incremental = user_repos()
+    with get_connection() as conn:
+        reset_cohort_rollup(conn)
+    rebuilt = user_repos()
+
+    assert incremental == rebuilt
+    assert cohort_report().repositories[0].median_hours_to_complete is not None
+
+
+def test_cohort_route(client):
+    _complete("alice", 1)
+
+    response = client.get("/api/v1/analytics/cohort")
+
+    assert response.status_code == 200
+    assert response.json()["users"] == 1
+
+
+def test_report_does_not_wait_for_progress_writes(fresh_db):
+    _complete("alice", 2)
+    cohort_report()  # builds the summaries
+    reports = []
+
+    with get_connection():
+        reader = threading.Thread(target=lambda: reports.append(cohort_report()))
+        reader.start()
+        reader.join(timeout=10)
+        finished = not reader.is_alive()
+    reader.join()
+
+    assert finished
+    assert reports[0].users == 1
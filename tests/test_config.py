@@ -0,0 +1,22 @@
+"""Tests for environment-variable settings."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.config import env_float, env_int
+
+
+def test_env_numbers_fall_back_when_unset_or_empty(monkeypatch):
+    monkeypatch.delenv("TASKTRACKER_TEST_SETTING", raising=False)
+    assert env_int("TASKTRACKER_TEST_SETTING", 3) == 3
+    monkeypatch.setenv("TASKTRACKER_TEST_SETTING", "")
+    assert env_float("TASKTRACKER_TEST_SETTING", 1.5) == 1.5
+
+    monkeypatch.setenv("TASKTRACKER_TEST_SETTING", "7")
+    assert env_int("TASKTRACKER_TEST_SETTING", 3) == 7
+    assert env_float("TASKTRACKER_TEST_SETTING", 1.5) == 7.0
+
+    monkeypatch.setenv("TASKTRACKER_TEST_SETTING", "seven")
+    with pytest.raises(ValueError):
+        env_int("TASKTRACKER_TEST_SETTING", 3)
@@ -0,0 +1,106 @@
+"""Tests for the pooled DuckDB connection manager."""
+
+from __future__ import annotations
+
+from app.db.duckdb import (
+    DEFAULT_USER_ID,
+    SCHEMA_STATEMENTS,
+    SCHEMA_VERSION,
+    close_connection_pool,
+    connection_pool_stats,
+    get_connection,
+    get_connection_manager,
+    init_db,
+    read_schema_version,
+)
+
+
+def test_reader_cursors_are_reused(fresh_db):
+    with get_connection(read_only=True) as conn:
+        conn.execute("SELECT COUNT(*) FROM stages;").fetchone()
+    with get_connection(read_only=True) as conn:
+        conn.execute("SELECT COUNT(*) FROM stages;").fetchone()
+
+    stats = connection_pool_stats()
+    assert stats is not None
+    assert stats.readers_created == 1
+    assert stats.readers_idle == 1
+    assert stats.readers_in_use == 0
+    assert stats.reader_leases >= 2
+
+
+def test_readers_see_committed_writes(fresh_db):
+    with get_connection(read_only=True) as reader:
+        with get_connection() as writer:
+            writer.execute("UPDATE stages SET title = 'Renamed' WHERE ordering = 1;")
+        title = reader.execute(
+            "SELECT title FROM stages WHERE ordering = 1;"
+        ).fetchone()[0]
+    assert title == "Renamed"
+
+
+def test_failed_write_is_rolled_back(fresh_db):
+    try:
+        with get_connection() as conn:
+            conn.begin()
+            conn.execute("UPDATE stages SET title = 'Broken';")
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    with get_connection(read_only=True) as conn:
+        titles = {row[0] for row in conn.execute("SELECT title FROM stages;").fetchall()}
+    assert "Broken" not in titles
+
+
+def test_manager_follows_db_path_override(fresh_db, tmp_path, monkeypatch):
+    first = get_connection_manager()
+    monkeypatch.setenv("TASKTRACKER_DB_PATH", str(tmp_path / "other.duckdb"))
+    second = get_connection_manager()
+
+    assert second is not first
+    assert not first.is_open
+    close_connection_pool()
+    assert connection_pool_stats() is None
+
+
+def test_current_schema_skips_migrations(fresh_db):
+    with get_connection() as conn:
+        assert read_schema_version(conn) == SCHEMA_VERSION
+        conn.execute("DROP TABLE repository_frontier;")
+
+    # A current database is not migrated again, so the table stays dropped.
+    assert init_db() == SCHEMA_VERSION
+    with get_connection() as conn:
+        rows = conn.execute("SELECT table_name FROM duckdb_tables();").fetchall()
+    assert "repository_frontier" not in {row[0] for row in rows}
+
+
+def test_unversioned_database_is_migrated(tmp_path, monkeypatch):
+    monkeypatch.setenv("TASKTRACKER_DB_PATH", str(tmp_path / "legacy.duckdb"))
+    try:
+        with get_connection() as conn:
+            for statement in SCHEMA_STATEMENTS[:4]:
+                conn.execute(statement)
+            conn.execute("INSERT INTO stages VALUES ('s', 'Stage', NULL, 1);")
+            conn.execute("INSERT INTO repositories VALUES ('r', 's', 'Repo', NULL, 1);")
+            conn.execute("INSERT INTO tasks VALUES ('t', 'r', 'Task', NULL, 1);")
+            conn.execute(
+                "INSERT INTO task_progress (task_id, completed) VALUES ('t', FALSE);"
+            )
+            assert read_schema_version(conn) == 0
+
+        assert init_db() == SCHEMA_VERSION
+
+        with get_connection() as conn:
+            assert read_schema_version(conn) == SCHEMA_VERSION
+            frontier = conn.execute(
+                "SELECT user_id, frontier_ordering FROM repository_frontier;"
+            ).fetchall()
+            assert frontier == [(DEFAULT_USER_ID, 1)]
+            progress = conn.execute(
+                "SELECT user_id, task_id FROM task_progress;"
+            ).fetchall()
+            assert progress == [(DEFAULT_USER_ID, "t")]
+    finally:
+        close_connection_pool()
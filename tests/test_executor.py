@@ -0,0 +1,57 @@
+"""Tests for the DB offload executor."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from app.db.executor import DatabaseBusyError, DatabaseExecutor
+
+
+def test_blocking_calls_do_not_stall_the_loop():
+    executor = DatabaseExecutor(workers=1, max_pending=1)
+    release = threading.Event()
+
+    async def scenario():
+        slow = asyncio.create_task(executor.run(release.wait, 5))
+        # The loop keeps serving other coroutines while the DB call blocks.
+        await asyncio.sleep(0.05)
+        assert not slow.done()
+        assert executor.stats().running == 1
+        release.set()
+        return await slow
+
+    try:
+        assert asyncio.run(scenario()) is True
+    finally:
+        executor.shutdown()
+
+    stats = executor.stats()
+    assert stats.completed == 1
+    assert stats.pending == 0
+
+
+def test_queue_is_bounded():
+    executor = DatabaseExecutor(workers=1, max_pending=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.create_task(executor.run(release.wait, 5))
+        queued = asyncio.create_task(executor.run(release.wait, 5))
+        await asyncio.sleep(0.05)
+        with pytest.raises(DatabaseBusyError):
+            await executor.run(release.wait, 5)
+        release.set()
+        await asyncio.gather(running, queued)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+    stats = executor.stats()
+    assert stats.rejected == 1
+    assert stats.completed == 2
+    assert stats.wait_seconds_max > 0
@@ -0,0 +1,65 @@
+"""Tests for the materialized unlock frontier."""
+
+from __future__ import annotations
+
+from app.db.duckdb import get_connection
+from app.db.frontier import rebuild_frontier
+from app.db.progress import (
+    TaskUpdate,
+    apply_progress_batch,
+    fetch_progress_summary,
+    update_task_progress,
+)
+
+
+def _frontiers() -> dict[str, int | None]:
+    with get_connection(read_only=True) as conn:
+        return dict(
+            conn.execute(
+                "SELECT repository_id, frontier_ordering FROM repository_frontier;"
+            ).fetchall()
+        )
+
+
+def _rebuilt_frontiers() -> dict[str, int | None]:
+    with get_connection() as conn:
+        conn.begin()
+        rebuild_frontier(conn)
+        rows = dict(
+            conn.execute(
+                "SELECT repository_id, frontier_ordering FROM repository_frontier;"
+            ).fetchall()
+        )
+        conn.rollback()
+    return rows
+
+
+def test_frontier_tracks_single_updates(fresh_db):
+    repo = fetch_progress_summary().stages[0].repositories[1]
+    tasks = repo.tasks
+
+    assert _frontiers()[repo.id] == tasks[0].ordering
+    update_task_progress(repo.id, tasks[0].id, True, "https://example.com/0")
+    update_task_progress(repo.id, tasks[1].id, True, "https://example.com/1")
+    assert _frontiers()[repo.id] == tasks[2].ordering
+
+    update_task_progress(repo.id, tasks[0].id, False)
+    assert _frontiers()[repo.id] == tasks[0].ordering
+
+    # Re-completing the first task skips over the already completed second.
+    update_task_progress(repo.id, tasks[0].id, True, "https://example.com/0")
+    assert _frontiers() == _rebuilt_frontiers()
+    assert _frontiers()[repo.id] == tasks[2].ordering
+
+
+def test_frontier_is_none_when_repository_is_complete(fresh_db):
+    repo = fetch_progress_summary().stages[0].repositories[0]
+    apply_progress_batch(
+        [
+            TaskUpdate(repo.id, task.id, True, f"https://example.com/{task.id}")
+            for task in repo.tasks
+        ]
+    )
+
+    assert _frontiers()[repo.id] is None
+    assert _frontiers() == _rebuilt_frontiers()
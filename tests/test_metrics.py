@@ -0,0 +1,40 @@
+"""Tests for the in-process metrics registry."""
+
+from __future__ import annotations
+
+from app.metrics import Histogram, MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("demo_seconds", "Demo.", ("query",), buckets=(0.01, 0.1))
+    histogram.observe(0.005, query="a")
+    histogram.observe(0.05, query="a")
+    histogram.observe(5.0, query="a")
+
+    lines = histogram.render()
+
+    assert 'demo_seconds_bucket{query="a",le="0.01"} 1' in lines
+    assert 'demo_seconds_bucket{query="a",le="0.1"} 2' in lines
+    assert 'demo_seconds_bucket{query="a",le="+Inf"} 3' in lines
+    assert 'demo_seconds_count{query="a"} 3' in lines
+    assert histogram.count(query="a") == 3
+
+
+def test_registry_tracks_in_flight_requests_and_stats():
+    metrics = MetricsRegistry()
+    metrics.register_stats("demo", lambda: {"depth": 2, "open": True, "path": "x"})
+    scope = {"type": "http", "method": "GET"}
+
+    metrics.request_started(scope)
+    assert metrics.in_flight() == {("GET", "unmatched"): 1}
+    with metrics.query_duration.time(query="summary_join"):
+        pass
+    rendered = metrics.render()
+    metrics.request_finished(scope)
+
+    assert (
+        'tasktracker_db_query_duration_seconds_count{query="summary_join"} 1'
+    ) in rendered
+    assert "tasktracker_demo_depth 2" in rendered
+    assert "tasktracker_demo_open" not in rendered
+    assert metrics.in_flight() == {}
@@ -0,0 +1,161 @@
+"""Tests for the streamed NDJSON progress records."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+from app.data.synthetic import RoadmapSpec, seed_roadmap
+from app.db import ndjson
+from app.db.duckdb import DEFAULT_READER_POOL_SIZE, connection_pool_stats
+from app.db.executor import DatabaseBusyError
+from app.db.ndjson import ProgressRecordStream
+from app.db.progress import fetch_progress_summary, get_data_version
+from app.metrics import registry
+
+
+def _records(chunk_rows: int) -> list[dict]:
+    stream = ProgressRecordStream(chunk_rows)
+    lines = []
+    while (chunk := stream.next_chunk()) is not None:
+        lines.extend(chunk.decode().splitlines())
+    return [json.loads(line) for line in lines]
+
+
+def _rebuild(records: list[dict]) -> dict:
+    """Nest the flat records back into a ``ProgressSummary`` payload."""
+    summary, *rest = records
+    stages: list[dict] = []
+    for record in rest:
+        kind = record.pop("type")
+        if kind == "stage":
+            stages.append({**record, "repositories": []})
+        else:
+            stages[-1]["repositories"].append(record)
+    return {"stages": stages, "overall_progress": summary["overall_progress"]}
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 7, 10_000])
+def test_records_match_the_summary(tmp_path, monkeypatch, chunk_rows):
+    monkeypatch.setenv("TASKTRACKER_DB_PATH", str(tmp_path / "roadmap.duckdb"))
+    seed_roadmap(RoadmapSpec(stages=3, repos_per_stage=4, tasks_per_repo=5, completion=0.5))
+
+    records = _records(chunk_rows)
+
+    assert records[0] == {
+        "type": "summary",
+        "version": get_data_version(),
+        "overall_progress": fetch_progress_summary().overall_progress,
+    }
+    assert [r["type"] for r in records[1:6]] == ["stage"] + ["repository"] * 4
+    assert _rebuild(records) == fetch_progress_summary().model_dump(mode="json")
+
+
+def test_closing_early_releases_the_cursor(fresh_db):
+    stream = ProgressRecordStream(chunk_rows=1)
+    assert stream.next_chunk().startswith(b'{"type":"summary"')
+    stream.close()
+    stream.close()
+
+    assert stream.next_chunk() is None
+    assert _records(64)[0]["type"] == "summary"
+
+
+def test_records_query_runs_after_the_summary_is_sent(fresh_db):
+    queries = registry.query_duration.count(query="records_query")
+    stream = ProgressRecordStream(chunk_rows=1)
+
+    assert stream.next_chunk().count(b"\n") == 1
+    assert registry.query_duration.count(query="records_query") == queries
+
+    assert json.loads(stream.next_chunk())["type"] == "stage"
+    assert registry.query_duration.count(query="records_query") == queries + 1
+    stream.close()
+
+
+def test_open_streams_leave_the_reader_pool_free(fresh_db, monkeypatch):
+    open_streams = DEFAULT_READER_POOL_SIZE + 1
+    monkeypatch.setattr(ndjson, "_stream_slots", threading.BoundedSemaphore(open_streams))
+    streams = [ProgressRecordStream(chunk_rows=1) for _ in range(open_streams)]
+    for stream in streams:
+        stream.next_chunk()
+        stream.next_chunk()
+    assert connection_pool_stats().stream_readers == open_streams
+
+    assert fetch_progress_summary().stages
+
+    for stream in streams:
+        stream.close()
+    assert connection_pool_stats().stream_readers == 0
+
+
+def test_streams_beyond_the_cap_are_refused(fresh_db, monkeypatch):
+    monkeypatch.setattr(ndjson, "_stream_slots", threading.BoundedSemaphore(2))
+    first, second = ProgressRecordStream(), ProgressRecordStream()
+
+    with pytest.raises(DatabaseBusyError):
+        ProgressRecordStream()
+
+    first.close()
+    third = ProgressRecordStream()
+    assert third.next_chunk().startswith(b'{"type":"summary"')
+    second.close()
+    third.close()
+
+
+def test_progress_route_streams_ndjson(client):
+    response = client.get("/api/v1/progress", params={"format": "ndjson"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["etag"] == f'"{get_data_version()}"'
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert _rebuild(records) == client.get("/api/v1/progress").json()
+
+    cached = client.get(
+        "/api/v1/progress",
+        params={"format": "ndjson"},
+        headers={"If-None-Match": response.headers["etag"]},
+    )
+    assert cached.status_code == 304
+
+
+def test_unread_responses_release_their_streams(client, monkeypatch):
+    from starlette.requests import ClientDisconnect
+
+    from app.main import app
+
+    monkeypatch.setattr(ndjson, "_stream_slots", threading.BoundedSemaphore(2))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/v1/progress",
+        "raw_path": b"/api/v1/progress",
+        "query_string": b"format=ndjson",
+        "root_path": "",
+        "headers": [],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        # The client is gone before the body is read at all.
+        raise OSError("connection reset")
+
+    # More abandoned requests than there are slots.
+    for _ in range(3):
+        with pytest.raises(ClientDisconnect):
+            asyncio.run(app(scope, receive, send))
+
+    assert connection_pool_stats().stream_readers == 0
+    response = client.get("/api/v1/progress", params={"format": "ndjson"})
+    assert response.status_code == 200
@@ -4,8 +4,12 @@ from __future__ import annotations
 
 import pytest
 
+from app.db.duckdb import get_connection
 from app.db.progress import (
+    SUMMARY_ENGINES,
     ProgressValidationError,
+    TaskUpdate,
+    apply_progress_batch,
     fetch_progress_summary,
     update_task_progress,
 )
@@ -46,3 +50,79 @@ def test_link_required_for_completion(fresh_db):
     with pytest.raises(ProgressValidationError):
         update_task_progress(repo.id, first_task.id, True, "")
 
+
+def test_update_returns_delta(fresh_db):
+    summary = fetch_progress_summary()
+    stage = summary.stages[0]
+    repo = stage.repositories[0]
+    first_task, second_task = repo.tasks[0], repo.tasks[1]
+
+    delta = update_task_progress(repo.id, first_task.id, True, "https://example.com/first")
+
+    assert delta.task.id == first_task.id
+    assert delta.task.completed is True
+    assert delta.next_task is not None
+    assert delta.next_task.id == second_task.id
+    assert delta.next_task.enabled is True
+    assert delta.repository_id == repo.id
+    assert delta.repository_progress.completed == 1
+    assert delta.stage_id == stage.id
+    assert delta.stage_progress.completed == 1
+    assert delta.overall_progress == fetch_progress_summary().overall_progress
+
+    delta = update_task_progress(repo.id, first_task.id, False)
+    assert delta.next_task is not None
+    assert delta.next_task.enabled is False
+
+
+def test_batch_applies_ordered_chain(fresh_db):
+    repo = fetch_progress_summary().stages[0].repositories[0]
+    first, second, third = repo.tasks[:3]
+
+    result = apply_progress_batch(
+        [
+            TaskUpdate(repo.id, first.id, True, "https://example.com/1"),
+            TaskUpdate(repo.id, second.id, True, "https://example.com/2"),
+            TaskUpdate(repo.id, third.id, True, "https://example.com/3"),
+            TaskUpdate(repo.id, third.id, False),
+        ]
+    )
+
+    assert result.updated == 3
+    repo = fetch_progress_summary().stages[0].repositories[0]
+    assert [task.completed for task in repo.tasks[:4]] == [True, True, False, False]
+    assert repo.tasks[2].enabled is True
+    assert repo.tasks[2].link is None
+
+
+def test_batch_is_rejected_as_a_whole(fresh_db):
+    repo = fetch_progress_summary().stages[0].repositories[0]
+    first, second, third = repo.tasks[:3]
+
+    with pytest.raises(ProgressValidationError, match="Update 2"):
+        apply_progress_batch(
+            [
+                TaskUpdate(repo.id, first.id, True, "https://example.com/1"),
+                TaskUpdate(repo.id, third.id, True, "https://example.com/3"),
+            ]
+        )
+
+    repo = fetch_progress_summary().stages[0].repositories[0]
+    assert not any(task.completed for task in repo.tasks)
+
+
+def test_sql_engine_matches_python_engine(fresh_db):
+    repo = fetch_progress_summary().stages[0].repositories[0]
+    apply_progress_batch(
+        [
+            TaskUpdate(repo.id, repo.tasks[0].id, True, "https://example.com/1"),
+            TaskUpdate(repo.id, repo.tasks[1].id, True, "https://example.com/2"),
+            TaskUpdate(repo.id, repo.tasks[2].id, True, "https://example.com/3"),
+            TaskUpdate(repo.id, repo.tasks[1].id, False),
+        ]
+    )
+
+    with get_connection(read_only=True) as conn:
+        python_summary = SUMMARY_ENGINES["python"](conn)
+        sql_summary = SUMMARY_ENGINES["sql"](conn)
+    assert sql_summary == python_summary
@@ -0,0 +1,161 @@
+"""Tests for seeding the static checklist."""
+
+from __future__ import annotations
+
+import copy
+import sys
+
+import pytest
+
+from app.data.checklist import STAGES
+from app.db.duckdb import close_connection_pool, get_connection, init_db
+from app.db.seeder import seed_static_data
+
+
+def test_bulk_seed_loads_every_row(tmp_path, monkeypatch):
+    monkeypatch.setenv("TASKTRACKER_DB_PATH", str(tmp_path / "seed.duckdb"))
+    init_db()
+    try:
+        report = seed_static_data()
+
+        repos = [repo for stage in STAGES for repo in stage["repositories"]]
+        tasks = [task for repo in repos for task in repo["tasks"]]
+        assert report.seeded is True
+        assert (report.stages, report.repositories, report.tasks) == (
+            len(STAGES),
+            len(repos),
+            len(tasks),
+        )
+
+        with get_connection(read_only=True) as conn:
+            counts = conn.execute(
+                """
+                SELECT
+                    (SELECT COUNT(*) FROM stages),
+                    (SELECT COUNT(*) FROM repositories),
+                    (SELECT COUNT(*) FROM tasks),
+                    (SELECT COUNT(*) FROM task_progress WHERE NOT completed);
+                """
+            ).fetchone()
+        assert counts == (len(STAGES), len(repos), len(tasks), len(tasks))
+
+        assert seed_static_data().seeded is False
+    finally:
+        close_connection_pool()
+
+
+def test_changed_checklist_is_diffed_in_place(fresh_db, monkeypatch):
+    from app.db.progress import fetch_progress_summary, update_task_progress
+
+    repo = STAGES[0]["repositories"][0]
+    first_task = repo["tasks"][0]
+    update_task_progress(repo["id"], first_task["id"], True, "https://example.com/1")
+
+    stages = copy.deepcopy(STAGES)
+    removed_stage = stages.pop()
+    tasks = stages[0]["repositories"][0]["tasks"]
+    tasks[0]["title"] = "Renamed first task"
+    removed_task = tasks.pop()
+    tasks.append(
+        {
+            "id": "python-fundamentals-new-task",
+            "title": "New task",
+            "description": None,
+            "ordering": 99,
+        }
+    )
+    monkeypatch.setattr("app.data.checklist.STAGES", stages)
+
+    report = seed_static_data()
+
+    assert report.seeded is True
+    assert report.diff["tasks"].updated == [first_task["id"]]
+    assert report.diff["tasks"].added == ["python-fundamentals-new-task"]
+    assert removed_task["id"] in report.diff["tasks"].removed
+    assert report.diff["stages"].removed == [removed_stage["id"]]
+
+    summary = fetch_progress_summary()
+    assert [stage.id for stage in summary.stages] == [stage["id"] for stage in stages]
+    task = summary.stages[0].repositories[0].tasks[0]
+    assert task.title == "Renamed first task"
+    assert task.completed is True
+    assert summary.stages[0].repositories[0].tasks[-1].id == "python-fundamentals-new-task"
+
+    assert seed_static_data().seeded is False
+
+
+def test_reparented_rows_keep_their_progress(fresh_db, monkeypatch):
+    from app.db.progress import fetch_progress_summary, update_task_progress
+
+    moved_repo = STAGES[1]["repositories"][0]
+    moved_task = moved_repo["tasks"][0]
+    update_task_progress(moved_repo["id"], moved_task["id"], True, "https://example.com/m")
+
+    stages = copy.deepcopy(STAGES)
+    repo = stages[1]["repositories"].pop(0)
+    repo["stage_id"] = stages[0]["id"]
+    repo["ordering"] = 99
+    stages[0]["repositories"].append(repo)
+    monkeypatch.setattr("app.data.checklist.STAGES", stages)
+
+    report = seed_static_data()
+
+    assert report.diff["repositories"].moved == [moved_repo["id"]]
+    assert set(report.diff["tasks"].moved) == {task["id"] for task in moved_repo["tasks"]}
+    relocated = fetch_progress_summary().stages[0].repositories[-1]
+    assert relocated.id == moved_repo["id"]
+    assert relocated.tasks[0].completed is True
+    assert relocated.tasks[0].link == "https://example.com/m"
+
+
+def test_progress_stashed_by_an_interrupted_sync_is_restored(fresh_db, monkeypatch):
+    from app.db import seeder
+    from app.db.progress import fetch_progress_summary, update_task_progress
+
+    moved_repo = STAGES[1]["repositories"][0]
+    moved_task = moved_repo["tasks"][0]
+    update_task_progress(moved_repo["id"], moved_task["id"], True, "https://example.com/m")
+
+    stages = copy.deepcopy(STAGES)
+    repo = stages[1]["repositories"].pop(0)
+    repo["stage_id"] = stages[0]["id"]
+    repo["ordering"] = 99
+    stages[0]["repositories"].append(repo)
+    monkeypatch.setattr("app.data.checklist.STAGES", stages)
+
+    def crash(*args):
+        raise RuntimeError("crashed between detach and attach")
+
+    attach_rows = seeder._attach_rows
+    monkeypatch.setattr(seeder, "_attach_rows", crash)
+    with pytest.raises(RuntimeError):
+        seed_static_data()
+    with get_connection(read_only=True) as conn:
+        assert conn.execute(
+            "SELECT task_id, link FROM task_progress_stash WHERE completed;"
+        ).fetchall() == [(moved_task["id"], "https://example.com/m")]
+
+    # The next startup re-diffs and restores the stash.
+    monkeypatch.setattr(seeder, "_attach_rows", attach_rows)
+    assert seed_static_data().seeded is True
+
+    relocated = fetch_progress_summary().stages[0].repositories[-1]
+    assert relocated.id == moved_repo["id"]
+    assert relocated.tasks[0].completed is True
+    assert relocated.tasks[0].link == "https://example.com/m"
+    with get_connection(read_only=True) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM task_progress_stash;").fetchone()[0] == 0
+
+
+def test_unchanged_checklist_is_not_imported(fresh_db, monkeypatch):
+    from app.db.seeder import CHECKLIST_MODULE
+
+    # The fixture seeded with the module loaded; the next seed stores the
+    # source hash, after which a fresh process skips the import entirely.
+    monkeypatch.delitem(sys.modules, CHECKLIST_MODULE)
+    assert seed_static_data().seeded is False
+    assert CHECKLIST_MODULE in sys.modules
+
+    monkeypatch.delitem(sys.modules, CHECKLIST_MODULE)
+    assert seed_static_data().seeded is False
+    assert CHECKLIST_MODULE not in sys.modules
@@ -0,0 +1,71 @@
+"""Tests for the progress event broadcaster."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+from app.api.stream import (
+    ProgressBroadcaster,
+    format_sse,
+    progress_broadcaster,
+    stream_progress,
+)
+
+
+def test_events_fan_out_to_subscribers():
+    broadcaster = ProgressBroadcaster(queue_size=4)
+
+    async def scenario():
+        first = broadcaster.subscribe()
+        second = broadcaster.subscribe()
+        broadcaster.publish("delta", {"task": "a"})
+        # Publishing from a worker thread is handed to the loop.
+        worker = threading.Thread(target=broadcaster.publish, args=("refresh", {}))
+        worker.start()
+        worker.join()
+        return [
+            [await sub.next_event(1), await sub.next_event(1)] for sub in (first, second)
+        ]
+
+    received = asyncio.run(scenario())
+    assert received == [[("delta", {"task": "a"}), ("refresh", {})]] * 2
+
+
+def test_slow_subscribers_are_dropped():
+    broadcaster = ProgressBroadcaster(queue_size=2)
+
+    async def scenario():
+        slow = broadcaster.subscribe()
+        for index in range(3):
+            broadcaster.publish("delta", {"index": index})
+        return slow, await slow.next_event(1)
+
+    slow, message = asyncio.run(scenario())
+    assert slow.dropped is True
+    assert message is None
+    stats = broadcaster.stats()
+    assert stats.subscribers == 0
+    assert stats.dropped_subscribers == 1
+
+
+def test_stream_subscribes_only_once_it_is_sent():
+    before = progress_broadcaster.stats().subscribers
+
+    async def scenario():
+        unsent = await stream_progress("alice")
+        assert progress_broadcaster.stats().subscribers == before
+        del unsent
+
+        sent = await stream_progress("alice")
+        assert await sent.body_iterator.__anext__() == "retry: 3000\n\n"
+        subscribed = progress_broadcaster.stats().subscribers
+        await sent.body_iterator.aclose()
+        return subscribed
+
+    assert asyncio.run(scenario()) == before + 1
+    assert progress_broadcaster.stats().subscribers == before
+
+
+def test_format_sse():
+    assert format_sse("delta", {"a": 1}) == 'event: delta\ndata: {"a":1}\n\n'
@@ -0,0 +1,105 @@
+"""Tests for the synthetic roadmap generator."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.data.synthetic import (
+    RoadmapSpec,
+    completed_tasks,
+    generate_stages,
+    seed_roadmap,
+)
+from app.db.duckdb import close_connection_pool
+
+
+def test_generated_roadmap_is_deterministic_by_seed():
+    spec = RoadmapSpec(stages=3, repos_per_stage=4, tasks_per_repo=5, completion=0.5)
+
+    stages = generate_stages(spec)
+
+    assert stages == generate_stages(spec)
+    assert stages != generate_stages(
+        RoadmapSpec(stages=3, repos_per_stage=4, tasks_per_repo=5, seed=1)
+    )
+    assert completed_tasks(stages, spec) == completed_tasks(stages, spec)
+    repos = [repo for stage in stages for repo in stage["repositories"]]
+    assert len(repos) == 12
+    assert sum(len(repo["tasks"]) for repo in repos) == spec.total_tasks
+    assert len(repos[0]["tasks"][0]["description"].split()) == spec.description_words
+
+
+def test_completion_is_a_prefix_of_each_repository():
+    spec = RoadmapSpec(stages=2, repos_per_stage=5, tasks_per_repo=20, completion=0.3)
+    stages = generate_stages(spec)
+
+    picked = completed_tasks(stages, spec)
+
+    for stage in stages:
+        for repo in stage["repositories"]:
+            done = {task_id for repo_id, task_id in picked if repo_id == repo["id"]}
+            prefix = [task["id"] for task in repo["tasks"][: len(done)]]
+            assert done == set(prefix)
+    assert 0 < len(picked) < spec.total_tasks
+
+
+def test_invalid_spec_is_rejected():
+    with pytest.raises(ValueError):
+        RoadmapSpec(completion=1.5)
+
+
+def test_seed_roadmap_writes_roadmap_and_progress(tmp_path, monkeypatch):
+    from app.db.progress import fetch_progress_summary
+
+    monkeypatch.setenv("TASKTRACKER_DB_PATH", str(tmp_path / "synthetic.duckdb"))
+    spec = RoadmapSpec(stages=2, repos_per_stage=3, tasks_per_repo=10, completion=0.5)
+    try:
+        report = seed_roadmap(spec)
+        summary = fetch_progress_summary()
+    finally:
+        close_connection_pool()
+
+    assert report.tasks == spec.total_tasks
+    picked = completed_tasks(generate_stages(spec), spec)
+    tasks = [
+        task
+        for stage in summary.stages
+        for repo in stage.repositories
+        for task in repo.tasks
+    ]
+    assert len(tasks) == spec.total_tasks
+    assert {task.id for task in tasks if task.completed} == {t for _, t in picked}
+    for stage in summary.stages:
+        for repo in stage.repositories:
+            enabled = [task.enabled for task in repo.tasks]
+            # Completed prefix plus the first incomplete task are enabled.
+            assert enabled == sorted(enabled, reverse=True)
+            assert sum(enabled) == min(repo.progress.completed + 1, len(repo.tasks))
+
+
+def test_stored_checklist_source_serves_a_generated_roadmap(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    monkeypatch.setenv("TASKTRACKER_DB_PATH", str(tmp_path / "synthetic.duckdb"))
+    monkeypatch.setenv("TASKTRACKER_CHECKLIST_SOURCE", "stored")
+    spec = RoadmapSpec(stages=2, repos_per_stage=3, tasks_per_repo=10, completion=0.5)
+    try:
+        seed_roadmap(spec)
+    finally:
+        close_connection_pool()
+
+    with TestClient(app) as client:
+        summary = client.get("/api/v1/progress").json()
+
+    assert [stage["id"] for stage in summary["stages"]] == [
+        stage["id"] for stage in generate_stages(spec)
+    ]
+    completed = sum(
+        task["completed"]
+        for stage in summary["stages"]
+        for repo in stage["repositories"]
+        for task in repo["tasks"]
+    )
+    assert completed == len(completed_tasks(generate_stages(spec), spec))
@@ -0,0 +1,179 @@
+"""Tests for per-tenant database files and the registry of open databases."""
+
+from __future__ import annotations
+
+import copy
+
+import pytest
+
+from app.data.checklist import STAGES
+from app.db.duckdb import (
+    DatabaseRegistry,
+    close_connection_pool,
+    database_registry_stats,
+    get_connection,
+    init_db,
+    tenant_scope,
+)
+from app.db.progress import (
+    fetch_progress_summary,
+    get_data_version,
+    update_task_progress,
+)
+from app.db.seeder import seed_static_data
+
+REPO = STAGES[0]["repositories"][0]
+TASKS = REPO["tasks"]
+LINK = "https://example.com/work"
+
+
+@pytest.fixture()
+def tenant_db(tmp_path, monkeypatch):
+    """Seed a shared checklist database and enable tenant mode."""
+    monkeypatch.setenv("TASKTRACKER_DB_PATH", str(tmp_path / "checklist.duckdb"))
+    monkeypatch.setenv("TASKTRACKER_TENANT_DIR", str(tmp_path / "tenants"))
+    init_db()
+    seed_static_data()
+    close_connection_pool()
+    yield tmp_path / "tenants"
+    close_connection_pool()
+
+
+def _complete(tenant_id: str, user_id: str = "alice") -> None:
+    with tenant_scope(tenant_id):
+        update_task_progress(REPO["id"], TASKS[0]["id"], True, LINK, user_id)
+
+
+def _completed_tasks(tenant_id: str) -> list[tuple]:
+    with tenant_scope(tenant_id), get_connection(read_only=True) as conn:
+        return conn.execute(
+            "SELECT user_id, task_id FROM task_progress WHERE completed;"
+        ).fetchall()
+
+
+def test_tenants_have_separate_files_sharing_the_checklist(tenant_db):
+    _complete("acme")
+
+    with tenant_scope("acme"):
+        assert fetch_progress_summary("alice").overall_progress > 0
+        with get_connection(read_only=True) as conn:
+            tables = conn.execute(
+                """
+                SELECT table_name FROM duckdb_tables()
+                WHERE database_name = current_database();
+                """
+            ).fetchall()
+            task_count = conn.execute("SELECT COUNT(*) FROM tasks;").fetchone()[0]
+    with tenant_scope("globex"):
+        assert fetch_progress_summary("alice").overall_progress == 0
+
+    assert (tenant_db / "acme.duckdb").exists()
+    assert (tenant_db / "globex.duckdb").exists()
+    # The checklist is read through views on the attached shared database.
+    assert "tasks" not in {row[0] for row in tables}
+    assert task_count == sum(
+        len(repo["tasks"]) for stage in STAGES for repo in stage["repositories"]
+    )
+    assert _completed_tasks("globex") == []
+
+
+def test_registry_closes_least_recently_used_and_idle_databases(tenant_db):
+    now = [0.0]
+    registry = DatabaseRegistry(max_open=2, idle_seconds=60, clock=lambda: now[0])
+    paths = [tenant_db / f"t{index}.duckdb" for index in range(3)]
+
+    with tenant_scope("t0"):
+        first = registry.manager(paths[0])
+        first.open()
+    with tenant_scope("t1"), registry.lease(paths[1]) as pinned:
+        pinned.open()
+        now[0] = 30
+        with tenant_scope("t2"), registry.lease(paths[2]) as latest:
+            latest.open()
+            assert not first.is_open
+            assert pinned.is_open
+        stats = registry.stats()
+    assert (stats.open, stats.evicted) == (2, 1)
+
+    now[0] = 200
+    with tenant_scope("t0"), registry.lease(paths[0]) as reopened:
+        reopened.open()
+        assert not pinned.is_open
+        assert registry.stats().open == 1
+    registry.close()
+
+
+def test_evicted_tenant_reopens_with_its_progress(tenant_db, monkeypatch):
+    monkeypatch.setenv("TASKTRACKER_MAX_OPEN_DBS", "2")
+    for tenant_id in ("a", "b", "c", "d"):
+        _complete(tenant_id, user_id=tenant_id)
+
+    stats = database_registry_stats()
+    assert stats.open <= 2
+    assert stats.evicted >= 2
+    assert _completed_tasks("a") == [("a", TASKS[0]["id"])]
+
+
+def test_checklist_change_reconciles_tenants_on_open(tenant_db):
+    _complete("acme")
+    with tenant_scope("acme"):
+        before = get_data_version("alice")
+    close_connection_pool()
+
+    stages = copy.deepcopy(STAGES)
+    stages[0]["repositories"][0]["tasks"].pop(0)
+    seed_static_data(stages)
+    close_connection_pool()
+
+    assert _completed_tasks("acme") == []
+    with tenant_scope("acme"):
+        assert get_data_version("alice") > before
+
+
+def test_tenant_header_routes_requests(tenant_db):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    repo_id, task_id = REPO["id"], TASKS[0]["id"]
+    with TestClient(app) as client:
+        response = client.post(
+            f"/api/v1/progress/{repo_id}/{task_id}",
+            json={"completed": True, "link": LINK},
+            headers={"X-Tenant-ID": "acme"},
+        )
+        assert response.status_code == 200
+        acme = client.get("/api/v1/progress", headers={"X-Tenant-ID": "acme"})
+        default = client.get("/api/v1/progress")
+        invalid = client.get("/api/v1/progress", headers={"X-Tenant-ID": "../x"})
+
+    assert acme.json()["overall_progress"] > 0
+    assert default.json()["overall_progress"] == 0
+    assert invalid.status_code == 400
+
+
+def test_failed_reconcile_rolls_back(tenant_db, monkeypatch):
+    from app.db import tenants
+
+    _complete("acme")
+
+    def fail(conn):
+        raise RuntimeError("frontier rebuild failed")
+
+    monkeypatch.setattr(tenants, "rebuild_frontier", fail)
+    with tenant_scope("acme"), get_connection() as conn:
+        conn.execute("UPDATE tenant_sync SET stages_hash = 'stale' WHERE id = 1;")
+        with pytest.raises(RuntimeError):
+            tenants.reconcile_tenant(conn)
+        # Not left inside the failed transaction.
+        conn.begin()
+        conn.rollback()
+        assert conn.execute("SELECT stages_hash FROM tenant_sync;").fetchone() == ("stale",)
+    assert _completed_tasks("acme") == [("alice", TASKS[0]["id"])]
+
+
+@pytest.mark.parametrize("tenant_id", ["abc\n", "", "a/b", "x" * 65])
+def test_malformed_tenant_ids_are_rejected(tenant_id):
+    with pytest.raises(ValueError):
+        with tenant_scope(tenant_id):
+            pass
@@ -0,0 +1,158 @@
+"""Tests for bulk Parquet/CSV progress export and import."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from app.data.checklist import STAGES
+from app.db.duckdb import get_connection, init_db
+from app.db.progress import (
+    ProgressValidationError,
+    TaskUpdate,
+    apply_progress_batch,
+    fetch_progress_summary,
+)
+from app.db.seeder import seed_static_data
+from app.db.transfer import export_progress, import_progress, resolve_format
+
+REPO = STAGES[0]["repositories"][0]
+TASKS = REPO["tasks"]
+
+
+def _complete(count: int) -> None:
+    apply_progress_batch(
+        [
+            TaskUpdate(REPO["id"], task["id"], True, f"https://example.com/{task['id']}")
+            for task in TASKS[:count]
+        ]
+    )
+
+
+def _progress_rows():
+    with get_connection(read_only=True) as conn:
+        return conn.execute(
+            "SELECT task_id, completed, completed_at, link FROM task_progress ORDER BY task_id;"
+        ).fetchall()
+
+
+def _switch_to_empty_db(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("TASKTRACKER_DB_PATH", str(tmp_path / "target.duckdb"))
+    init_db()
+    seed_static_data()
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "csv"])
+def test_round_trip_preserves_progress(fresh_db, tmp_path, monkeypatch, fmt):
+    _complete(3)
+    exported = _progress_rows()
+    path = tmp_path / f"progress.{fmt}"
+    assert export_progress(path, fmt) == len(exported)
+
+    _switch_to_empty_db(tmp_path, monkeypatch)
+    result = import_progress(path, fmt)
+
+    assert (result.rows, result.updated) == (len(exported), 3)
+    assert _progress_rows() == exported
+    repo = fetch_progress_summary().stages[0].repositories[0]
+    assert [task.enabled for task in repo.tasks[:5]] == [True, True, True, True, False]
+    assert result.overall_progress == fetch_progress_summary().overall_progress
+
+
+def test_import_logs_events_at_completion_time(fresh_db, tmp_path, monkeypatch):
+    _complete(2)
+    path = tmp_path / "progress.parquet"
+    export_progress(path)
+    completed_at = [row[2] for row in _progress_rows() if row[1]]
+
+    _switch_to_empty_db(tmp_path, monkeypatch)
+    import_progress(path)
+    assert import_progress(path).updated == 0
+
+    with get_connection(read_only=True) as conn:
+        events = conn.execute(
+            "SELECT completed, was_completed, occurred_at FROM progress_events;"
+        ).fetchall()
+    assert sorted(events) == sorted((True, False, at) for at in completed_at)
+
+
+def _write_csv(path, rows) -> None:
+    lines = ["task_id,repository_id,completed,completed_at,link"]
+    lines += [",".join(row) for row in rows]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _row(task, completed=True, repo_id=None):
+    link = f"https://example.com/{task['id']}" if completed else ""
+    return (task["id"], repo_id or REPO["id"], str(completed).lower(), "", link)
+
+
+@pytest.mark.parametrize(
+    ("rows", "message"),
+    [
+        ([_row(TASKS[1])], "would be complete before earlier tasks"),
+        ([_row({"id": "no-such-task"})], "unknown tasks"),
+        ([_row(TASKS[0], repo_id="elsewhere")], "do not belong"),
+        ([_row(TASKS[0]), _row(TASKS[0])], "more than once"),
+        ([(TASKS[0]["id"], REPO["id"], "true", "", "")], "no work link"),
+    ],
+)
+def test_import_rejects_invalid_files(fresh_db, tmp_path, rows, message):
+    path = tmp_path / "progress.csv"
+    _write_csv(path, rows)
+    before = _progress_rows()
+
+    with pytest.raises(ProgressValidationError, match=message):
+        import_progress(path, "csv")
+    assert _progress_rows() == before
+
+
+def test_gating_is_checked_against_the_merged_state(fresh_db, tmp_path):
+    _complete(2)
+    path = tmp_path / "progress.csv"
+
+    # Reopening the first task would strand the completed second one.
+    _write_csv(path, [_row(TASKS[0], completed=False)])
+    with pytest.raises(ProgressValidationError, match=TASKS[1]["id"]):
+        import_progress(path, "csv")
+
+    # Continuing the chain from the stored state is fine.
+    _write_csv(path, [_row(TASKS[2]), _row(TASKS[3])])
+    assert import_progress(path, "csv").updated == 2
+
+
+def test_unreadable_file_is_rejected(fresh_db, tmp_path):
+    path = tmp_path / "progress.parquet"
+    path.write_text("not parquet", encoding="utf-8")
+
+    with pytest.raises(ProgressValidationError, match="Could not read parquet"):
+        import_progress(path)
+
+
+def test_resolve_format():
+    assert resolve_format(Path("backup.CSV")) == "csv"
+    assert resolve_format(Path("backup.bin"), "parquet") == "parquet"
+    with pytest.raises(ValueError):
+        resolve_format(Path("backup.json"))
+
+
+def test_export_and_import_routes(client, tmp_path):
+    _complete(2)
+    exported = client.get("/api/v1/progress/export", params={"format": "csv"})
+    assert exported.status_code == 200
+    assert exported.headers["content-type"].startswith("text/csv")
+    assert exported.text.count("https://example.com/") == 2
+
+    body = exported.content.replace(b"true", b"false").replace(b"https", b"")
+    imported = client.post(
+        "/api/v1/progress/import", params={"format": "csv"}, content=body
+    )
+    assert imported.status_code == 200
+    assert imported.json()["updated"] == 2
+    assert all(not completed for _, completed, _, _ in _progress_rows())
+
+    rejected = client.post(
+        "/api/v1/progress/import", params={"format": "parquet"}, content=b"junk"
+    )
+    assert rejected.status_code == 400
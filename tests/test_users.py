@@ -0,0 +1,109 @@
+"""Tests for per-user progress on the shared checklist."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from app.data.checklist import STAGES
+from app.db.duckdb import get_connection
+from app.db.ndjson import ProgressRecordStream
+from app.db.progress import (
+    ProgressValidationError,
+    TaskUpdate,
+    apply_progress_batch,
+    fetch_progress_summary,
+    get_data_version,
+    update_task_progress,
+)
+from app.db.transfer import export_progress, import_progress
+
+REPO = STAGES[0]["repositories"][0]
+TASKS = REPO["tasks"]
+LINK = "https://example.com/work"
+
+
+def _repo(summary):
+    return next(
+        repo
+        for stage in summary.stages
+        for repo in stage.repositories
+        if repo.id == REPO["id"]
+    )
+
+
+@pytest.mark.parametrize("engine", ["python", "sql"])
+def test_progress_and_gating_are_per_user(fresh_db, monkeypatch, engine):
+    monkeypatch.setenv("TASKTRACKER_SUMMARY_ENGINE", engine)
+    update_task_progress(REPO["id"], TASKS[0]["id"], True, LINK, "alice")
+
+    alice = _repo(fetch_progress_summary("alice"))
+    bob = _repo(fetch_progress_summary("bob"))
+
+    assert [task.completed for task in alice.tasks[:2]] == [True, False]
+    assert [task.enabled for task in alice.tasks[:3]] == [True, True, False]
+    assert not any(task.completed for task in bob.tasks)
+    assert [task.enabled for task in bob.tasks[:2]] == [True, False]
+    with pytest.raises(ProgressValidationError):
+        update_task_progress(REPO["id"], TASKS[1]["id"], True, LINK, "bob")
+
+
+def test_versions_ignore_other_users_writes(fresh_db):
+    alice_before = get_data_version("alice")
+    bob_before = get_data_version("bob")
+
+    apply_progress_batch([TaskUpdate(REPO["id"], TASKS[0]["id"], True, LINK)], "bob")
+
+    assert get_data_version("alice") == alice_before
+    assert get_data_version("bob") > bob_before
+
+
+def test_record_stream_reads_one_user(fresh_db):
+    update_task_progress(REPO["id"], TASKS[0]["id"], True, LINK, "alice")
+
+    for user_id, expected in (("alice", True), ("bob", False)):
+        stream = ProgressRecordStream(user_id=user_id)
+        body = b""
+        while (chunk := stream.next_chunk()) is not None:
+            body += chunk
+        records = [json.loads(line) for line in body.splitlines()]
+        repo = next(record for record in records if record.get("id") == REPO["id"])
+        assert repo["tasks"][0]["completed"] is expected
+
+
+def test_import_targets_one_user(fresh_db, tmp_path):
+    update_task_progress(REPO["id"], TASKS[0]["id"], True, LINK, "alice")
+    path = tmp_path / "alice.parquet"
+    export_progress(path, "parquet", "alice")
+
+    import_progress(path, "parquet", "carol")
+
+    with get_connection(read_only=True) as conn:
+        rows = conn.execute(
+            """
+            SELECT user_id FROM task_progress
+            WHERE task_id = ? AND completed
+            ORDER BY user_id;
+            """,
+            (TASKS[0]["id"],),
+        ).fetchall()
+    assert rows == [("alice",), ("carol",)]
+
+
+def test_user_routes(client):
+    repo_id, task_id = REPO["id"], TASKS[0]["id"]
+    response = client.post(
+        f"/api/v1/users/alice/progress/{repo_id}/{task_id}",
+        json={"completed": True, "link": LINK},
+    )
+    assert response.status_code == 200
+
+    alice = client.get("/api/v1/users/alice/progress").json()
+    default = client.get("/api/v1/progress").json()
+    by_query = client.get("/api/v1/progress", params={"user_id": "alice"}).json()
+
+    assert alice["overall_progress"] > 0
+    assert default["overall_progress"] == 0
+    assert by_query == alice
+    assert client.get("/api/v1/users/*/progress").status_code == 422
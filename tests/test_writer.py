@@ -0,0 +1,94 @@
+"""Tests for group-committed progress updates."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.data.checklist import STAGES
+from app.db.duckdb import get_connection
+from app.db.progress import (
+    ProgressValidationError,
+    TaskUpdate,
+    apply_update_group,
+    fetch_progress_summary,
+    get_data_version,
+)
+from app.db.writer import ProgressWriter
+
+REPO = STAGES[0]["repositories"][0]
+TASKS = REPO["tasks"]
+LINK = "https://example.com/work"
+
+
+def _update(index: int, completed: bool = True) -> TaskUpdate:
+    return TaskUpdate(REPO["id"], TASKS[index]["id"], completed, LINK)
+
+
+def test_group_validates_in_order_and_isolates_failures(fresh_db):
+    fetch_progress_summary("alice")  # warm the cache so deltas are patched
+    before = get_data_version("alice")
+
+    results = apply_update_group(
+        [
+            (_update(0), "alice"),
+            (_update(1), "alice"),
+            (_update(1), "bob"),  # locked: bob has not completed task 0
+            (_update(0, completed=False), "alice"),
+        ]
+    )
+
+    assert [type(result).__name__ for result in results] == [
+        "ProgressDelta",
+        "ProgressDelta",
+        "ProgressValidationError",
+        "ProgressDelta",
+    ]
+    assert results[1].task.completed is True
+    assert results[3].task.completed is False
+    # One bump per user per group.
+    assert get_data_version("alice") == before + 1
+    alice = fetch_progress_summary("alice").stages[0].repositories[0]
+    assert [task.completed for task in alice.tasks[:2]] == [False, True]
+
+
+def test_writer_groups_queued_updates(fresh_db):
+    writer = ProgressWriter(max_group=16)
+    # Holding the writer lease stalls the first group, so the rest queue up
+    # behind it and commit together.
+    with get_connection():
+        futures = [writer.submit(_update(0), f"user-{index}") for index in range(10)]
+        futures.append(writer.submit(_update(2), "user-0"))
+    try:
+        deltas = [future.result(timeout=10) for future in futures[:-1]]
+        with pytest.raises(ProgressValidationError):
+            futures[-1].result(timeout=10)
+    finally:
+        writer.shutdown()
+
+    assert all(delta.task.completed for delta in deltas)
+    stats = writer.stats()
+    assert stats.completed == 11
+    assert stats.groups < 11
+    with get_connection(read_only=True) as conn:
+        assert conn.execute(
+            "SELECT COUNT(*) FROM task_progress WHERE completed;"
+        ).fetchone()[0] == 10
+
+
+def test_writer_hands_deltas_over_in_commit_order(fresh_db):
+    writer = ProgressWriter(max_group=4)
+    committed = []
+    writer.on_commit = lambda delta, user_id: committed.append((user_id, delta.task.id))
+    with get_connection():
+        futures = [writer.submit(_update(index), "alice") for index in range(3)]
+        futures += [writer.submit(_update(0), f"user-{index}") for index in range(6)]
+    try:
+        for future in futures:
+            future.result(timeout=10)
+    finally:
+        writer.shutdown()
+
+    assert committed == [("alice", TASKS[index]["id"]) for index in range(3)] + [
+        (f"user-{index}", TASKS[0]["id"]) for index in range(6)
+    ]
+    assert writer.stats().groups < len(futures)